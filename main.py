@@ -1,4 +1,9 @@
-from scripts.game_manager import GameManager
+import argparse
+import sys
+
+# the modules of the game are imported by the commands that need them, so that the command line starts quickly
+HISTORY = 'game_history.jsonl' # log where the games played are appended
+
 
 def show_menu():
     print('''\nSelect something to do:
@@ -9,13 +14,19 @@ def show_menu():
     4 - Load game history
     0 - Exit''')
 
-if __name__ == '__main__':
-    game = GameManager()
+
+def interactive():
+    """Interactive menu (used when no command is given)"""
+    from scripts.game_manager import GameManager
+    game = GameManager(log_path=HISTORY) # every game is appended to the history
     choice = -1
 
     while choice != 0:
         show_menu()
-        inp = int(input("> "))
+        try:
+            inp = int(input("> "))
+        except ValueError: # not a number
+            inp = -1
         if inp == 1: game.play_game()
         elif inp == 2: game.print_stats()
         elif inp == 3: game.download_stats()
@@ -24,4 +35,199 @@ if __name__ == '__main__':
         else:
             print('Invalid input! Try something else')
     
-    print('Thank you for playing!')
\ No newline at end of file
+    game.close()
+    print('Thank you for playing!')
+
+
+def read_games(path):
+    """
+    Reads the games of a game history log (.jsonl) or store (.tth)
+
+    Returns
+    -------------------
+    records: generator
+        The records of the games
+    """
+    if path.endswith('.tth'):
+        from scripts.history_store import HistoryStore
+        with HistoryStore(path) as store:
+            yield from store.games()
+    else:
+        from scripts.event_log import read_events
+        yield from read_events(path)
+
+
+def write_json(data, path):
+    """Prints data as JSON, or writes it to $path if it is given"""
+    import json
+    if path is None:
+        print(json.dumps(data, indent=2))
+    else:
+        out_file = open(path, "w")
+        json.dump(data, out_file, indent=2)
+        out_file.close()
+
+
+def play(args):
+    """Plays a game on the console against an AI"""
+    from scripts.game_manager import GameManager
+    game = GameManager(log_path=args.log)
+    try:
+        game.play_game(args.ai)
+    finally:
+        game.close()
+
+
+def simulate(args):
+    """Plays games between two AIs and writes the statistics"""
+    from scripts.tournament import run_tournament
+    stats = run_tournament(args.x_ai, args.o_ai, args.games, args.seed, args.workers)
+    write_json(stats, args.output)
+
+
+def stats(args):
+    """Writes the statistics of a game history"""
+    if args.path.endswith('.tth'): # the store keeps the statistics in its header
+        from scripts.history_store import HistoryStore
+        with HistoryStore(args.path) as store:
+            result = store.stats()
+    else:
+        from scripts.stats import StatsRecorder
+        recorder = StatsRecorder()
+        for record in read_games(args.path):
+            recorder.record(record["ai"], record["moves"][0] if record["moves"] else None, record["winner"])
+        result = recorder.totals()
+        if args.by_ai:
+            result["by_ai"] = recorder.by_ai()
+    write_json(result, args.output)
+
+
+def export(args):
+    """Copies the games of a history log to a binary store (.tth), a log (.jsonl) or a statistics file (.json)"""
+    if args.output.endswith('.tth'):
+        from scripts.history_store import import_log
+        print(f'{import_log(args.path, args.output)} games exported to {args.output}')
+    elif args.output.endswith('.jsonl'):
+        from scripts.event_log import GameLog
+        with GameLog(args.output) as log:
+            for record in read_games(args.path):
+                log.append(record)
+        print(f'Games exported to {args.output}')
+    else:
+        from scripts.event_log import fold_stats
+        write_json(fold_stats(read_games(args.path)), args.output)
+
+
+def import_games(args):
+    """Appends the games of a history log or store to the history"""
+    from scripts.event_log import GameLog
+    games = 0
+    with GameLog(args.log) as log:
+        for record in read_games(args.path):
+            log.append(record)
+            games += 1
+    print(f'{games} games imported in {args.log}')
+
+
+def solve(args):
+    """Writes the best move of a board"""
+    from scripts.ai import AIPlayer
+    from scripts.board import Board
+    import random
+    board = Board(args.rows, args.cols, args.k)
+    cells = args.board.replace('/', '')
+    if len(cells) != board.shape.size or set(cells) - set('XO.'):
+        raise ValueError(f"The board must have {board.shape.size} cells, each one 'X', 'O' or '.'")
+    for i, cell in enumerate(cells):
+        if cell != '.':
+            board[i] = cell
+    if board.get_winner() is not None or board.is_full():
+        raise ValueError('The game is already over on this board')
+    player = args.player
+    if player is None:
+        player = 'X' if cells.count('X') == cells.count('O') else 'O'
+    if args.time_limit is not None: # a search bounded in time, its score is only an estimate
+        move = AIPlayer(search="iterative", time_limit=args.time_limit, rng=random.Random(args.seed)).minimax_ai(board, player)
+        write_json({"move": move, "score": None}, args.output)
+    else:
+        move, score = next(AIPlayer(rng=random.Random(args.seed)).best_moves([board], player, deterministic=True))
+        write_json({"move": move, "score": score}, args.output)
+
+
+def build_parser():
+    """
+    Builds the parser of the command line
+
+    Returns
+    -------------------
+    parser: argparse.ArgumentParser
+        The parser, with a subcommand for every command
+    """
+    parser = argparse.ArgumentParser(description='Tic-Tac-Toe against AIs (without a command the interactive menu starts)')
+    commands = parser.add_subparsers(dest='command')
+
+    command = commands.add_parser('play', help='play a game against an AI')
+    command.add_argument('--ai', default=None, help='AI to play against (by default it is asked)')
+    command.add_argument('--log', default=HISTORY, help='log where the game is appended')
+    command.set_defaults(func=play)
+
+    command = commands.add_parser('simulate', help='play games between two AIs')
+    command.add_argument('--x-ai', default='minimax_ai', help='AI playing X (it moves first)')
+    command.add_argument('--o-ai', default='random_ai', help='AI playing O')
+    command.add_argument('--games', type=int, default=1000, help='number of games')
+    command.add_argument('--seed', type=int, default=0, help='seed of the random number generators')
+    command.add_argument('--workers', type=int, default=None, help='number of processes (default: one per CPU)')
+    command.add_argument('--output', default=None, help='JSON file for the statistics (default: printed)')
+    command.set_defaults(func=simulate)
+
+    command = commands.add_parser('stats', help='statistics of a game history')
+    command.add_argument('path', nargs='?', default=HISTORY, help='game history log (.jsonl) or store (.tth)')
+    command.add_argument('--by-ai', action='store_true', help='add the statistics of every AI (logs only)')
+    command.add_argument('--output', default=None, help='JSON file for the statistics (default: printed)')
+    command.set_defaults(func=stats)
+
+    command = commands.add_parser('export', help='copy a game history to a store, a log or a statistics file')
+    command.add_argument('path', nargs='?', default=HISTORY, help='game history log (.jsonl) or store (.tth)')
+    command.add_argument('--output', required=True, help='file to be written (.tth, .jsonl or .json)')
+    command.set_defaults(func=export)
+
+    command = commands.add_parser('import', help='append the games of a log or a store to the history')
+    command.add_argument('path', help='game history log (.jsonl) or store (.tth)')
+    command.add_argument('--log', default=HISTORY, help='log where the games are appended')
+    command.set_defaults(func=import_games)
+
+    command = commands.add_parser('solve', help='best move of a board')
+    command.add_argument('board', help="cells row by row, 'X', 'O' or '.' (rows can be separated by '/')")
+    command.add_argument('--player', choices=('X', 'O'), default=None, help='player to move (default: whose turn it is)')
+    command.add_argument('--rows', type=int, default=3, help='number of rows')
+    command.add_argument('--cols', type=int, default=3, help='number of columns')
+    command.add_argument('--k', type=int, default=None, help='marks in a row needed to win')
+    command.add_argument('--time-limit', type=float, default=None, help='seconds of search (for boards too large to solve)')
+    command.add_argument('--seed', type=int, default=0, help='seed of the random number generator')
+    command.add_argument('--output', default=None, help='JSON file for the result (default: printed)')
+    command.set_defaults(func=solve)
+    return parser
+
+
+def main(argv=None):
+    """
+    Runs a command of the command line, or the interactive menu if there is none
+
+    Returns
+    -------------------
+    Exit code (int)
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        interactive()
+        return 0
+    try:
+        args.func(args)
+    except (ValueError, OSError) as e: # unknown AIs, invalid boards, missing files
+        parser.error(str(e))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
@@ -1,8 +1,231 @@
 from scripts.board import Board
+from scripts.constants import AI_NAMES
+from scripts.instrumentation import CountingBoard, Probe, SearchStats
+from scripts.mcts import MCTS
+from scripts.perfect_table import default_table
+from scripts.transposition import TranspositionTable
+from concurrent.futures import ProcessPoolExecutor
+import math
 import random
+import time
+
+SEARCHES = ("minimax", "alphabeta", "iterative") # search algorithms that can be used by minimax_ai
+
+
+class SearchTimeout(Exception):
+    """Raised inside an iterative deepening search when its deadline has passed"""
+
+
+def win_score(board):
+    """
+    Score of a win for X at depth 0: 10 on the 3x3 board, and in general one more than the
+    number of cells, so that a win keeps a positive score at any depth
+
+    Parameters
+    -------------------
+    board: Board
+        Playing board
+
+    Returns
+    -------------------
+    Score of the win (int)
+    """
+    return board.shape.size + 1
+
+
+def open_lines_evaluation(board):
+    """
+    Default evaluation of the iterative deepening search for the boards where the search stops before the end:
+    every line that only one player has marks in is worth the square of the number of marks,
+    positive for X and negative for O. The result is scaled between -1 and 1, so it is
+    always smaller than the score of a win.
+
+    Parameters
+    -------------------
+    board: Board
+        Playing board
+
+    Returns
+    -------------------
+    Evaluation of the board (float)
+    """
+    shape = board.shape
+    units, width = shape.units, shape.width
+    total = 0
+    for player, sign in (('X', 1), ('O', -1)):
+        counters = board.open_counters(player) # all the lines at once, in the bits of an integer
+        bits = [counters >> j & units for j in range(width)] # bit j of every counter
+        for i in range(width): # the square of a counter adds 2^(i+j) for every pair of its bits that are set
+            total += sign * (bin(bits[i]).count('1') << 2 * i)
+            for j in range(i + 1, width):
+                total += sign * (bin(bits[i] & bits[j]).count('1') << i + j + 1)
+    return total / (len(shape.lines) * shape.k * shape.k + 1)
+
+_worker_ai = None # AIPlayer of a worker process of the parallel search, its cache is kept between the jobs
+
+
+def _search_child(job):
+    """
+    Scores a child of the root in a worker process of the parallel search
+
+    Parameters
+    -------------------
+    job: tuple
+        (search algorithm, board, player who has to move, alpha, beta)
+
+    Returns
+    -------------------
+    Score of the board (int), a bound if it is outside of (alpha, beta) as in alphabeta_score
+    """
+    global _worker_ai
+    search, board, player, alpha, beta = job
+    if _worker_ai is None:
+        _worker_ai = AIPlayer()
+    if search == "minimax":
+        return _worker_ai.minimax_score(board, player)
+    return _worker_ai.alphabeta_score(board, player, 0, alpha, beta)
 
 class AIPlayer:
-    """ """
+    """
+    A class containing the AIs that can play Tic-Tac-Toe
+
+    Attributes:
+        self.cache: TranspositionTable
+            Cache of the minimax scores, keyed by the canonical form of the boards
+            (it can be shared between different AIPlayer instances)
+        self.search: str
+            Search algorithm used by minimax_ai ("minimax", "alphabeta" or "iterative")
+        self.time_limit: float
+            Seconds a move of the iterative deepening search can take (None for no limit)
+        self.max_depth: int
+            Maximum depth of the iterative deepening search (None for no limit)
+        self.evaluate: callable
+            Evaluation of the boards where the iterative deepening search stops before the end,
+            evaluate(board) returns a number between -1 (good for O) and 1 (good for X)
+        self.pv_moves: dict
+            Best move found for each board (by hash) in the previous iteration of the iterative deepening search
+        self.killers: dict
+            Killer moves of the alpha-beta search (moves that caused a cutoff) for each depth
+        self.history: dict
+            History heuristic of the alpha-beta search: how useful each move has been for each player
+        self.table: PerfectPlayTable
+            Table with the perfect play for every reachable position, used by table_ai
+        self.rng: random.Random
+            Random number generator used by the AIs that make random choices
+        self.mcts: MCTS
+            Monte Carlo tree search used by mcts_ai (its tree is kept between the moves of a game)
+    """
+    def __init__(self, cache=None, search="alphabeta", table=None, rng=None, mcts=None,
+                 time_limit=None, max_depth=None, evaluate=None, instrument=False, workers=1, parallel_min_cells=10):
+        """
+        Constructor
+
+        Parameters
+        -------------------
+        cache: TranspositionTable
+            Cache to be used by the minimax algorithm (if None a new one is created)
+        search: str
+            Search algorithm used by minimax_ai: "minimax" and "alphabeta" choose the same moves,
+            "iterative" searches deeper and deeper until the time limit and plays the best move
+            of the deepest search completed
+        table: PerfectPlayTable
+            Table used by table_ai (if None the default table is memory mapped, and built if it is missing,
+            the first time that table_ai is called)
+        rng: random.Random
+            Random number generator (if None the global one of the random module is used)
+        mcts: MCTS
+            Search used by mcts_ai (if None one with 1000 playouts per move is created)
+        time_limit: float
+            Seconds a move of the iterative deepening search can take (None for no limit)
+        max_depth: int
+            Maximum depth of the iterative deepening search (None for no limit)
+        evaluate: callable
+            Evaluation of the boards where the iterative deepening search stops (if None open_lines_evaluation is used)
+        instrument: bool
+            Measure the work of every call of the AIs in self.last_stats
+            (when it is False the AIs run exactly as if the instrumentation didn't exist)
+        workers: int
+            Number of processes of the parallel minimax_ai search ("minimax" and "alphabeta" only),
+            it chooses the same moves as the sequential search
+        parallel_min_cells: int
+            Smallest number of empty cells of a board searched in parallel
+            (the default keeps the 3x3 board sequential, its searches are faster than starting the jobs)
+        """
+        if search not in SEARCHES:
+            raise ValueError(f"Unknown search algorithm: {search}")
+        self.cache = TranspositionTable() if cache is None else cache
+        self.search = search
+        self.killers = {}
+        self.history = {}
+        self._table = table # the default table is only loaded by the first call of table_ai
+        self.rng = random if rng is None else rng
+        self.mcts = MCTS(rng=self.rng) if mcts is None else mcts
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.evaluate = open_lines_evaluation if evaluate is None else evaluate
+        self.pv_moves = {}
+        self._deadline = None # state of the running iterative deepening search
+        self._nodes = 0
+        self._exact = True
+        self.last_stats = None
+        self.workers = workers
+        self.parallel_min_cells = parallel_min_cells
+        self._pool = None
+        if instrument:
+            self._probe = Probe()
+            for name in AI_NAMES: # the instance attributes hide the methods of the class
+                setattr(self, name, self.__instrumented(name))
+    
+    @property
+    def table(self):
+        """Table used by table_ai (the default one is mapped in memory, or built, the first time it is used)"""
+        if self._table is None:
+            self._table = default_table()
+        return self._table
+
+    def __instrumented(self, name):
+        """
+        Wraps an AI so that its work is measured
+
+        Parameters
+        -------------------
+        name: str
+            Name of the AI
+
+        Returns
+        -------------------
+        measured: callable
+            The AI, saving the statistics of every call in self.last_stats
+        """
+        function = getattr(AIPlayer, name)
+        probe = self._probe
+        def measured(board, player):
+            if probe.stats is not None: # an AI called by another one is measured with it
+                return function(self, board, player)
+            stats = probe.stats = SearchStats(name)
+            hits, misses = self.cache.hits, self.cache.misses
+            start = time.perf_counter()
+            try:
+                return function(self, CountingBoard.of(board, probe), player)
+            finally:
+                stats.wall_time = time.perf_counter() - start
+                stats.cache_hits = self.cache.hits - hits
+                stats.cache_misses = self.cache.misses - misses
+                stats.max_depth = max(0, stats._max_count - board.move_count)
+                probe.stats = None
+                self.last_stats = stats
+        return measured
+
+    def close(self):
+        """Stops the processes of the parallel search"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def clear_cache(self):
+        """Removes all the scores stored in the cache"""
+        self.cache.clear()
+
     def random_ai(self, board, player):
         """
         Random AI: makes a random move on the playing board
@@ -21,15 +244,7 @@ class AIPlayer:
         y: int
             Y-axis coordinate of where the AI wants to play
         """
-        x = random.randint(0, 2)
-        y = random.randint(0, 2)
-
-        while True:
-            if board.is_valid_move((x,y)): # if the random move is valid return the coordiantes
-                return x,y
-            else: # otherwise choose new coordinates
-                x = random.randint(0, 2)
-                y = random.randint(0, 2)
+        return self.rng.choice(board.legal_moves()) # choose directly among the empty cells
     
     def find_winning_moves_ai(self, board, player):
         """
@@ -51,29 +266,11 @@ class AIPlayer:
         y: int
             Y-axis coordinate of where the AI wants to play
         """
-        rows = board.get_rows()
-        for i in range(len(rows)):
-            if self.__has_winning_move(rows[i], player): # see it there is a winning move in one of the rows
-                y = self.__find_none(rows[i]) # if there is a winning move, find the spot
-                return i,y
-    
-        cols = board.get_columns()
-        for i in range(len(cols)):
-            if self.__has_winning_move(cols[i], player): # see if there is a winning move in one of the columns
-                x = self.__find_none(cols[i]) # if there is a winning move, find the spot
-                return x,i
-    
-        diags = board.get_diags()
-        if self.__has_winning_move(diags[0], player): # see if there is a winning move in the first diagonal
-            x = self.__find_none(diags[0])  # if there is a winning move, find the spot
-            return x,x
-        elif self.__has_winning_move(diags[1], player): # see if there is a winning move in the second diagonal
-            x = self.__find_none(diags[1])  # if there is a winning move, find the spot
-            return x,2-x
+        moves = board.winning_moves(player) # moves completing a row, a column or a diagonal
+        if moves:
+            return moves[0]
         # if this point has been reached, there are no winning moves, so make a random one
-        else:
-            coords= self.random_ai(self, board, player)
-            return coords
+        return self.random_ai(board, player)
     
     def find_winning_moves_and_losing_moves_ai(self, board, player):
         """
@@ -98,131 +295,262 @@ class AIPlayer:
             Y-axis coordinate of where the AI wants to play
         """
         not_player = 'O' if player == 'X' else 'X' # select who the opponent is
-        coord_player = self.find_winning_moves_ai(self, board, player) # the player uses winning find_winning_moves_ai
-        coord_not_player = self.find_winning_moves_ai(self, board, not_player) # the opponent uses find_winning_moves_ai
-    
-        board_player = board.make_move(coord_player, player) # creae board with player's move
-        board_not_player = board.make_move(coord_not_player, not_player) # create board with opponent's move
-
-        if board_player.get_winner() == player: # if the player wins return the winning coordinates
-            return coord_player
-        elif board_not_player.get_winner() == not_player: # if the opponent wins return his winning coordinates
-            return coord_not_player 
-        else:
-            return self.random_ai(self, board, player) # if nobody wins make a random move
-
+        moves = board.winning_moves(player) # the player wins if it plays here
+        if moves:
+            return moves[0]
+        moves = board.winning_moves(not_player) # the opponent wins if the player doesn't play here
+        if moves:
+            return moves[0]
+        return self.random_ai(board, player) # if nobody can win make a random move
 
-    def __has_winning_move(list, player):
+    def __play_in_corners(self, board, player):
         """
-        Check if a list has a winning move in it (A move is a winning move if in the list 
-        2/3 elemnents are the player and the other one is an empty spot)
+        Returns a randomly selected corner to play in
 
         Parameters
         -------------------
-        list: list
-            List to be checked
+        board: Board
+            Playing board where we want to play in the corners
         player: str
-            Player that is looking for a winning move
+            Player that wants to play in one of the corners
         
         Returns
         -------------------
-        Indication of whether there is winning move for the player (bool)
+        corner: tuple
+            Coordinates of the selected corner to play in
         """
-        pl_count = 0
-        none_count = 0
+        corners = board.shape.corners
+        ind = self.rng.randint(0, len(corners) - 1)
+        return corners[ind]
 
-        for i in range(len(list)):
-            if list[i] == player:
-                pl_count += 1
-            elif list[i] == None:
-                none_count += 1
-    
-        if pl_count == 2 and none_count == 1:
-            return True
-        else:
-            return False
 
-    def __find_none(list):
-        """
-        Finds the empty spot in a list
 
+    def minimax_score(self, board, current_player, depth=0):
+        """Determines the score of a board using the minimax algorithm
+        
         Parameters
         -------------------
-        list: list
-            List to be checked
+        board: Board
+            Playing board to be evaluated
+        current_palyer: str
+            Player who wants to evaluate his score using the minimax algorithm
+        depth: int
+            Number used to keep track of the number of moves needed to bring the board to a terminal state
         
         Returns
         -------------------
-        i: int
-            Index of the empty spot
+        Score of the board (int): 10 - depth if X wins, depth - 10 if O wins and 0 for a draw
+        (on boards larger than 3x3 the number of cells + 1 is used instead of 10)
         """
-        for i in range(len(list)):
-            if list[i] == None:
-                return i
+        score = self.__relative_score(board.copy(), current_player) # the search makes its moves on the copy
+        return self.__adjust_score(score, depth) # adjust the score by the depth of the board
     
-    def __play_in_corners(board, player):
+    @staticmethod
+    def __adjust_score(score, depth):
         """
-        Returns a randomly selected corner to play in
+        Moves a score $depth moves further from the end of the game
+        (a negative depth brings it closer)
+
+        Parameters
+        -------------------
+        score: int
+            Score of a board
+        depth: int
+            Number of moves to be added to the distance from the end of the game
+
+        Returns
+        -------------------
+        Adjusted score (int)
+        """
+        if score > 0:
+            return score - depth
+        elif score < 0:
+            return score + depth
+        return 0
+    
+    def __relative_score(self, board, current_player):
+        """
+        Determines the minimax score of a board as if it was at depth 0.
+        The scores are stored in the cache, so that a board (or any of its
+        rotations and reflections) is only evaluated once.
+        The moves are made with push and taken back with pop, so the board is the same at the end.
 
         Parameters
         -------------------
         board: Board
-            Playing board where we want to play in the corners
-        player: str
-            Player that wants to play in one of the corners
+            Playing board to be evaluated
+        current_player: str
+            Player who has to move on the board
         
         Returns
         -------------------
-        corner: tuple
-            Coordinates of the selected corner to play in
+        Score of the board (int)
         """
-        corners = [(0,0), (0,2), (2,0), (2,2)]
-        ind = random.randint(0,3)
-        return corners[ind]
-
-
-
-    def minimax_score(self, board, current_player, depth=0):
-        """Determines the score of a board using the minimax algorithm
+        key = (board.canonical_key(), current_player)
+        score = self.cache.get(key)
+        if score is not None:
+            return score
         
+        winner = board.get_winner()
+        if winner == 'X':
+            score = win_score(board)
+        elif winner == 'O':
+            score = -win_score(board)
+        elif board.is_full():
+            score = 0 # if there is a draw return 0
+        elif board.winning_moves(current_player): # the best the player can do is to win with the next move
+            score = self.__adjust_score(win_score(board) if current_player == 'X' else -win_score(board), 1)
+        else:
+            # if not then apply the algorithm recursively
+            opponent = 'X' if current_player == 'O' else 'O'
+            scores = []
+            for move in board.legal_moves():
+                board.push(move, current_player)
+                scores.append(self.__relative_score(board, opponent))
+                board.pop()
+            score = max(scores) if current_player == 'X' else min(scores) # player that uses minimax is always X
+            # the scores of the children are one move further from the end of the game
+            score = self.__adjust_score(score, 1)
+        
+        self.cache.put(key, score)
+        return score
+    
+    def alphabeta_score(self, board, current_player, depth=0, alpha=-math.inf, beta=math.inf):
+        """
+        Determines the score of a board using the minimax algorithm with alpha-beta pruning.
+        The score is the same as the one of minimax_score when it is between alpha and beta,
+        otherwise it is a bound: a score <= alpha means that the real score is <= than it,
+        a score >= beta means that the real score is >= than it (fail-soft).
+
         Parameters
         -------------------
         board: Board
             Playing board to be evaluated
-        current_palyer: str
-            Player who wants to evaluate his score using the minimax algorithm
+        current_player: str
+            Player who has to move on the board
         depth: int
             Number used to keep track of the number of moves needed to bring the board to a terminal state
+        alpha: int
+            Score that X is already guaranteed to get
+        beta: int
+            Score that O is already guaranteed to get
         
         Returns
         -------------------
         Score of the board (int)
         """
-        # check if the board is in a terminal state
-        if board.is_full() or board.get_winner() is not None:
-            winner = board.get_winner()
+        return self.__alphabeta(board.copy(), current_player, depth, alpha, beta) # the search makes its moves on the copy
+    
+    def __alphabeta(self, board, current_player, depth, alpha, beta):
+        """
+        Alpha-beta search of alphabeta_score, making the moves with push and taking them back with pop
 
-            if winner == 'X':
-                return 10 - depth # return the score adjust by the depth
-            elif winner == 'O':
-                return depth - 10 # return the score adjust by the depth
-            else:
-                return 0 # if there is a draw return 0
+        Parameters
+        -------------------
+        board: Board
+            Playing board to be evaluated (it is the same at the end)
+        current_player: str
+            Player who has to move on the board
+        depth: int
+            Number of moves made from the root of the search
+        alpha: int
+            Score that X is already guaranteed to get
+        beta: int
+            Score that O is already guaranteed to get
         
-        # if not then apply the algorithm recursively
-        legal_moves = board.legal_moves()
+        Returns
+        -------------------
+        Score of the board (int)
+        """
+        key = (board.canonical_key(), current_player)
+        score = self.cache.get(key) # only exact scores are stored in the cache
+        if score is not None:
+            return self.__adjust_score(score, depth)
+        
+        winner = board.get_winner()
+        if winner is not None or board.is_full():
+            score = 0 if winner is None else (win_score(board) if winner == 'X' else -win_score(board))
+            self.cache.put(key, score)
+            return self.__adjust_score(score, depth)
+        if board.winning_moves(current_player): # the best the player can do is to win with the next move
+            score = self.__adjust_score(win_score(board) if current_player == 'X' else -win_score(board), 1)
+            self.cache.put(key, score)
+            return self.__adjust_score(score, depth)
+        
+        opponent = 'X' if current_player == 'O' else 'O'
+        maximize = current_player == 'X'
+        low, high = alpha, beta
+        best = -math.inf if maximize else math.inf
 
-        scores = []
-        for move in legal_moves: # call the algorithm to determine the score of the available moves
-            new_board = board.make_move(move, current_player) 
-            opponent = 'X' if current_player == 'O' else 'O'
-            score = self.minimax_score(self, new_board, opponent, depth+1)
-            scores.append(score)
+        for move in self.__ordered_moves(board, current_player, depth):
+            board.push(move, current_player)
+            score = self.__alphabeta(board, opponent, depth+1, low, high)
+            board.pop()
+            if maximize:
+                if score > best:
+                    best = score
+                    low = max(low, score)
+            else:
+                if score < best:
+                    best = score
+                    high = min(high, score)
+            if low >= high: # the opponent will never allow this board to be reached
+                self.__record_cutoff(board, move, current_player, depth)
+                break
         
-        if current_player == 'X':# player that uses minimax is always X
-            return max(scores)
-        else:
-            return min(scores)
+        if alpha < best < beta: # the score is exact, so it can be stored
+            self.cache.put(key, self.__adjust_score(best, -depth))
+        return best
+    
+    def __ordered_moves(self, board, player, depth):
+        """
+        Orders the legal moves so that the ones that most likely cause a cutoff are searched first:
+        killer moves at this depth, then moves with a better history, then the cells
+        that belong to more lines (center, corners and then edges)
+
+        Parameters
+        -------------------
+        board: Board
+            Playing board
+        player: str
+            Player who has to move
+        depth: int
+            Depth of the board in the search
+
+        Returns
+        -------------------
+        moves: list
+            The legal moves in the order in which they have to be searched
+        """
+        killers = self.killers.get(depth, ())
+        history = self.history
+        weights = board.shape.weights
+        return sorted(
+            board.legal_moves(),
+            key=lambda move: (move not in killers, -history.get((player, move), 0), -weights[move]),
+        )
+    
+    def __record_cutoff(self, board, move, player, depth):
+        """
+        Records a move that caused a cutoff in the killer moves and in the history heuristic
+
+        Parameters
+        -------------------
+        board: Board
+            Playing board where the move caused the cutoff
+        move: tuple
+            Move that caused the cutoff
+        player: str
+            Player who made the move
+        depth: int
+            Depth of the board in the search
+        """
+        killers = self.killers.setdefault(depth, [])
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:] # only the last two killer moves are kept for each depth
+        remaining = len(board.legal_moves())
+        self.history[(player, move)] = self.history.get((player, move), 0) + remaining * remaining
 
 
     def minimax_ai(self, board, player):
@@ -243,27 +571,368 @@ class AIPlayer:
         """
         if board.is_empty(): # if the board is empty the best thing to do is to play in one of the corners
             return self.__play_in_corners(board, player)
+        if (self.workers > 1 and self.search in ("minimax", "alphabeta")
+                and board.shape.size - board.move_count >= self.parallel_min_cells):
+            return self.__parallel_root(board, player)
+        if self.search == "alphabeta":
+            return self.__alphabeta_root(board, player)
+        if self.search == "iterative":
+            return self.__iterative_root(board, player)
         
         scores = []
         legal_moves = board.legal_moves()
+        board = board.copy() # the moves are made and taken back on the copy
+        opponent = 'X' if player == 'O' else 'O'
 
         for move in legal_moves:
-            new_board = board.make_move(move, player) # move make_move method to Board
-            opponent = 'X' if player == 'O' else 'O'
-            score = self.minimax_score(self, new_board, opponent) # determine the score for each possible board
+            board.push(move, player)
+            score = self.__relative_score(board, opponent) # determine the score for each possible board
+            board.pop()
             scores.append(score)
         
         # depending on who the player is return the position with the highest score or the lowest
         best_ind = scores.index(max(scores)) if player == 'X' else scores.index(min(scores))
         best_move = legal_moves[best_ind]
         return best_move
+    
+    def __alphabeta_root(self, board, player):
+        """
+        Determines the best move using alpha-beta pruning.
+        The moves are searched in their natural order and a move replaces the best one
+        only if it is strictly better, so the first best move is chosen as in the plain minimax.
+
+        Parameters
+        -------------------
+        board: Board
+            Playing board
+        player: str
+            Player that is using the algorithm to choose where to play
+        
+        Returns
+        -------------------
+        best_move: tuple
+            Coordinates of the best move
+        """
+        self.killers.clear()
+        opponent = 'X' if player == 'O' else 'O'
+        best_move = None
+        best = -math.inf if player == 'X' else math.inf
+        legal_moves = board.legal_moves()
+        board = board.copy() # the moves are made and taken back on the copy
+
+        for move in legal_moves:
+            board.push(move, player)
+            if player == 'X': # a move that can't be better than the best one gets a bound <= best
+                score = self.__alphabeta(board, opponent, 0, best, math.inf)
+                if score > best:
+                    best, best_move = score, move
+            else:
+                score = self.__alphabeta(board, opponent, 0, -math.inf, best)
+                if score < best:
+                    best, best_move = score, move
+            board.pop()
+        return best_move
+
+    def __parallel_root(self, board, player):
+        """
+        Determines the best move searching the children of the root in a pool of processes.
+        With alpha-beta the first child is searched here, and its score is the bound of the searches of
+        the other children, which run in parallel. A child that can't be better than the first one
+        gets a bound, every other child gets its exact score, so the first best move in the natural
+        order is the same one chosen by the sequential search.
+
+        Parameters
+        -------------------
+        board: Board
+            Playing board
+        player: str
+            Player that is using the algorithm to choose where to play
+        
+        Returns
+        -------------------
+        best_move: tuple
+            Coordinates of the best move
+        """
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers)
+        opponent = 'X' if player == 'O' else 'O'
+        legal_moves = board.legal_moves()
+        children = [Board.make_move(board, move, player) for move in legal_moves] # plain boards for the workers
+        if self.search == "alphabeta":
+            first = self.alphabeta_score(children[0], opponent) # exact score
+            low, high = (first, math.inf) if player == 'X' else (-math.inf, first)
+            jobs = [("alphabeta", child, opponent, low, high) for child in children[1:]]
+            scores = [first] + list(self._pool.map(_search_child, jobs))
+        else:
+            jobs = [("minimax", child, opponent, -math.inf, math.inf) for child in children]
+            scores = list(self._pool.map(_search_child, jobs))
+
+        best_move = None
+        best = -math.inf if player == 'X' else math.inf
+        for move, score in zip(legal_moves, scores): # a move replaces the best one only if it is strictly better
+            if (score > best) if player == 'X' else (score < best):
+                best, best_move = score, move
+        return best_move
+
+    def __iterative_root(self, board, player):
+        """
+        Iterative deepening: searches the board to depth 1, 2, 3, ... until the deadline,
+        starting every iteration from the principal variation of the previous one.
+        The search stops earlier when an iteration reaches the end of every line of play.
+
+        Parameters
+        -------------------
+        board: Board
+            Playing board
+        player: str
+            Player that is using the algorithm to choose where to play
+        
+        Returns
+        -------------------
+        best_move: tuple
+            Best move of the deepest iteration completed
+        """
+        deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        self.killers.clear()
+        self.pv_moves.clear()
+        legal_moves = board.legal_moves()
+        board = board.copy() # the moves are made and taken back on the copy
+        opponent = 'X' if player == 'O' else 'O'
+        best_move = legal_moves[0]
+        depth = 1
+        while True:
+            self._deadline = None if depth == 1 else deadline # the first iteration always completes
+            self._nodes = 0
+            self._exact = True
+            previous = self.pv_moves.get(hash(board))
+            moves = legal_moves if previous is None else [previous] + [m for m in legal_moves if m != previous]
+            best = -math.inf if player == 'X' else math.inf
+            iteration_move = None
+            try:
+                for move in moves:
+                    board.push(move, player)
+                    try:
+                        if player == 'X':
+                            score = self.__depth_limited(board, opponent, 0, depth - 1, best, math.inf)
+                        else:
+                            score = self.__depth_limited(board, opponent, 0, depth - 1, -math.inf, best)
+                    finally:
+                        board.pop()
+                    if (score > best) if player == 'X' else (score < best):
+                        best, iteration_move = score, move
+            except SearchTimeout: # the moves of the unfinished iteration are not reliable
+                break
+            best_move = iteration_move
+            self.pv_moves[hash(board)] = best_move
+            if self._exact or (self.max_depth is not None and depth >= self.max_depth):
+                break
+            depth += 1
+        self._deadline = None
+        return best_move
+    
+    def __depth_limited(self, board, current_player, depth, remaining, alpha, beta):
+        """
+        Fail-soft alpha-beta search stopping $remaining moves from the root of the iteration,
+        where the board is given the score of self.evaluate
+
+        Parameters
+        -------------------
+        board: Board
+            Playing board to be evaluated (it is the same at the end)
+        current_player: str
+            Player who has to move on the board
+        depth: int
+            Number of moves made from the root of the search
+        remaining: int
+            Number of moves that can still be searched
+        alpha: float
+            Score that X is already guaranteed to get
+        beta: float
+            Score that O is already guaranteed to get
+        
+        Returns
+        -------------------
+        Score of the board (float)
+        """
+        self._nodes += 1
+        if self._deadline is not None and not self._nodes & 255 and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+
+        winner = board.get_winner()
+        if winner is not None or board.is_full():
+            score = 0 if winner is None else (win_score(board) if winner == 'X' else -win_score(board))
+            return self.__adjust_score(score, depth)
+        if board.winning_moves(current_player): # the best the player can do is to win with the next move
+            return self.__adjust_score(win_score(board) if current_player == 'X' else -win_score(board), depth + 1)
+        if remaining == 0:
+            self._exact = False # the score is an estimate, a deeper iteration can improve it
+            return self.evaluate(board)
+
+        key = hash(board)
+        opponent = 'X' if current_player == 'O' else 'O'
+        maximize = current_player == 'X'
+        low, high = alpha, beta
+        best = -math.inf if maximize else math.inf
+        best_move = None
+        moves = self.__ordered_moves(board, current_player, depth)
+        previous = self.pv_moves.get(key)
+        if previous in moves: # the best move of the previous iteration is searched first
+            moves.remove(previous)
+            moves.insert(0, previous)
+
+        for move in moves:
+            board.push(move, current_player)
+            try:
+                score = self.__depth_limited(board, opponent, depth+1, remaining-1, low, high)
+            finally:
+                board.pop()
+            if (score > best) if maximize else (score < best):
+                best, best_move = score, move
+                if maximize:
+                    low = max(low, score)
+                else:
+                    high = min(high, score)
+            if low >= high: # the opponent will never allow this board to be reached
+                self.__record_cutoff(board, move, current_player, depth)
+                break
+        
+        self.pv_moves[key] = best_move
+        return best
+    
+    def best_moves(self, boards, player=None, deterministic=False):
+        """
+        Best moves and minimax scores of many boards.
+        Boards that are the same, or rotations and reflections of each other, are searched only once
+        and all the searches share the cache, so a batch costs at most one search per distinct position.
+
+        Parameters
+        -------------------
+        boards: iterable
+            Boards to be searched (read one at a time, so it can be a generator)
+        player: str
+            Player who has to move on every board (if None the player whose turn it is, X moves first)
+        deterministic: bool
+            Choose the lowest cell among the best moves, instead of a random one
+
+        Returns
+        -------------------
+        results: generator
+            (best move, score) for every board, in the same order. The score is the one of minimax_score,
+            the move is None when the game is already over
+        """
+        searched = {} # (canonical key, player) -> (mask of the best moves in the canonical board, score)
+        for board in boards:
+            mover = player
+            if mover is None:
+                mover = 'X' if bin(board.x).count('1') == bin(board.o).count('1') else 'O'
+            shape = board.shape
+            symmetry = board.canonical_symmetry()
+            perm = shape.permutations[symmetry]
+            key = (board.canonical_key(), mover)
+            result = searched.get(key)
+            if result is None:
+                best_mask, score = self.__best_moves_mask(board, mover)
+                canonical_mask = 0
+                for i in range(shape.size):
+                    if best_mask >> i & 1:
+                        canonical_mask |= 1 << perm[i]
+                result = searched[key] = (canonical_mask, score)
+            canonical_mask, score = result
+            if not canonical_mask:
+                yield None, score
+                continue
+            cells = [i for i in range(shape.size) if canonical_mask >> perm[i] & 1] # back to the board's orientation
+            cell = cells[0] if deterministic else self.rng.choice(cells)
+            yield shape.coords[cell], score
+    
+    def __best_moves_mask(self, board, player):
+        """
+        Finds all the best moves of a board
+
+        Parameters
+        -------------------
+        board: Board
+            Playing board
+        player: str
+            Player who has to move
+
+        Returns
+        -------------------
+        best_mask: int
+            Mask of the cells of the best moves (0 if the game is over)
+        score: int
+            Minimax score of the board
+        """
+        if board.get_winner() is not None or board.is_full():
+            return 0, self.minimax_score(board, player)
+        opponent = 'X' if player == 'O' else 'O'
+        board = board.copy() # the moves are made and taken back on the copy
+        scores = {}
+        for move in board.legal_moves():
+            board.push(move, player)
+            scores[move] = self.__relative_score(board, opponent)
+            board.pop()
+        best = max(scores.values()) if player == 'X' else min(scores.values())
+        best_mask = 0
+        indexes = board.shape.indexes
+        for move, score in scores.items():
+            if score == best:
+                best_mask |= 1 << indexes[move]
+        return best_mask, self.__adjust_score(best, 1) # the scores of the children are one move further from the end
+
+    def table_ai(self, board, player):
+        """
+        Table AI: plays the same moves as minimax_ai, reading them from the perfect play table
+        instead of searching the game tree.
+        Boards that can't be reached in a game where X moves first are searched with minimax_ai.
+
+        Parameters
+        -------------------
+        board: Board
+            Playing board
+        player: str
+            Player that is using the table to choose where to play
+        
+        Returns
+        -------------------
+        best_move: tuple
+            Coordinates of the first of the best moves
+        """
+        if board.shape.key != (3, 3, 3): # the table only covers the classic board
+            return self.minimax_ai(board, player)
+        record = self.table.lookup(board)
+        to_move = 'X' if bin(board.x).count('1') == bin(board.o).count('1') else 'O'
+        if record is None or player != to_move or not record[2]:
+            return self.minimax_ai(board, player)
+        best_moves = record[2]
+        return divmod((best_moves & -best_moves).bit_length() - 1, 3) # lowest cell among the best moves
+
+    def mcts_ai(self, board, player):
+        """
+        Monte Carlo tree search AI: plays random games from the board, choosing the moves to explore with UCT,
+        and plays the move explored the most. Its strength and its time depend on the budget of self.mcts
+        (a number of playouts or a time limit), so it can play on boards too large for minimax_ai.
+
+        Parameters
+        -------------------
+        board: Board
+            Playing board
+        player: str
+            Player that is using the AI to choose where to play
+        
+        Returns
+        -------------------
+        best_move: tuple
+            Coordinates of the move
+        """
+        return self.mcts.search(board, player)
 
 if __name__ == '__main__':
     b = Board()
-    b.board[0][0] = "X"
-    b.board[0][1] = "X"
-    b.board[1][1] = "O"
-    b.board[2][1] = "O"
+    b[0,0] = "X"
+    b[0,1] = "X"
+    b[1,1] = "O"
+    b[2,1] = "O"
     ai = AIPlayer()
     print(ai.minimax_ai(b, 'X'))
     
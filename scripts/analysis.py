@@ -0,0 +1,258 @@
+from scripts.ai import AIPlayer
+from scripts.position import Position
+from collections import deque
+import argparse
+import itertools
+import json
+import multiprocessing
+import sys
+
+
+def outcome(score, player):
+    """
+    Result of the game with perfect play from a minimax score, for a player
+
+    Parameters
+    -------------------
+    score: int
+        Minimax score (positive if X wins)
+    player: str
+        Player the result is for
+
+    Returns
+    -------------------
+    1 if the player wins, 0 for a draw, -1 if the player loses (int)
+    """
+    result = (score > 0) - (score < 0)
+    return result if player == 'X' else -result
+
+
+class Analyzer:
+    """
+    Replays games and evaluates every move with minimax.
+    The evaluations are kept between the games (the positions are interned and the openings repeat),
+    so every distinct position is searched only once.
+
+    Attributes:
+        self.ai: AIPlayer
+            AI whose cache holds the minimax scores
+        self.best: dict
+            Best move and its score, by (position, player to move)
+    """
+    def __init__(self, ai=None):
+        """
+        Constructor
+
+        Parameters
+        -------------------
+        ai: AIPlayer
+            AI used for the scores (if None a new one is created)
+        """
+        self.ai = AIPlayer() if ai is None else ai
+        self.best = {}
+
+    def best_move(self, position, player):
+        """
+        Returns the best move of a position (the lowest cell among the best ones) and its score
+
+        Parameters
+        -------------------
+        position: Position
+            Position where the player has to move
+        player: str
+            Player who has to move
+
+        Returns
+        -------------------
+        best: tuple
+            (coordinates of the best move, minimax score after it)
+        """
+        best = self.best.get((position, player))
+        if best is None:
+            move, _ = next(self.ai.best_moves([position], player, deterministic=True))
+            opponent = 'O' if player == 'X' else 'X'
+            best = self.best[(position, player)] = (move, self.ai.minimax_score(position.make_move(move, player), opponent))
+        return best
+
+    def analyze(self, record):
+        """
+        Evaluates the moves of a game
+
+        Parameters
+        -------------------
+        record: dict
+            Game with the "moves" (coordinates, X moves first), the "ai" and the "ai_player",
+            as written by the event log or the history store
+
+        Returns
+        -------------------
+        record: dict
+            A copy of the record with the "analysis" of every move: its minimax "value" (positive if X wins),
+            the "best_move" and its "best_value", whether it keeps the best result that the player could get
+            ("accurate") and whether it turns a draw into a loss ("blunder").
+            Games that are not on the 3x3 board have None as analysis
+        """
+        if tuple(record.get("shape", (3, 3, 3))) != (3, 3, 3):
+            return dict(record, analysis=None)
+        for field in ("ai", "ai_player"): # needed by the report, to tell the moves of the AI from the human ones
+            if field not in record:
+                raise ValueError(f'missing field "{field}"')
+        position, player = Position.initial(), 'X'
+        analysis = []
+        for move in record["moves"]:
+            move = tuple(move)
+            opponent = 'O' if player == 'X' else 'X'
+            best_move, best_value = self.best_move(position, player)
+            position = position.make_move(move, player)
+            value = self.ai.minimax_score(position, opponent)
+            before, after = outcome(best_value, player), outcome(value, player)
+            analysis.append({
+                "player": player,
+                "value": value,
+                "best_move": list(best_move),
+                "best_value": best_value,
+                "accurate": after == before,
+                "blunder": before == 0 and after == -1,
+            })
+            player = opponent
+        return dict(record, analysis=analysis)
+
+
+_analyzer = None # Analyzer of a worker process, kept between the chunks
+
+
+def analyze_chunk(records):
+    """
+    Analyzes a chunk of games in a worker process
+
+    Parameters
+    -------------------
+    records: list
+        Games to be analyzed
+
+    Returns
+    -------------------
+    records: list
+        The analyzed games (a game that can't be analyzed, because it is malformed or has an illegal move,
+        has None as analysis and the reason in "error", the other games of the chunk are still analyzed)
+    """
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = Analyzer()
+    analyzed = []
+    for record in records:
+        try:
+            analyzed.append(_analyzer.analyze(record))
+        except Exception as e:
+            error = f'{type(e).__name__}: {e}'
+            analyzed.append(dict(record, analysis=None, error=error) if isinstance(record, dict) else {"analysis": None, "error": error})
+    return analyzed
+
+
+def analyze_games(records, workers=1, chunk_size=1000):
+    """
+    Analyzes a stream of games, in the same order.
+    Only a few chunks are in memory at a time, so the stream can be longer than the memory.
+
+    Parameters
+    -------------------
+    records: iterable
+        Games to be analyzed (for example read_events(path) or HistoryStore.games())
+    workers: int
+        Number of processes (1 to analyze in the current process)
+    chunk_size: int
+        Number of games sent to a process in one go
+
+    Returns
+    -------------------
+    records: generator
+        The analyzed games (see Analyzer.analyze)
+    """
+    records = iter(records)
+    chunks = iter(lambda: list(itertools.islice(records, chunk_size)), [])
+    if workers == 1:
+        for chunk in chunks:
+            yield from analyze_chunk(chunk)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.apply_async(analyze_chunk, (chunk,)))
+            if len(pending) >= 2 * workers: # every process has a chunk queued, wait for the oldest
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+
+
+def accuracy_report(records, report=None):
+    """
+    Adds up the analysis of the games by AI, for the moves of the AIs and for the moves of the humans playing against them
+
+    Parameters
+    -------------------
+    records: iterable
+        Analyzed games
+    report: dict
+        Report to be updated (if None it starts from zero)
+
+    Returns
+    -------------------
+    report: dict
+        {"ai": {name: counts}, "human": {name of the opponent AI: counts}}, where the counts are the
+        number of "moves", the "accurate" moves, the "blunders" and the "accuracy" (accurate moves over moves)
+    """
+    report = {"ai": {}, "human": {}} if report is None else report
+    for record in records:
+        # games that couldn't be analyzed are skipped (they are reported with their "error")
+        if record.get("analysis") is None or record.get("ai") is None or record.get("ai_player") is None:
+            continue
+        for annotation in record["analysis"]:
+            side = "ai" if annotation["player"] == record["ai_player"] else "human"
+            counts = report[side].setdefault(record["ai"], {"moves": 0, "accurate": 0, "blunders": 0, "accuracy": 0.0})
+            counts["moves"] += 1
+            counts["accurate"] += annotation["accurate"]
+            counts["blunders"] += annotation["blunder"]
+            counts["accuracy"] = counts["accurate"] / counts["moves"]
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Evaluates every move of the recorded games and reports the accuracy of the players')
+    parser.add_argument('path', help='game history log (.jsonl) or store (.tth)')
+    parser.add_argument('--workers', type=int, default=None, help='number of processes (default: one per CPU)')
+    parser.add_argument('--output', help='write the analyzed games to this log (.jsonl)')
+    args = parser.parse_args()
+
+    store = None
+    if args.path.endswith('.tth'):
+        from scripts.history_store import HistoryStore
+        store = HistoryStore(args.path)
+        records = store.games()
+    else:
+        from scripts.event_log import read_events
+        records = read_events(args.path)
+    errors = 0
+    def checked(records):
+        global errors
+        for record in records:
+            if "error" in record:
+                errors += 1
+            yield record
+    try:
+        analyzed = checked(analyze_games(records, args.workers or multiprocessing.cpu_count()))
+        if args.output:
+            from scripts.event_log import GameLog
+            def logged(records, log):
+                for record in records:
+                    log.append(record)
+                    yield record
+            with GameLog(args.output) as log:
+                report = accuracy_report(logged(analyzed, log))
+        else:
+            report = accuracy_report(analyzed)
+    finally:
+        if store is not None:
+            store.close()
+    print(json.dumps(report, indent=2))
+    if errors:
+        print(f'{errors} games could not be analyzed', file=sys.stderr)
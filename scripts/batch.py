@@ -0,0 +1,214 @@
+from scripts.board import Board
+import numpy as np
+
+EMPTY, X, O = 0, 1, -1 # values of the cells in a batch
+
+
+class BoardBatch:
+    """
+    Many boards of the same shape held in a single (N, cells) int8 array,
+    so that they can be evaluated and played with array operations.
+    Cells contain 1 for X, -1 for O and 0 when they are empty.
+
+    Attributes:
+        self.cells: numpy.ndarray
+            (N, rows * cols) array with the cells of the boards
+        self.turn: numpy.ndarray
+            (N,) array with the player who has to move on each board (1 for X, -1 for O)
+        self.k: int
+            Number of marks in a row needed to win
+        self.lines: numpy.ndarray
+            (lines, k) array with the indexes of the cells of the winning lines,
+            the same lines and order used by Board.get_combos
+        self.rng: numpy.random.Generator
+            Random number generator used for the random moves
+    """
+    def __init__(self, n, rows=3, cols=3, k=None, seed=None):
+        """
+        Constructor: creates N empty boards, X moves first
+
+        Parameters
+        -------------------
+        n: int
+            Number of boards
+        rows: int
+            Number of rows of the boards
+        cols: int
+            Number of columns of the boards
+        k: int
+            Number of marks in a row needed to win (by default the smallest side of the board)
+        seed: int
+            Seed of the random number generator
+        """
+        shape = Board(rows, cols, k).shape
+        self.k = shape.k
+        self.lines = np.array(shape.line_cells, dtype=np.intp)
+        self.cells = np.zeros((n, shape.size), dtype=np.int8)
+        self.turn = np.full(n, X, dtype=np.int8)
+        self.rng = np.random.default_rng(seed)
+
+    @classmethod
+    def from_boards(cls, boards, seed=None):
+        """
+        Creates a batch from a list of boards with the same shape
+
+        Parameters
+        -------------------
+        boards: list
+            Boards to be copied in the batch (the player to move is deduced from the number of marks)
+        seed: int
+            Seed of the random number generator
+
+        Returns
+        -------------------
+        batch: BoardBatch
+            The batch with the boards
+        """
+        boards = list(boards)
+        first = boards[0] if boards else Board()
+        batch = cls(len(boards), first.rows, first.cols, first.k, seed)
+        rows = {} # boards that appear more than once are converted only once
+        for i, board in enumerate(boards):
+            if board.shape is not first.shape:
+                raise ValueError('All the boards of a batch must have the same shape')
+            row = rows.get((board.x, board.o))
+            if row is None:
+                row = rows[(board.x, board.o)] = [EMPTY if cell is None else (X if cell == 'X' else O) for cell in board]
+            batch.cells[i] = row
+        batch.turn = np.where((batch.cells == X).sum(axis=1) > (batch.cells == O).sum(axis=1), O, X).astype(np.int8)
+        return batch
+
+    def __len__(self):
+        """Number of boards in the batch"""
+        return len(self.cells)
+
+    def winners(self, rows=None):
+        """
+        Determines the winner of every board
+
+        Parameters
+        -------------------
+        rows: numpy.ndarray
+            Indexes of the boards to be checked (by default all of them)
+
+        Returns
+        -------------------
+        winners: numpy.ndarray
+            Array with 1 where X has won, -1 where O has won and 0 where nobody has won
+        """
+        cells = self.cells if rows is None else self.cells[rows]
+        sums = cells[:, self.lines].sum(axis=2, dtype=np.int16) # sum of the cells of every line
+        x_wins = (sums == self.k).any(axis=1)
+        o_wins = (sums == -self.k).any(axis=1)
+        return np.where(x_wins, X, np.where(o_wins, O, EMPTY)).astype(np.int8)
+
+    def is_full(self):
+        """
+        Determines which boards are full
+
+        Returns
+        -------------------
+        full: numpy.ndarray
+            (N,) boolean array
+        """
+        return (self.cells != EMPTY).all(axis=1)
+
+    def legal_moves(self):
+        """
+        Determines the legal moves of every board
+
+        Returns
+        -------------------
+        legal: numpy.ndarray
+            (N, cells) boolean array, True where the cell is empty
+        """
+        return self.cells == EMPTY
+
+    def finished(self, winners=None):
+        """
+        Determines which games are over
+
+        Parameters
+        -------------------
+        winners: numpy.ndarray
+            Result of winners(), if it has already been computed
+
+        Returns
+        -------------------
+        finished: numpy.ndarray
+            (N,) boolean array, True where there is a winner or the board is full
+        """
+        if winners is None:
+            winners = self.winners()
+        return (winners != EMPTY) | self.is_full()
+
+    def step(self, active=None):
+        """
+        Makes a uniformly random legal move on every active board
+
+        Parameters
+        -------------------
+        active: numpy.ndarray
+            (N,) boolean array with the boards where a move has to be made
+            (by default the ones where the game is not over)
+        """
+        if active is None:
+            active = ~self.finished()
+        rows = np.flatnonzero(active)
+        if not len(rows):
+            return
+        # every empty cell gets a random key, the largest key is the move: all the empty cells are equally likely
+        keys = self.rng.random((len(rows), self.cells.shape[1]))
+        keys[self.cells[rows] != EMPTY] = -1.0
+        moves = keys.argmax(axis=1)
+        self.cells[rows, moves] = self.turn[rows]
+        self.turn[rows] = -self.turn[rows]
+
+    def playout(self):
+        """
+        Plays random moves on every board until all the games are over
+
+        Returns
+        -------------------
+        winners: numpy.ndarray
+            (N,) array with the winner of every game (1 for X, -1 for O, 0 for a draw)
+        """
+        winners = self.winners()
+        active = ~self.finished(winners)
+        while active.any():
+            self.step(active)
+            rows = np.flatnonzero(active) # only the boards that have changed are checked again
+            winners[rows] = self.winners(rows)
+            active[rows] = (winners[rows] == EMPTY) & (self.cells[rows] == EMPTY).any(axis=1)
+        return winners
+
+
+def random_playouts(board, n, seed=None):
+    """
+    Monte Carlo statistics of a position: plays N random games from the board
+
+    Parameters
+    -------------------
+    board: Board
+        Board where the games start
+    n: int
+        Number of random games
+    seed: int
+        Seed of the random number generator
+
+    Returns
+    -------------------
+    stats: dict
+        Games won by each player, drawn and played, in the same format as GameManager.stats
+    """
+    single = BoardBatch.from_boards([board])
+    batch = BoardBatch(n, board.rows, board.cols, board.k, seed)
+    batch.cells[:] = single.cells[0] # the same position on every board
+    batch.turn[:] = single.turn[0]
+    winners = batch.playout()
+    return {
+        "X": int((winners == X).sum()),
+        "O": int((winners == O).sum()),
+        "Draw": int((winners == EMPTY).sum()),
+        "Total": n,
+    }
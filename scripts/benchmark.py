@@ -0,0 +1,286 @@
+from scripts.ai import AIPlayer, open_lines_evaluation
+from scripts.board import Board
+from scripts.engine import AI_NAMES
+from scripts.position import Position
+from scripts.qubic import QubicBoard
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+VERSION = 1 # version of the format of the baseline files
+# fixed game used to get a position at every ply
+GAME = [(0, 0), (1, 1), (0, 1), (0, 2), (2, 0), (1, 0), (1, 2), (2, 1), (2, 2)]
+# fixed opening of 3D Tic-Tac-Toe, for the benchmarks of the 4x4x4 board (76 lines)
+QUBIC_OPENING = [(0, 0, 0), (1, 1, 1), (3, 3, 3), (2, 2, 2), (0, 3, 0), (0, 1, 1), (3, 0, 3), (1, 2, 1)]
+
+
+def positions_by_ply():
+    """
+    Returns the positions of the fixed game after each number of moves
+
+    Returns
+    -------------------
+    positions: list
+        (board, player to move) for every ply from 0 to 8
+    """
+    positions = []
+    board, player = Board(), 'X'
+    for move in GAME:
+        positions.append((board, player))
+        board = board.make_move(move, player)
+        player = 'O' if player == 'X' else 'X'
+    return positions
+
+
+def corpus(size=50, seed=0):
+    """
+    Returns a fixed corpus of positions where the game is not over, taken from random games
+
+    Parameters
+    -------------------
+    size: int
+        Number of positions
+    seed: int
+        Seed of the random games
+
+    Returns
+    -------------------
+    positions: list
+        (board, player to move) pairs
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < size:
+        board, player = Board(), 'X'
+        while board.get_winner() is None and not board.is_full() and len(positions) < size:
+            if not board.is_empty():
+                positions.append((board, player))
+            board = board.make_move(rng.choice(board.legal_moves()), player)
+            player = 'O' if player == 'X' else 'X'
+    return positions
+
+
+def measure(function, number, repeat):
+    """
+    Measures the time of a function
+
+    Parameters
+    -------------------
+    function: callable
+        Function to be measured (called without arguments)
+    number: int
+        Number of calls in a measurement
+    repeat: int
+        Number of measurements (the fastest one is kept, the others are disturbed by other processes)
+
+    Returns
+    -------------------
+    Seconds per call (float)
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def run(scale=1.0, repeat=5):
+    """
+    Runs the benchmarks
+
+    Parameters
+    -------------------
+    scale: float
+        Multiplier of the number of calls of every benchmark (smaller is faster but noisier)
+    repeat: int
+        Number of measurements of every benchmark
+
+    Returns
+    -------------------
+    metrics: dict
+        Seconds per call of every benchmark, by name
+    """
+    def times(n):
+        return max(1, int(n * scale))
+
+    metrics = {}
+    board = Board().make_move((0, 0), 'X').make_move((1, 1), 'O').make_move((0, 1), 'X')
+    metrics['board.make_move'] = measure(lambda: board.make_move((2, 2), 'O'), times(20000), repeat)
+    position = Position.of(board)
+    metrics['position.make_move'] = measure(lambda: position.make_move((2, 2), 'O'), times(20000), repeat)
+    metrics['board.get_winner'] = measure(board.get_winner, times(50000), repeat)
+    metrics['board.legal_moves'] = measure(board.legal_moves, times(20000), repeat)
+    metrics['board.getitem_int'] = measure(lambda: board[4], times(50000), repeat)
+    metrics['board.getitem_tuple'] = measure(lambda: board[(1, 1)], times(50000), repeat)
+    metrics['board.getitem_slice'] = measure(lambda: board[0:9:2], times(20000), repeat)
+
+    for ply, (position, player) in enumerate(positions_by_ply()):
+        if ply == 0: # on the empty board minimax_ai plays in a random corner without searching
+            continue
+        def search():
+            AIPlayer(rng=random.Random(0)).minimax_ai(position, player) # a new AI, so that the cache is empty
+        metrics[f'minimax_ai.ply{ply}'] = measure(search, times(20 if ply < 2 else 100), repeat)
+
+    qubic, player = QubicBoard(), 'X'
+    for move in QUBIC_OPENING:
+        qubic = qubic.make_move(move, player)
+        player = 'O' if player == 'X' else 'X'
+    metrics['qubic.make_move'] = measure(lambda: qubic.make_move((2, 1, 3), player), times(20000), repeat)
+    metrics['qubic.evaluation'] = measure(lambda: open_lines_evaluation(qubic), times(5000), repeat)
+    def qubic_search():
+        AIPlayer(search="iterative", max_depth=2, rng=random.Random(0)).minimax_ai(qubic, player)
+    metrics['qubic.iterative_depth2'] = measure(qubic_search, times(20), repeat)
+
+    positions = corpus()
+    for name in AI_NAMES:
+        ai = AIPlayer(rng=random.Random(0))
+        ai_function = getattr(ai, name)
+        def play():
+            for position, player in positions:
+                ai_function(position, player)
+            ai.clear_cache()
+        metrics[f'move_latency.{name}'] = measure(play, times(5), repeat) / len(positions)
+    return metrics
+
+
+def save(metrics, path):
+    """
+    Writes the metrics as a JSON baseline
+
+    Parameters
+    -------------------
+    metrics: dict
+        Seconds per call of every benchmark
+    path: str
+        Path of the file
+    """
+    out_file = open(path, "w")
+    json.dump({"version": VERSION, "python": platform.python_version(), "metrics": metrics}, out_file, indent=2, sort_keys=True)
+    out_file.close()
+
+
+def read(path):
+    """
+    Reads a JSON baseline
+
+    Parameters
+    -------------------
+    path: str
+        Path of the file
+
+    Returns
+    -------------------
+    data: dict
+        The "metrics" (seconds per call of every benchmark) and the "python" version that measured them
+    """
+    in_file = open(path)
+    data = json.load(in_file)
+    in_file.close()
+    if data.get("version") != VERSION:
+        raise ValueError(f"Unsupported baseline version: {data.get('version')}")
+    return data
+
+
+def load(path):
+    """
+    Reads the metrics of a JSON baseline
+
+    Parameters
+    -------------------
+    path: str
+        Path of the file
+
+    Returns
+    -------------------
+    metrics: dict
+        Seconds per call of every benchmark
+    """
+    return read(path)["metrics"]
+
+
+def compare(baseline, current, threshold=0.25):
+    """
+    Compares two sets of metrics
+
+    Parameters
+    -------------------
+    baseline: dict
+        Metrics of the baseline
+    current: dict
+        Metrics to be checked
+    threshold: float
+        Relative slowdown allowed before a metric is a regression (0.25 is 25% slower)
+
+    Returns
+    -------------------
+    rows: list
+        (name, baseline, current, ratio, regressed) for every metric of the baseline.
+        A metric missing from the current results (renamed or not measured anymore) has current
+        and ratio None and counts as a regression, metrics that are only in the current results are ignored
+    """
+    rows = []
+    for name in sorted(baseline):
+        if name not in current:
+            rows.append((name, baseline[name], None, None, True))
+            continue
+        ratio = current[name] / baseline[name] if baseline[name] else float('inf')
+        rows.append((name, baseline[name], current[name], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main(argv=None):
+    """
+    Command line interface: 'run' writes a baseline, 'compare' fails if a metric has regressed
+
+    Returns
+    -------------------
+    Exit code (int)
+    """
+    parser = argparse.ArgumentParser(description='Benchmarks of the board and of the AIs')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help='run the benchmarks and write the results')
+    run_parser.add_argument('--output', default='benchmark.json', help='path of the JSON results')
+    run_parser.add_argument('--scale', type=float, default=1.0, help='multiplier of the number of calls')
+    run_parser.add_argument('--repeat', type=int, default=5, help='measurements of every benchmark')
+    compare_parser = commands.add_parser('compare', help='compare results against a baseline')
+    compare_parser.add_argument('baseline', help='path of the baseline')
+    compare_parser.add_argument('current', nargs='?', help='path of the results (by default the benchmarks are run)')
+    compare_parser.add_argument('--threshold', type=float, default=0.25, help='relative slowdown allowed')
+    compare_parser.add_argument('--scale', type=float, default=1.0, help='multiplier of the number of calls')
+    compare_parser.add_argument('--repeat', type=int, default=5, help='measurements of every benchmark')
+    compare_parser.add_argument('--any-python', action='store_true',
+                                help='compare even if the baseline was measured with another version of Python')
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        save(run(args.scale, args.repeat), args.output)
+        print(f'Results written to {args.output}')
+        return 0
+
+    baseline = read(args.baseline)
+    current = read(args.current) if args.current else {"python": platform.python_version()}
+    # the timings of different interpreters differ by more than any threshold, they can't be compared
+    if baseline.get("python") != current.get("python") and not args.any_python:
+        print(f"The baseline was measured with Python {baseline.get('python')}, not {current.get('python')}: "
+              "record it again with this interpreter (or pass --any-python)", file=sys.stderr)
+        return 2
+    if not args.current:
+        current["metrics"] = run(args.scale, args.repeat)
+    regressions = 0
+    for name, before, after, ratio, regressed in compare(baseline["metrics"], current["metrics"], args.threshold):
+        regressions += regressed
+        if after is None:
+            print(f"{'MISSING':>10}  {name:<52} {before * 1e6:12.3f} us -> not measured")
+            continue
+        print(f"{'REGRESSION' if regressed else 'ok':>10}  {name:<52} {before * 1e6:12.3f} us -> {after * 1e6:12.3f} us  ({ratio:.2f}x)")
+    print(f'{regressions} regression(s) beyond {args.threshold:.0%} or missing')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
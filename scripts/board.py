@@ -1,19 +1,289 @@
-import copy
+import random
+
+
+class Shape:
+    """
+    The tables of a board shape (number of rows, number of columns and length of the winning lines).
+    They are built once for every shape and shared by all the boards with that shape.
+
+    Attributes:
+        self.rows: int
+            Number of rows of the board
+        self.cols: int
+            Number of columns of the board
+        self.k: int
+            Number of marks in a row needed to win
+        self.size: int
+            Number of cells of the board
+        self.full: int
+            Mask with all the cells occupied
+        self.coords: tuple
+            Coordinates (row, column) of each cell
+        self.indexes: dict
+            Index of each cell, by coordinates
+        self.corners: tuple
+            Coordinates of the corners of the board
+        self.lines: tuple
+            Masks of the winning lines: rows, then columns, then diagonals and then anti-diagonals
+        self.line_cells: tuple
+            Indexes of the cells of each winning line
+        self.cell_lines: tuple
+            For each cell, the masks of the winning lines going through it
+        self.weights: dict
+            Number of winning lines going through each cell, by coordinates
+        self.diags: tuple
+            Indexes of the cells of the diagonals long enough to contain a winning line
+        self.symmetries: tuple
+            Rotations and reflections of the board, as lookup tables for transform
+        self.permutations: tuple
+            The same symmetries as permutations of the cells (cell i is sent to cell perm[i])
+        self.width: int
+            Number of bits of each line counter (the counters of all the lines are packed in one integer)
+        self.increments: tuple
+            For each cell, the integer adding one to the counters of the lines going through it
+        self.units: int
+            The integer with a one in the counter of every line
+        self.cell_line_ids: tuple
+            For each cell, the (index, counter shift) pairs of the lines going through it
+        self.cell_line_bits: tuple
+            For each cell, a mask with the bits of the indexes of the lines going through it
+        self.zobrist: dict
+            For each player, the random 64 bit number of each cell (the hash of a board is the XOR
+            of the numbers of its marks and of self.zobrist_empty)
+        self.zobrist_empty: int
+            Hash of the empty board (different for every shape)
+    """
+    _shapes = {} # shapes already built, by (rows, cols, k)
+
+    @classmethod
+    def get(cls, rows, cols, k):
+        """
+        Returns the shape with the given dimensions, building it the first time it is requested
+
+        Parameters
+        -------------------
+        rows: int
+            Number of rows of the board
+        cols: int
+            Number of columns of the board
+        k: int
+            Number of marks in a row needed to win
+
+        Returns
+        -------------------
+        shape: Shape
+            The shared tables of the shape
+        """
+        key = (rows, cols, k)
+        shape = cls._shapes.get(key)
+        if shape is None:
+            shape = cls._shapes[key] = cls(rows, cols, k)
+        return shape
+
+    def __init__(self, rows, cols, k):
+        """constructor (use Shape.get to share the tables)"""
+        if rows < 1 or cols < 1:
+            raise ValueError('A board needs at least one row and one column')
+        if not 2 <= k <= max(rows, cols): # with k = 1 every move wins, the threats (k - 1 marks) don't exist
+            raise ValueError('The winning length must be at least 2 and fit in the board')
+        self.rows, self.cols, self.k = rows, cols, k
+        self.key = (rows, cols, k)
+        coords = tuple(divmod(i, cols) for i in range(rows * cols))
+
+        line_cells = []
+        for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)): # rows, columns, diagonals, anti-diagonals
+            for r in range(rows):
+                for c in range(cols):
+                    cells = [(r + dr * j, c + dc * j) for j in range(k)]
+                    if all(0 <= row < rows and 0 <= col < cols for row, col in cells):
+                        line_cells.append(tuple(row * cols + col for row, col in cells))
+
+        diags = []
+        for dc, starts in ((1, [(0, c) for c in range(cols)] + [(r, 0) for r in range(1, rows)]),
+                           (-1, [(0, c) for c in range(cols)] + [(r, cols - 1) for r in range(1, rows)])):
+            for r, c in sorted(starts):
+                cells = []
+                while 0 <= r < rows and 0 <= c < cols:
+                    cells.append(r * cols + c)
+                    r, c = r + 1, c + dc
+                if len(cells) >= k:
+                    diags.append(tuple(cells))
+        self.diags = tuple(diags)
+
+        # rotations and reflections: 4 rotations and their reflections for a square board,
+        # the identity, the two reflections and the half turn for a rectangular one
+        R, C = rows - 1, cols - 1
+        self.corners = ((0, 0), (0, C), (R, 0), (R, C))
+        maps = [
+            lambda r, c: (r, c), lambda r, c: (R-r, C-c), lambda r, c: (r, C-c), lambda r, c: (R-r, c),
+        ]
+        if rows == cols:
+            maps += [
+                lambda r, c: (c, R-r), lambda r, c: (C-c, r), lambda r, c: (c, r), lambda r, c: (C-c, R-r),
+            ]
+        permutations = [tuple(row * cols + col for row, col in (sym(r, c) for r, c in coords)) for sym in maps]
+        self._build_tables(coords, line_cells, permutations, f'zobrist:{rows}:{cols}:{k}')
+
+    def __reduce__(self):
+        """Pickles only the dimensions: the tables are taken from (or built in) the cache of the other process"""
+        return (Shape.get, self.key)
+
+    def _build_tables(self, coords, line_cells, permutations, seed):
+        """
+        Builds the tables that only depend on the cells, the winning lines and the symmetries
+        (shared by the shapes of any number of dimensions)
+
+        Parameters
+        -------------------
+        coords: tuple
+            Coordinates of each cell
+        line_cells: list
+            Indexes of the cells of each winning line
+        permutations: list
+            Symmetries of the shape as permutations of the cells, the identity first
+        seed: str
+            Seed of the Zobrist numbers (the same numbers in every process)
+        """
+        self.size = len(coords)
+        self.full = (1 << self.size) - 1
+        self.coords = coords
+        self.indexes = {cell: i for i, cell in enumerate(coords)}
+
+        self.line_cells = tuple(line_cells)
+        self.lines = tuple(sum(1 << i for i in cells) for cells in line_cells)
+        self.cell_lines = tuple(tuple(line for line in self.lines if line >> i & 1) for i in range(self.size))
+        self.weights = {self.coords[i]: len(self.cell_lines[i]) for i in range(self.size)}
+
+        self.width = self.k.bit_length()
+        ids = [tuple(l for l, line in enumerate(self.lines) if line >> i & 1) for i in range(self.size)]
+        self.cell_line_ids = tuple(tuple((l, l * self.width) for l in cell_ids) for cell_ids in ids)
+        self.increments = tuple(sum(1 << shift for _, shift in cell_ids) for cell_ids in self.cell_line_ids)
+        self.cell_line_bits = tuple(sum(1 << l for l in cell_ids) for cell_ids in ids)
+        self.units = sum(1 << l * self.width for l in range(len(self.lines)))
+
+        rng = random.Random(seed)
+        self.zobrist_empty = rng.getrandbits(64)
+        self.zobrist = {player: tuple(rng.getrandbits(64) for _ in range(self.size)) for player in ('X', 'O')}
+
+        # each symmetry is a list of lookup tables, one for every chunk of bits of a mask
+        self.chunk = self.size if self.size <= 9 else 8 # with up to 9 cells a single table covers the mask
+        self.symmetries = []
+        for perm in permutations:
+            tables = []
+            for start in range(0, self.size, self.chunk):
+                table = [0]
+                for j in range(min(self.chunk, self.size - start)): # the values with bit j set are built from the ones below
+                    bit = 1 << perm[start + j]
+                    table += [value | bit for value in table]
+                tables.append(tuple(table))
+            self.symmetries.append(tuple(tables))
+        self.symmetries = tuple(self.symmetries) # the first symmetry is the identity
+        self.permutations = tuple(permutations)
+
+    def transform(self, mask, symmetry):
+        """
+        Applies a symmetry to a mask
+
+        Parameters
+        -------------------
+        mask: int
+            Mask of cells
+        symmetry: tuple
+            One of the entries of self.symmetries
+
+        Returns
+        -------------------
+        Transformed mask (int)
+        """
+        chunk, low = self.chunk, (1 << self.chunk) - 1
+        result = 0
+        for table in symmetry:
+            result |= table[mask & low]
+            mask >>= chunk
+        return result
+
 
 class Board:
-    """A class to represent a Tic-Tac-Toe game board.
+    """A class to represent a Tic-Tac-Toe game board with any number of rows and columns
+    (a m,n,k-game: the first player to get k marks in a row wins).
     
     Attributes:
-        self.board:  A list of lists to represent the game board
+        self.x:  An integer mask with the cells occupied by X
+        self.o:  An integer mask with the cells occupied by O
 
+    The bit in position i represents the cell (i // cols, i % cols).
+    Every move also updates the number of marks of each player in every line,
+    the lines where a player needs a single move to win (threats), the number
+    of moves and the winner, so that they don't have to be computed again.
+    The Zobrist hash of the board is updated in the same way, so boards can be used as dictionary keys
+    (a board must not be changed with __setitem__ or push while it is a key).
+    make_move returns a new board, push and pop make and take back moves on the board itself.
     """
-    def __init__(self):
-        """constructor"""
-        self.board = [
-            [None, None, None],
-        [None, None, None],
-        [None, None, None]
-        ]
+    __slots__ = ('x', 'o', '_shape', '_winner', '_count', '_xc', '_oc', '_xt', '_ot', '_hash', '_undo')
+
+    def __init__(self, rows=3, cols=3, k=None):
+        """
+        Constructor
+
+        Parameters
+        -------------------
+        rows: int
+            Number of rows of the board
+        cols: int
+            Number of columns of the board
+        k: int
+            Number of marks in a row needed to win (by default the smallest side of the board)
+        """
+        self._init(Shape.get(rows, cols, min(rows, cols) if k is None else k))
+
+    def _init(self, shape):
+        """
+        Sets the state of an empty board (shared by the constructors of the boards of every shape)
+
+        Parameters
+        -------------------
+        shape: Shape
+            Shape of the board
+        """
+        self.x = 0
+        self.o = 0
+        self._shape = shape
+        self._winner = None
+        self._count = 0 # number of moves played
+        self._xc = self._oc = 0 # line counters of X and O, packed in an integer
+        self._xt = self._ot = 0 # bits of the lines where X and O can win with one move
+        self._hash = self._shape.zobrist_empty
+        self._undo = None # states before the moves made with push
+    
+    @property
+    def shape(self):
+        """The shared tables of the shape of the board"""
+        return self._shape
+    
+    @property
+    def rows(self):
+        """Number of rows of the board"""
+        return self._shape.rows
+    
+    @property
+    def cols(self):
+        """Number of columns of the board"""
+        return self._shape.cols
+    
+    @property
+    def k(self):
+        """Number of marks in a row needed to win"""
+        return self._shape.k
+    
+    @property
+    def move_count(self):
+        """Number of marks on the board"""
+        return self._count
+    
+    @property
+    def board(self):
+        """A list of lists representing the game board (read only copy)"""
+        return self.get_rows()
     
     def print_board(self):
         """Prints the board"""
@@ -29,11 +299,54 @@ class Board:
         """
         return str(self.board)
     
+    def __hash__(self):
+        """Zobrist hash of the board (a 64 bit number)"""
+        return self._hash
+    
+    def __eq__(self, other):
+        """Two boards are equal if they have the same shape and the same marks"""
+        if not isinstance(other, Board):
+            return NotImplemented
+        return self._hash == other._hash and self.x == other.x and self.o == other.o and self._shape is other._shape
+    
     def __iter__(self):
         """Iterates over the board"""
-        for row in self.board:
-            for el in row:
-                yield el
+        for i in range(self._shape.size):
+            yield self._cell(1 << i)
+    
+    def _cell(self, bit):
+        """Returns the value of the cell represented by $bit"""
+        if self.x & bit:
+            return 'X'
+        if self.o & bit:
+            return 'O'
+        return None
+    
+    def _index(self, key):
+        """Converts an int or tuple key into the index of the cell
+        
+        Parameters
+        --------------------
+        key: int/tuple
+            Position of the cell
+
+        Returns
+        -------------------
+        index: int
+            Index of the cell (between 0 and the number of cells - 1)
+        """
+        shape = self._shape
+        if isinstance(key, tuple):
+            index = shape.indexes.get(key)
+            if index is None:
+                raise IndexError('Board index out of range')
+            return index
+        elif isinstance(key, int):
+            if not 0 <= key < shape.size:
+                raise IndexError('Board index out of range')
+            return key
+        else:
+            raise TypeError('Indexes must be integers, slices or tuples')
     
     def __getitem__(self, key):
         """Returns the item in the position indicated by $key.
@@ -49,15 +362,9 @@ class Board:
         Element of the board in the position indicated by key (Any)
         """
         if isinstance(key, slice):
-            start, stop, step = key.indices(9)
-            return [self[i] for i in range(start, stop, step)]
-        elif isinstance(key, int):
-            row, col = divmod(key, 3)
-            return self.board[row][col]
-        elif isinstance(key, tuple):
-            return self.board[key[0]][key[1]]
-        else:
-            raise TypeError('Indexes must be integers, slices or tuples')
+            start, stop, step = key.indices(self._shape.size)
+            return [self._cell(1 << i) for i in range(start, stop, step)]
+        return self._cell(1 << self._index(key))
     
     def __setitem__(self, key, elem):
         """Set an element of the board to that passed as argument
@@ -67,13 +374,43 @@ class Board:
         key:    
             Position of the board to be modified
         elem:   
-            Value to be set in position
+            Value to be set in position ('X', 'O' or None)
         """
-        if isinstance(key, int):
-            row, col = divmod(key, 3)
-            self.board[row][col] = elem
-        elif isinstance(key, tuple):
-            self.board[key[0]][key[1]] = elem
+        bit = 1 << self._index(key)
+        if elem not in ('X', 'O', None):
+            raise ValueError("Cells can only contain 'X', 'O' or None")
+        self.x &= ~bit
+        self.o &= ~bit
+        if elem == 'X':
+            self.x |= bit
+        elif elem == 'O':
+            self.o |= bit
+        self._recount() # the whole board has to be checked again
+    
+    def _recount(self):
+        """Computes the line counters, the threats, the number of moves and the winner from the masks"""
+        shape = self._shape
+        x, o, k = self.x, self.o, shape.k
+        self._count = bin(x | o).count('1')
+        self._hash = shape.zobrist_empty
+        for i in range(shape.size):
+            if x >> i & 1:
+                self._hash ^= shape.zobrist['X'][i]
+            elif o >> i & 1:
+                self._hash ^= shape.zobrist['O'][i]
+        self._xc = self._oc = self._xt = self._ot = 0
+        self._winner = None
+        for l, line in enumerate(shape.lines):
+            shift = l * shape.width
+            xcount, ocount = bin(x & line).count('1'), bin(o & line).count('1')
+            self._xc |= xcount << shift
+            self._oc |= ocount << shift
+            if self._winner is None and (xcount == k or ocount == k):
+                self._winner = 'X' if xcount == k else 'O' # the first complete line in the order of get_combos
+            if xcount == k - 1 and ocount == 0:
+                self._xt |= 1 << l
+            if ocount == k - 1 and xcount == 0:
+                self._ot |= 1 << l
 
     
     def is_full(self):
@@ -83,10 +420,7 @@ class Board:
         -------------------
         Indication if the board is full or not (bool)
         """
-        for i in range(9):
-            if self[i] == None:
-                return False
-        return True
+        return self._count == self._shape.size
     
     def is_empty(self):
         """Determines if the board is empty or not
@@ -95,10 +429,39 @@ class Board:
         -------------------
         Indication if the board is empty or not (bool)
         """
-        for i in range(9):
-            if self[i] != None:
-                return False
-        return True
+        return not self._count
+    
+    def canonical_key(self):
+        """
+        Returns a key shared by all the boards equivalent to this one
+        under rotations and reflections
+
+        Returns
+        -------------------
+        key: tuple
+            The shape of the board and the smallest (x, o) pair of masks among the symmetric boards
+        """
+        shape = self._shape
+        x, o = self.x, self.o
+        if shape.size <= 9: # a single lookup table for each symmetry
+            pair = min((sym[0][x], sym[0][o]) for sym in shape.symmetries)
+        else:
+            pair = min((shape.transform(x, sym), shape.transform(o, sym)) for sym in shape.symmetries)
+        return shape.key + pair
+    
+    def canonical_symmetry(self):
+        """
+        Returns the symmetry sending the board to the board of its canonical key
+
+        Returns
+        -------------------
+        symmetry: int
+            Index of the symmetry in shape.symmetries (and in shape.permutations, where cell i is sent to cell perm[i])
+        """
+        shape = self._shape
+        x, o = self.x, self.o
+        pairs = [(shape.transform(x, sym), shape.transform(o, sym)) for sym in shape.symmetries]
+        return pairs.index(min(pairs))
     
     def get_rows(self):
         """
@@ -109,7 +472,8 @@ class Board:
         rows: list
             A list of lists containing the rows of the board
         """
-        return [ self[0:3], self[3:6], self[6:9] ]
+        cols = self._shape.cols
+        return [ self[start:start + cols] for start in range(0, self._shape.size, cols) ]
     
     def get_columns(self):
         """
@@ -120,34 +484,32 @@ class Board:
         cols: list
             A list of lists containing the columns of the board
         """
-        return [ self[0:9:3], self[1:9:3], self[2:9:3]]
+        shape = self._shape
+        return [ self[col:shape.size:shape.cols] for col in range(shape.cols) ]
     
     def get_diags(self):
         """
         Returns a list of lists containing the diagonals of the board
+        (only the ones that are long enough to contain a winning line)
         
         Returns
         -------------------
         diags: list
             A list of lists containing the diagonals of the board
         """
-        return [ [self[i] for i in (0, 4, 8)], [self[i] for i in (2, 4, 6)] ]
+        return [ [self._cell(1 << i) for i in cells] for cells in self._shape.diags ]
     
     def get_combos(self):
         """
         Returns a list of lists containing the combinations of the board 
-        (all the rows, all the columns and all the diagonals)
+        (all the winning lines: in rows, in columns and in diagonals)
         
         Returns
         -------------------
         combos: list
             A list of lists containing the combinations of the board
         """
-        combos = []
-        for row in self.get_rows(): combos.append(row)
-        for column in self.get_columns(): combos.append(column)
-        for diag in self.get_diags(): combos.append(diag)
-        return combos
+        return [ [self._cell(1 << i) for i in cells] for cells in self._shape.line_cells ]
     
     def legal_moves(self):
         """
@@ -159,14 +521,59 @@ class Board:
         moves: list
             List with the legal moves available
         """
+        occupied = self.x | self.o
+        coords = self._shape.coords
+        return [coords[i] for i in range(self._shape.size) if not occupied >> i & 1]
+    
+    def winning_moves(self, player):
+        """
+        Finds the moves that would complete a winning line for the player
+        (A line where the player has k-1 marks and the remaining cell is empty)
+
+        Parameters
+        -------------------
+        player: str
+            Player looking for winning moves ('X' or 'O')
+
+        Returns
+        -------------------
+        moves: list
+            Coordinates of the winning moves, in the order of the lines that they complete
+        """
+        threats = self._xt if player == 'X' else self._ot
+        shape = self._shape
+        empty = ~(self.x | self.o)
         moves = []
-        count = -1 #  by starting at minus -1 it is zero in the first cell i check
-        for cell in self:
-            count += 1
-            if cell == None:
-                moves.append(divmod(count, 3))
+        while threats:
+            low = threats & -threats # lowest line index first, as in get_combos
+            threats ^= low
+            move = shape.coords[(shape.lines[low.bit_length() - 1] & empty).bit_length() - 1]
+            if move not in moves:
+                moves.append(move)
         return moves
     
+    def open_counters(self, player):
+        """
+        Returns the line counters of the player, keeping only the lines without marks of the opponent
+
+        Parameters
+        -------------------
+        player: str
+            Player whose counters are returned ('X' or 'O')
+
+        Returns
+        -------------------
+        counters: int
+            Number of marks of the player in every line where the opponent has none (0 in the other lines),
+            packed in an integer: the counter of line l is made of the shape.width bits starting at l * shape.width
+        """
+        shape = self._shape
+        mine, theirs = (self._xc, self._oc) if player == 'X' else (self._oc, self._xc)
+        taken = theirs
+        for j in range(1, shape.width): # the lowest bit of every counter of the opponent that is not zero
+            taken |= theirs >> j
+        return mine & ~((taken & shape.units) * ((1 << shape.width) - 1))
+    
     def is_valid_move(self, coords):
         """
         Determines if a move is valid
@@ -181,7 +588,7 @@ class Board:
         -------------------
         Indication of whether the move is valid on not (bool)
         """
-        return True if self[coords] == None else False
+        return not (self.x | self.o) & (1 << self._index(coords))
     
     def make_move(self, coords, player):
         """
@@ -193,20 +600,115 @@ class Board:
         coords: int or tuple    
             Coordinates of cell where the player waint to make a move
         player: str   
-            Player to make the move
+            Player to make the move ('X' or 'O')
 
         Returns
         -------------------
         new_board: Board
             A new board with the new move
         """
+        new_board = Board.__new__(Board) # skip __init__, all the slots are set by _play
+        new_board._shape = self._shape
+        new_board._undo = None
+        self._play(new_board, coords, player)
+        return new_board
+    
+    def push(self, coords, player):
+        """
+        Makes a move on this board, without creating a new one.
+        The move can be taken back with pop, so a search can explore the whole game tree on a single board.
+
+        Parameters
+        --------------------
+        coords: int or tuple    
+            Coordinates of cell where the player waint to make a move
+        player: str   
+            Player to make the move ('X' or 'O')
+        """
+        undo = (self.x, self.o, self._winner, self._xc, self._oc, self._xt, self._ot, self._hash)
+        self._play(self, coords, player)
+        if self._undo is None:
+            self._undo = []
+        self._undo.append(undo)
+    
+    def pop(self):
+        """Takes back the last move made with push"""
+        if not self._undo:
+            raise IndexError('No move to take back')
+        self.x, self.o, self._winner, self._xc, self._oc, self._xt, self._ot, self._hash = self._undo.pop()
+        self._count -= 1
+    
+    def copy(self):
+        """
+        Returns a copy of the board (with an empty undo stack)
+
+        Returns
+        -------------------
+        new_board: Board
+            A board with the same marks
+        """
+        new_board = Board.__new__(Board)
+        for name in Board.__slots__:
+            setattr(new_board, name, getattr(self, name))
+        new_board._undo = None
+        return new_board
+    
+    def _play(self, target, coords, player):
+        """
+        Writes in $target the board after a move
+        (target is either a new board or this board itself)
+
+        Parameters
+        --------------------
+        target: Board
+            Board where the result is written
+        coords: int or tuple    
+            Coordinates of cell where the player waint to make a move
+        player: str   
+            Player to make the move ('X' or 'O')
+        """
         if isinstance(coords, slice): # check that the player is not trying to make a move in more than one cell
             raise IndexError("Cannot make a move in more than one cell")
-        if not self.is_valid_move(coords): # check if the move is a valid one
+        index = self._index(coords)
+        bit = 1 << index
+        if (self.x | self.o) & bit: # check if the move is a valid one
             raise Exception('Invalid move!')
-        new_board = copy.deepcopy(self)
-        new_board[coords] = player
-        return new_board
+        shape = self._shape
+        if player == 'X':
+            mine, theirs = self._xc + shape.increments[index], self._oc
+            mine_threats, their_threats = self._xt, self._ot
+        elif player == 'O':
+            mine, theirs = self._oc + shape.increments[index], self._xc
+            mine_threats, their_threats = self._ot, self._xt
+        else:
+            raise ValueError("The player must be either 'X' or 'O'")
+
+        # only the lines going through the new move have changed
+        lines = shape.cell_line_bits[index]
+        mine_threats &= ~lines # these lines are now either complete or not a threat anymore
+        their_threats &= ~lines # the opponent can't complete these lines anymore
+        winner = self._winner
+        k, field = shape.k, (1 << shape.width) - 1
+        for l, shift in shape.cell_line_ids[index]:
+            count = mine >> shift & field
+            if count == k:
+                if winner is None:
+                    winner = player
+            elif count == k - 1 and not theirs >> shift & field:
+                mine_threats |= 1 << l
+
+        target._count = self._count + 1
+        target._winner = winner
+        if player == 'X':
+            target._hash = self._hash ^ shape.zobrist['X'][index]
+            target.x, target.o = self.x | bit, self.o
+            target._xc, target._oc = mine, theirs
+            target._xt, target._ot = mine_threats, their_threats
+        else:
+            target._hash = self._hash ^ shape.zobrist['O'][index]
+            target.x, target.o = self.x, self.o | bit
+            target._oc, target._xc = mine, theirs
+            target._ot, target._xt = mine_threats, their_threats
     
     def get_winner(self):
         """ Determines if there is a winner in the board 
@@ -217,78 +719,33 @@ class Board:
         winner: str or None
             The winner of the game
         """
-
-        def __check_list_for_winner(lis):
-            '''
-            Checks if all the elements in the list are the same
-
-            Parameters:
-            -------------------
-            lis: list
-                The list to be checked
-            
-            Returns
-            -------------------
-            Indication if all the elements in the list are the same (bool)
-            '''
-            for i in range(1, len(lis)):
-                if lis[i] != lis[i-1]:
-                    return False
-            return True
-        
-
-        if self.is_empty(): # if the board is empty then return None
-            return None
-        
-        combos = self.get_combos()
-
-        for combo in combos:
-            if __check_list_for_winner(combo): # if thid point is reached a winner has been found
-                return combo[0] # first element of the list will be winner
-        
-        return None # if this point has been reached then there is not winner
+        return self._winner
 
    
     def render(self):
         """Renders the playing board"""
-        
-        def __print_line(board, num):
-            """
-            Prints a single line of the playing board
-
-            Parameters:
-            -------------------
-            board: Board
-                The gaming board 
-            num: int
-                Number of the row to be printed
-            """
-            for i in range(3):
-                if board.board[num][i] == None:
-                    print(' ', end = ' ')
-                else:
-                    print(board.board[num][i], end = ' ')
-        
+        shape = self._shape
+        row_width = len(str(shape.rows - 1))
+        col_width = len(str(shape.cols - 1))
+        print(' ' * row_width + '  ' + ' '.join(f'{col:<{col_width}}' for col in range(shape.cols)).rstrip())
+        print(' ' * row_width + ' ' + '-' * (shape.cols * (col_width + 1) + 1))
+        for num, row in enumerate(self.get_rows()):
+            print(f'{num:>{row_width}}|', end = ' ')
+            for cell in row:
+                print(f"{' ' if cell is None else cell:<{col_width}}", end = ' ')
+            print('|')
+        print(' ' * row_width + ' ' + '-' * (shape.cols * (col_width + 1) + 1))
+
 
-        print('   0 1 2')
-        print('  -------')
-        print('0|', end = ' ')
-        __print_line(self, 0)
-        print('|')
-        print('1|', end = ' ')
-        __print_line(self, 1)
-        print('|')
-        print('2|', end = ' ')
-        __print_line(self, 2)
-        print('|')
-        print('  -------')
+# tables of the classic 3x3 board
+LINES = Shape.get(3, 3, 3).lines # bit masks of the 8 winning lines, in the same order as get_combos
+FULL = Shape.get(3, 3, 3).full # mask with all the 9 cells occupied
 
 
 if __name__ == "__main__":
     board = Board()
     for num in range(0,9):
-        row, col = divmod(num, 3)
-        board.board[row][col] = num
+        board[num] = 'X' if num % 2 == 0 else 'O'
     
     print('-> Testing __getitem__')
     try: 
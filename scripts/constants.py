@@ -0,0 +1,5 @@
+# Names shared by the AIs and by the readers of the game history, in a module without dependencies
+# so that reading a history doesn't import the AIs
+
+# AIs of AIPlayer (new AIs must be appended, the game history store keeps their index)
+AI_NAMES = ("random_ai", "find_winning_moves_ai", "find_winning_moves_and_losing_moves_ai", "minimax_ai", "table_ai", "mcts_ai")
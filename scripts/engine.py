@@ -0,0 +1,173 @@
+from scripts.ai import AI_NAMES, AIPlayer # AI_NAMES: the AIs that can be chosen for a game
+from scripts.qubic import new_board
+import time
+
+
+class GameOver(Exception):
+    """Raised when a move is submitted to a game that is already over"""
+
+
+class ConsoleSink:
+    """
+    Sink printing the game on the console: the board after every move and the result at the end
+    """
+    def move(self, game, player, coords):
+        """Called after every move"""
+        game.board.render()
+
+    def end(self, game):
+        """Called once when the game is over"""
+        if game.winner is None:
+            print("The game ended in a draw")
+        else:
+            print("The winner is the AI.") if game.winner == game.ai_player else print("The winner is the human")
+
+
+class Game:
+    """
+    A game of Tic-Tac-Toe between an AI and a human (or any other caller), without any input.
+    Output goes to the sinks, so a game with no sinks does no I/O at all.
+
+    Attributes:
+        self.board: Board
+            Current playing board
+        self.ai_name: str
+            Name of the AI method of AIPlayer used for the AI moves
+        self.ai_player: str
+            Player of the AI ('X' moves first)
+        self.human_player: str
+            Player of the human
+        self.to_move: str
+            Player who has to move
+        self.winner: str or None
+            Winner of the game
+        self.moves: list
+            (player, coordinates) of the moves played
+        self.durations: list
+            Seconds taken by each move (since the previous move, or the start of the game)
+        self.started: float
+            Time when the game started (seconds since the epoch)
+        self.sinks: list
+            Objects notified of every move (sink.move(game, player, coords)) and of the end of the game (sink.end(game))
+    """
+    def __init__(self, ai_name="minimax_ai", ai=None, ai_player='X', shape=(3, 3, 3), sinks=()):
+        """
+        Constructor
+
+        Parameters
+        -------------------
+        ai_name: str
+            Name of the AI to play against
+        ai: AIPlayer
+            AIPlayer used to choose the AI moves (if None a new one is created)
+        ai_player: str
+            Player of the AI ('X' or 'O', X moves first)
+        shape: tuple
+            (rows, cols, k) of the board, or (n, n, n, k) for 3D Tic-Tac-Toe
+        sinks: iterable
+            Output sinks (empty for a headless game)
+        """
+        if ai_name not in AI_NAMES:
+            raise ValueError(f"Unknown AI: {ai_name}")
+        if ai_player not in ('X', 'O'):
+            raise ValueError("The player must be either 'X' or 'O'")
+        self.board = new_board(shape)
+        self.ai_name = ai_name
+        self.ai = AIPlayer() if ai is None else ai
+        self.ai_player = ai_player
+        self.human_player = 'O' if ai_player == 'X' else 'X'
+        self.to_move = 'X'
+        self.winner = None
+        self.moves = []
+        self.durations = []
+        self.started = time.time()
+        self._last_move = time.perf_counter()
+        self.sinks = list(sinks)
+
+    def is_over(self):
+        """
+        Determines if the game is over
+
+        Returns
+        -------------------
+        Indication of whether there is a winner or the board is full (bool)
+        """
+        return self.winner is not None or self.board.is_full()
+
+    def __play(self, coords, player):
+        """
+        Plays a move and notifies the sinks
+
+        Parameters
+        -------------------
+        coords: tuple
+            Coordinates of the move
+        player: str
+            Player making the move
+        """
+        if self.is_over():
+            raise GameOver('The game is already over')
+        if player != self.to_move:
+            raise ValueError(f"It is not the turn of {player}")
+        self.board = self.board.make_move(coords, player)
+        self.winner = self.board.get_winner()
+        self.moves.append((player, coords))
+        now = time.perf_counter()
+        self.durations.append(now - self._last_move)
+        self._last_move = now
+        self.to_move = 'O' if player == 'X' else 'X'
+        for sink in self.sinks:
+            sink.move(self, player, coords)
+        if self.is_over():
+            for sink in self.sinks:
+                sink.end(self)
+
+    def submit_move(self, coords):
+        """
+        Plays a move of the human
+
+        Parameters
+        -------------------
+        coords: tuple
+            Coordinates (row, column) of the move
+        """
+        self.__play(tuple(coords), self.human_player)
+
+    def ai_move(self, coords=None):
+        """
+        Lets the AI choose a move and plays it
+
+        Parameters
+        -------------------
+        coords: tuple
+            Move already chosen for the AI (for example by a search run in another thread or process),
+            if None the AI chooses it now
+
+        Returns
+        -------------------
+        coords: tuple
+            Coordinates of the move played by the AI
+        """
+        if self.is_over():
+            raise GameOver('The game is already over')
+        if coords is None:
+            coords = getattr(self.ai, self.ai_name)(self.board, self.ai_player)
+        self.__play(tuple(coords), self.ai_player)
+        return coords
+
+    def state(self):
+        """
+        Returns the state of the game
+
+        Returns
+        -------------------
+        state: dict
+            The cells of the board, the player to move, the winner, whether the game is over and the moves played
+        """
+        return {
+            "board": self.board.board,
+            "to_move": None if self.is_over() else self.to_move,
+            "winner": self.winner,
+            "over": self.is_over(),
+            "moves": [coords for _, coords in self.moves],
+        }
@@ -0,0 +1,212 @@
+import json
+import os
+
+
+class GameLog:
+    """
+    Append-only log of the games played, one JSON record per line.
+    Records are buffered in memory, written every $flush_every records
+    and synced to disk every $fsync_every records (and when the log is closed).
+
+    Attributes:
+        self.path: str
+            Path of the log file
+        self.flush_every: int
+            Number of records buffered before they are written to the file
+        self.fsync_every: int
+            Number of records written before the file is synced to disk
+    """
+    def __init__(self, path, flush_every=64, fsync_every=1024):
+        """
+        Constructor: opens the log for appending (the file is created if it doesn't exist)
+
+        Parameters
+        -------------------
+        path: str
+            Path of the log file
+        flush_every: int
+            Number of records buffered before they are written
+        fsync_every: int
+            Number of records written before the file is synced
+        """
+        self.path = path
+        self.flush_every = flush_every
+        self.fsync_every = fsync_every
+        _repair(path)
+        self._file = open(path, 'a', encoding='utf-8')
+        self._buffer = []
+        self._unsynced = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def append(self, record):
+        """
+        Appends a record to the log
+
+        Parameters
+        -------------------
+        record: dict
+            Record to be appended (it must be serializable as JSON)
+        """
+        self._buffer.append(json.dumps(record, separators=(',', ':')) + '\n')
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self, sync=False):
+        """
+        Writes the buffered records to the file
+
+        Parameters
+        -------------------
+        sync: bool
+            Sync the file to disk even if fewer than fsync_every records have been written
+        """
+        if self._buffer:
+            self._file.write(''.join(self._buffer))
+            self._unsynced += len(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+        if self._unsynced and (sync or self._unsynced >= self.fsync_every):
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def close(self):
+        """Writes and syncs the buffered records, then closes the file"""
+        if not self._file.closed:
+            self.flush(sync=True)
+            self._file.close()
+
+
+def _repair(path):
+    """
+    Truncates a log after its last complete line, so that a record cut by a crash
+    isn't glued to the next record appended
+
+    Parameters
+    -------------------
+    path: str
+        Path of the log file (nothing is done if it doesn't exist)
+    """
+    try:
+        log_file = open(path, 'rb+')
+    except FileNotFoundError:
+        return
+    with log_file:
+        end = log_file.seek(0, os.SEEK_END)
+        position = end
+        while position > 0: # look for the last newline, one block at a time from the end
+            start = max(0, position - 4096)
+            log_file.seek(start)
+            block = log_file.read(position - start)
+            newline = block.rfind(b'\n')
+            if newline != -1:
+                position = start + newline + 1
+                break
+            position = start
+        if position != end:
+            log_file.truncate(position)
+
+
+def game_record(game):
+    """
+    Builds the record of a game
+
+    Parameters
+    -------------------
+    game: Game
+        Game to be recorded (usually when it is over)
+
+    Returns
+    -------------------
+    record: dict
+        The moves, the AI, the result and the timings of the game
+    """
+    return {
+        "started": game.started,
+        "shape": list(game.board.shape.key),
+        "ai": game.ai_name,
+        "ai_player": game.ai_player,
+        "moves": [list(coords) for _, coords in game.moves],
+        "durations": [round(duration, 6) for duration in game.durations],
+        "winner": game.winner,
+    }
+
+
+class LogSink:
+    """
+    Game sink appending the record of every game to a log when the game is over
+    """
+    def __init__(self, log):
+        """
+        Constructor
+
+        Parameters
+        -------------------
+        log: GameLog
+            Log where the games are appended
+        """
+        self.log = log
+
+    def move(self, game, player, coords):
+        """Called after every move"""
+        pass
+
+    def end(self, game):
+        """Called once when the game is over"""
+        self.log.append(game_record(game))
+
+
+def read_events(path):
+    """
+    Reads the records of a log one at a time, without loading the whole file
+
+    Parameters
+    -------------------
+    path: str
+        Path of the log file
+
+    Returns
+    -------------------
+    records: generator
+        The records of the log, in the order in which they have been appended
+        (lines that can't be decoded, like a record cut by a crash while it was written, are skipped)
+    """
+    with open(path, encoding='utf-8', errors='replace') as in_file:
+        for line in in_file:
+            if not line.endswith('\n'): # incomplete record at the end of the file
+                break
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError: # a broken record in the middle of the file, the others can still be read
+                continue
+            if isinstance(record, dict):
+                yield record
+
+
+def fold_stats(records, stats=None):
+    """
+    Computes the statistics of the games from their records
+
+    Parameters
+    -------------------
+    records: iterable
+        Records of the games
+    stats: dict
+        Statistics to be updated (if None they start from zero)
+
+    Returns
+    -------------------
+    stats: dict
+        Games won by each player, drawn and played, in the same format as GameManager.stats
+    """
+    stats = {"X":0, "O":0, "Draw":0, "Total":0} if stats is None else stats
+    for record in records:
+        stats["Draw" if record["winner"] is None else record["winner"]] += 1
+        stats["Total"] += 1
+    return stats
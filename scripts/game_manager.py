@@ -1,5 +1,8 @@
 from scripts.ai import AIPlayer
-from scripts.board import Board
+from scripts.engine import AI_NAMES, ConsoleSink, Game
+from scripts.event_log import GameLog, LogSink, fold_stats, read_events
+from scripts.history_store import HistoryStore
+from scripts.stats import StatsRecorder, StatsSink
 import json
 
 
@@ -10,46 +13,63 @@ class GameManager:
     Attributes:
         self.stats: dict
             A dictionary containing the gamess won by each player
+        self.recorder: StatsRecorder
+            Results of the games, by AI and first move
+        self.log: GameLog or None
+            Log where every game played is appended
     """
-    stats = {"X":0, "O":0, "Draw":0, "Total":0} # dictionary containing games won by each player
+    def __init__(self, log_path=None):
+        """
+        Contstuctor
+
+        Parameters
+        -------------------
+        log_path: str
+            Path of the game history log (if None the games are not recorded)
+        """
+        self.ai = AIPlayer() # the AI keeps its cache between the games
+        self.recorder = StatsRecorder() # every manager has its own statistics
+        self.log = None if log_path is None else GameLog(log_path, flush_every=1) # every game is written when it ends
+    
+    @property
+    def stats(self):
+        """Games won by each player, drawn and played"""
+        return self.recorder.totals()
+
+    @stats.setter
+    def stats(self, stats):
+        self.recorder = StatsRecorder()
+        self.recorder.merge_stats(stats)
 
-    def __init__(self):
-        """Contstuctor"""
-        pass
+    def close(self):
+        """Writes the pending records of the game history to disk"""
+        if self.log is not None:
+            self.log.close()
 
-    def play_game(self):
+    def play_game(self, ai_name=None):
         """
-        Plays a game of Tic-Tac-Toe
+        Plays a game of Tic-Tac-Toe on the console
+
+        Parameters
+        -------------------
+        ai_name: str
+            Name of the AI to play against (if None the human chooses it)
         """
-        b = Board() # create the playing board
-        ai_function = self.select_ai() # allow the human player to select the AI it wants to play against
-        ai_name = getattr(AIPlayer, ai_function) # retrieve the correspoding method from the AIPlayer class
-        last_player = None # set last player to None
-        winner = None # set winner to None
-
-        while winner is None and (not b.is_full()): # keep playing as long as there is not a winner or the board is not full
-            if last_player == None or last_player == 'O': # The AI always plays first 
-                ai_move = ai_name(AIPlayer, b, 'X') # the AI chooses where it wants to play
-                new = b.make_move(ai_move, 'X') # a move is made in the chosen position
-                new.render() # render the new board
-                winner = new.get_winner() # determine if there is a winner
-                b = new # set the playing board to the new board
-                last_player = 'X' # set the last player to the AI
+        ai_function = self.select_ai() if ai_name is None else ai_name # allow the human player to select the AI it wants to play against
+        sinks = [ConsoleSink(), StatsSink(self.recorder)]
+        if self.log is not None:
+            sinks.append(LogSink(self.log))
+        game = Game(ai_function, ai=self.ai, sinks=sinks) # the AI always plays first, as X
+
+        while not game.is_over(): # keep playing as long as there is not a winner or the board is not full
+            if game.to_move == game.ai_player:
+                game.ai_move() # the AI chooses where it wants to play
             else:
                 human_move = self.get_human_move() # get the move the human wants to make
-                new = b.make_move(human_move, 'O') # make the move
-                winner = new.get_winner() # determine if there is a winner
-                new.render() # render the new board
-                b = new # set the playing board to the new board
-                last_player = 'O' # set the last player to the human
-        
-        if winner == None: # if there is no winner
-            print("The game ended in a draw")
-            self.stats["Draw"] += 1
-        else: # if there is a winner print who it is
-            print("The winner is the AI.") if winner == "X" else print("The winner is the human")
-            self.stats[winner] += 1
-        self.stats["Total"] += 1
+                try:
+                    game.submit_move(human_move)
+                except Exception: # the cell is occupied or outside of the board
+                    print('Invalid move, please try again.')
         
 
     def print_stats(self):
@@ -57,35 +77,47 @@ class GameManager:
         Prints the leaderboard 
         """
 
-        if self.stats["Total"] == 0: # if this point is reached then no games have been played
+        stats = self.stats # the shards are added up once
+        if stats["Total"] == 0: # if this point is reached then no games have been played
             print('No games have been played yet: No statistics available!')
         else: # otherwise print the leaderboard
             print('Leaderboard:')
-            print(f" - AI (X): {self.stats['X']} games won ({self.stats['X'] / self.stats['Total'] * 100}%)")
-            print(f" - Human (O): {self.stats['O']} games won ({self.stats['O'] / self.stats['Total'] * 100}%)")
-            print(f" - Draws: {self.stats['Draw']} games ({self.stats['Draw'] / self.stats['Total'] * 100}%)")
+            print(f" - AI (X): {stats['X']} games won ({stats['X'] / stats['Total'] * 100}%)")
+            print(f" - Human (O): {stats['O']} games won ({stats['O'] / stats['Total'] * 100}%)")
+            print(f" - Draws: {stats['Draw']} games ({stats['Draw'] / stats['Total'] * 100}%)")
+            for ai, ai_stats in sorted(self.recorder.by_ai().items(), key=lambda item: str(item[0])):
+                if ai is not None: # games loaded from a file don't have the AI
+                    print(f"   {ai}: {ai_stats['X']} won, {ai_stats['O']} lost, {ai_stats['Draw']} drawn")
     
     def download_stats(self):
         """
         Download the dictionary containing the game statistics as a json file
         """
-        if self.stats["Total"] == 0: # it there are no statistics to print
+        stats = self.stats
+        if stats["Total"] == 0: # it there are no statistics to print
             print('No games have been played yet: No statistics available!')
         else:
             out_file = open("game_stats.json", "w")
-            json.dump(self.stats, out_file)
+            json.dump(stats, out_file)
             out_file.close()
             print('Your file has been created.')
     
     def upload_game_history(self):
         """
-        Upload exsting game statistics from a json file
+        Upload exsting game statistics from a json file, or rebuild them from a game history log (.jsonl)
+        or a binary game history store (.tth)
         """
         print("Enter the file name: ", end='')
         inp = input()
-        in_file = open(inp)
-        self.stats = json.load(in_file) # load the file as the current statistics
-        in_file.close()
+        if inp.endswith('.jsonl'): # the log is read one game at a time
+            self.stats = fold_stats(read_events(inp))
+        elif inp.endswith('.tth'): # the store keeps the statistics in its header
+            with HistoryStore(inp) as store:
+                self.stats = store.stats()
+        else:
+            in_file = open(inp)
+            self.stats = json.load(in_file) # load the file as the current statistics
+            in_file.close()
         print('Game history successfully loaded.')
 
     def select_ai(self):
@@ -97,7 +129,7 @@ class GameManager:
         inp: str
             Name of the AI the human wants to play against
         """
-        available = {"random_ai", "find_winning_moves_ai", "find_winning_moves_and_losing_moves_ai", "minimax_ai"}
+        available = set(AI_NAMES)
         print("Choose an AI to play against.")
         print("""
         AIs available:
@@ -105,6 +137,8 @@ class GameManager:
         2 - find_winning_moves_ai
         3 - find_winning_moves_and_losing_moves_ai
         4 - minimax_ai
+        5 - table_ai
+        6 - mcts_ai
         """)
         
         while True:
@@ -125,9 +159,13 @@ class GameManager:
             Y-axis coordinate of where the human player wants to play
         """
         print('Enter the coordinates of where you want to place your next move.')
-        x = int(input('Enter X-axis coordinate: '))
-        y = int(input('Enter Y-axis coordinate: '))
-        return x, y
+        while True:
+            try:
+                x = int(input('Enter X-axis coordinate: '))
+                y = int(input('Enter Y-axis coordinate: '))
+                return x, y
+            except ValueError:
+                print('The coordinates must be integers, please try again.')
     
 
 if __name__ == '__main__':
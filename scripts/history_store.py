@@ -0,0 +1,360 @@
+from scripts.constants import AI_NAMES
+from array import array
+import mmap
+import os
+import struct
+import sys
+
+# Binary store of 3x3 games. The file is a header, a table of counters and the records:
+#   header    magic, version, number of records
+#   counters  number of games for every (ai, ai player, result, first move, second move),
+#             the secondary index answering the queries without reading the records
+#   records   one little-endian 64 bit integer per game:
+#               bits  0-35  cells of the moves, 4 bits each, in the order they were played
+#               bits 36-39  number of moves
+#               bits 40-42  AI (index in AI_NAMES, new AIs must be appended to it)
+#               bit  43     player of the AI (0 for X, 1 for O)
+#               bits 44-45  result (0 for a draw, 1 if X has won, 2 if O has won)
+MAGIC = b'TTTH'
+VERSION = 1
+HEADER = struct.Struct('<4sHxxQ')
+RECORD = struct.Struct('<Q')
+AI_SLOTS = 8 # room for new AIs without changing the format
+PLAYERS = ('X', 'O')
+RESULTS = ('Draw', 'X', 'O') # same keys as GameManager.stats
+NO_MOVE = 9 # first or second move of a game that ended before it
+COUNTERS = AI_SLOTS * len(PLAYERS) * len(RESULTS) * (NO_MOVE + 1) * (NO_MOVE + 1)
+OFFSET = HEADER.size + 8 * COUNTERS # position of the first record
+CORNERS = ((0, 0), (0, 2), (2, 0), (2, 2))
+
+
+def _little_endian(values):
+    """Bytes of an array of 64 bit integers in little-endian order, whatever the order of the machine"""
+    if sys.byteorder != 'little':
+        values = array('Q', values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _counter(ai, player, result, first, second):
+    """Position of a combination of the indexed fields in the table of counters"""
+    return (((ai * len(PLAYERS) + player) * len(RESULTS) + result) * (NO_MOVE + 1) + first) * (NO_MOVE + 1) + second
+
+
+def encode(record):
+    """
+    Packs a game in a record of the store
+
+    Parameters
+    -------------------
+    record: dict
+        Game with the "moves" (coordinates), "ai", "ai_player" and "winner",
+        as written by the event log
+
+    Returns
+    -------------------
+    Record of the game (int)
+    """
+    if record["ai"] not in AI_NAMES:
+        raise ValueError(f"Unknown AI: {record['ai']}")
+    if len(record["moves"]) > 9:
+        raise ValueError("Only games on a 3x3 board can be stored")
+    value = 0
+    for i, (row, col) in enumerate(record["moves"]):
+        if not (0 <= row < 3 and 0 <= col < 3):
+            raise ValueError("Only games on a 3x3 board can be stored")
+        value |= (3 * row + col) << (4 * i)
+    value |= len(record["moves"]) << 36
+    value |= AI_NAMES.index(record["ai"]) << 40
+    value |= PLAYERS.index(record["ai_player"]) << 43
+    value |= RESULTS.index("Draw" if record["winner"] is None else record["winner"]) << 44
+    return value
+
+
+def decode(value):
+    """
+    Unpacks a record of the store
+
+    Parameters
+    -------------------
+    value: int
+        Record of a game
+
+    Returns
+    -------------------
+    record: dict
+        The game, in the same format as the records of the event log (without the timings)
+    """
+    result = RESULTS[(value >> 44) & 3]
+    return {
+        "ai": AI_NAMES[(value >> 40) & 7],
+        "ai_player": PLAYERS[(value >> 43) & 1],
+        "moves": [list(divmod((value >> (4 * i)) & 15, 3)) for i in range((value >> 36) & 15)],
+        "winner": None if result == "Draw" else result,
+    }
+
+
+def _fields(value):
+    """Indexed fields of a record: ai, player of the AI, result, first move, second move"""
+    n = (value >> 36) & 15
+    return ((value >> 40) & 7, (value >> 43) & 1, (value >> 44) & 3,
+            value & 15 if n > 0 else NO_MOVE, (value >> 4) & 15 if n > 1 else NO_MOVE)
+
+
+def _selected(value, universe, key):
+    """
+    Values of a field selected by a filter
+
+    Parameters
+    -------------------
+    value:
+        None (any value), a single value or a collection of values
+    universe: int
+        Number of values of the field
+    key: callable
+        Converts a value of the filter into its index
+
+    Returns
+    -------------------
+    Indexes of the selected values (list)
+    """
+    if value is None:
+        return list(range(universe))
+    if isinstance(value, (str, int)) or (isinstance(value, tuple) and value and isinstance(value[0], int)):
+        value = [value] # a single value (coordinates are a tuple of ints)
+    return sorted({key(v) for v in value})
+
+
+def _filter_players(ai_player):
+    """Players selected by the ai_player filter"""
+    return [PLAYERS[p] for p in _selected(ai_player, len(PLAYERS), PLAYERS.index)]
+
+
+class HistoryStore:
+    """
+    Fixed-width binary store of 3x3 games, appended to in bulk and read through mmap.
+    The counters by AI, player of the AI, result and opening moves are kept up to date
+    at every write, so the statistics are computed without reading the games.
+
+    Attributes:
+        self.path: str
+            Path of the store
+        self.count: int
+            Number of games in the store
+    """
+    def __init__(self, path, create=False):
+        """
+        Constructor: opens the store
+
+        Parameters
+        -------------------
+        path: str
+            Path of the store
+        create: bool
+            Create the store if it doesn't exist (only the writers create stores, reading a missing store
+            raises FileNotFoundError)
+        """
+        self.path = path
+        if create and (not os.path.exists(path) or os.path.getsize(path) == 0):
+            with open(path, 'wb') as out_file:
+                out_file.write(HEADER.pack(MAGIC, VERSION, 0))
+                out_file.write(bytes(8 * COUNTERS))
+        self._file = open(path, 'r+b')
+        header = self._file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            self._file.close()
+            raise ValueError(f"{path} is not a game history store")
+        magic, version, self.count = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            self._file.close()
+            raise ValueError(f"{path} is not a game history store")
+        self._counters = array('Q', self._file.read(8 * COUNTERS))
+        if sys.byteorder != 'little':
+            self._counters.byteswap()
+        if len(self._counters) != COUNTERS:
+            self._file.close()
+            raise ValueError(f"{path} is truncated")
+        self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        """Number of games in the store"""
+        return self.count
+
+    def close(self):
+        """Closes the store"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def append(self, records):
+        """
+        Appends games to the store with a single write
+
+        Parameters
+        -------------------
+        records: iterable
+            Games to be stored (dicts with "moves", "ai", "ai_player" and "winner")
+
+        Returns
+        -------------------
+        Number of games appended (int)
+        """
+        values = array('Q', (encode(record) for record in records))
+        if not values:
+            return 0
+        for value in values:
+            self._counters[_counter(*_fields(value))] += 1
+        # the records are written after the last complete one: bytes left by an interrupted write are overwritten,
+        # the header is written last so that it never counts records that are not on disk
+        self._file.seek(OFFSET + RECORD.size * self.count)
+        self._file.write(_little_endian(values))
+        self._file.truncate()
+        self._file.flush()
+        self.count += len(values)
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, self.count) + _little_endian(self._counters))
+        self._file.flush()
+        if self._mmap is not None: # the map doesn't cover the new records
+            self._mmap.close()
+            self._mmap = None
+        return len(values)
+
+    def games(self):
+        """
+        Reads the games of the store one at a time
+
+        Returns
+        -------------------
+        records: generator
+            The games in the order in which they have been appended, in the format of the event log
+        """
+        if not self.count:
+            return
+        if self._mmap is None:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)[OFFSET:OFFSET + RECORD.size * self.count]
+        try:
+            for (value,) in RECORD.iter_unpack(view):
+                yield decode(value)
+        finally:
+            view.release()
+
+    def count_games(self, ai=None, ai_player=None, result=None, first_move=None, second_move=None, human_move=None):
+        """
+        Counts the games matching a filter, using only the counters.
+        Every filter is None (any value), a single value or a collection of values.
+
+        Parameters
+        -------------------
+        ai: str
+            Name of the AI
+        ai_player: str
+            Player of the AI ('X' or 'O')
+        result: str
+            'X', 'O' or 'Draw'
+        first_move: tuple
+            Coordinates of the first move of the game
+        second_move: tuple
+            Coordinates of the second move of the game
+        human_move: tuple
+            Coordinates of the first move of the human (the first or the second move of the game)
+
+        Returns
+        -------------------
+        Number of games (int)
+        """
+        cell = lambda coords: 3 * coords[0] + coords[1]
+        ais = _selected(ai, len(AI_NAMES), AI_NAMES.index)
+        players = _selected(ai_player, len(PLAYERS), PLAYERS.index)
+        results = _selected(result, len(RESULTS), RESULTS.index)
+        firsts = _selected(first_move, NO_MOVE, cell)
+        seconds = _selected(second_move, NO_MOVE, cell)
+        humans = _selected(human_move, NO_MOVE, cell)
+        if first_move is None:
+            firsts.append(NO_MOVE)
+        if second_move is None:
+            seconds.append(NO_MOVE)
+        total = 0
+        for a in ais:
+            for p in players:
+                # the human opens with the second move when the AI plays X, with the first one otherwise
+                f_cells = firsts if human_move is None or p == 0 else [c for c in firsts if c in humans]
+                s_cells = seconds if human_move is None or p == 1 else [c for c in seconds if c in humans]
+                for r in results:
+                    for f in f_cells:
+                        for s in s_cells:
+                            total += self._counters[_counter(a, p, r, f, s)]
+        return total
+
+    def win_rate(self, ai, **filters):
+        """
+        Fraction of the games won by an AI
+
+        Parameters
+        -------------------
+        ai: str
+            Name of the AI
+        filters:
+            Other filters of count_games (ai_player, first_move, second_move, human_move)
+
+        Returns
+        -------------------
+        Games won by the AI over the games played (float, 0.0 if there are none)
+        """
+        played = self.count_games(ai, **filters)
+        if not played:
+            return 0.0
+        won = sum(self.count_games(ai, **dict(filters, ai_player=player, result=player))
+                  for player in _filter_players(filters.get("ai_player")))
+        return won / played
+
+    def stats(self):
+        """
+        Statistics of all the games of the store
+
+        Returns
+        -------------------
+        stats: dict
+            Games won by each player, drawn and played, in the same format as GameManager.stats
+        """
+        stats = {result: self.count_games(result=result) for result in ("X", "O", "Draw")}
+        stats["Total"] = self.count
+        return stats
+
+
+def import_log(log_path, store_path, batch=65536):
+    """
+    Copies the 3x3 games of an event log in a store
+
+    Parameters
+    -------------------
+    log_path: str
+        Path of the event log (JSONL)
+    store_path: str
+        Path of the store
+    batch: int
+        Number of games written at a time
+
+    Returns
+    -------------------
+    Number of games copied (int)
+    """
+    from scripts.event_log import read_events
+    copied = 0
+    with HistoryStore(store_path, create=True) as store:
+        records = []
+        for record in read_events(log_path):
+            if tuple(record.get("shape", (3, 3, 3))) == (3, 3, 3):
+                records.append(record)
+            if len(records) >= batch:
+                copied += store.append(records)
+                records = []
+        copied += store.append(records)
+    return copied
@@ -0,0 +1,163 @@
+from scripts.board import Board
+
+
+class SearchStats:
+    """
+    Work done by an AI to choose a move
+
+    Attributes:
+        self.ai: str
+            Name of the AI
+        self.nodes: int
+            Number of boards visited (moves made with make_move or push)
+        self.terminals: int
+            Number of boards visited where the game is over
+        self.max_depth: int
+            Largest number of moves made after the board of the call
+        self.cache_hits: int
+            Lookups of the transposition table that found a score
+        self.cache_misses: int
+            Lookups of the transposition table that didn't find a score
+        self.copies: int
+            Number of boards created (make_move and copy)
+        self.wall_time: float
+            Seconds taken by the call
+    """
+    __slots__ = ('ai', 'nodes', 'terminals', 'max_depth', 'cache_hits', 'cache_misses', 'copies', 'wall_time', '_max_count')
+
+    def __init__(self, ai):
+        """
+        Constructor
+
+        Parameters
+        -------------------
+        ai: str
+            Name of the AI
+        """
+        self.ai = ai
+        self.nodes = self.terminals = self.max_depth = 0
+        self.cache_hits = self.cache_misses = self.copies = 0
+        self.wall_time = 0.0
+        self._max_count = 0 # largest number of marks of the boards visited
+
+    def as_dict(self):
+        """
+        Returns
+        -------------------
+        stats: dict
+            The statistics by name, for logs and reports
+        """
+        return {name: getattr(self, name) for name in self.__slots__ if not name.startswith('_')}
+
+    def __repr__(self):
+        return 'SearchStats(' + ', '.join(f'{name}={value!r}' for name, value in self.as_dict().items()) + ')'
+
+
+class Probe:
+    """
+    Holds the statistics of the call being measured, shared by all the counting boards of an AIPlayer
+    (boards kept between calls, like the tree of mcts_ai, count their work in the current call)
+
+    Attributes:
+        self.stats: SearchStats
+            Statistics of the current call
+    """
+    __slots__ = ('stats',)
+
+    def __init__(self):
+        """Constructor"""
+        self.stats = None
+
+
+class CountingBoard(Board):
+    """
+    A board that counts the moves made on it and on the boards created from it.
+    The AIs only see counting boards when instrumentation is enabled, so the searches don't pay anything otherwise.
+    The counting boards of a subclass of Board (like QubicBoard) are instances of a counting subclass of it,
+    so they keep its behaviour.
+    """
+    __slots__ = ('_probe',)
+    _types = {} # counting classes, by class of board
+
+    @classmethod
+    def of(cls, board, probe):
+        """
+        Returns a counting copy of a board
+
+        Parameters
+        -------------------
+        board: Board
+            Board to be copied
+        probe: Probe
+            Where the work is counted
+
+        Returns
+        -------------------
+        board: CountingBoard
+            Mutable copy of the board
+        """
+        if isinstance(board, CountingBoard):
+            board_type = type(board)
+        else:
+            board_type = _counting_type(type(board.copy())) # the mutable class of the board (a Position copies to a Board)
+        new_board = board_type.__new__(board_type)
+        for name in Board.__slots__:
+            setattr(new_board, name, getattr(board, name))
+        new_board._undo = None
+        new_board._probe = probe
+        return new_board
+
+    def __count(self, board):
+        """Counts a board reached with a move"""
+        stats = self._probe.stats
+        if stats is None: # a board kept from a measured call, used outside of the AIs
+            return
+        stats.nodes += 1
+        if board._winner is not None or board._count == board._shape.size:
+            stats.terminals += 1
+        if board._count > stats._max_count:
+            stats._max_count = board._count
+
+    def make_move(self, coords, player):
+        new_board = type(self).__new__(type(self))
+        new_board._shape = self._shape
+        new_board._undo = None
+        new_board._probe = self._probe
+        self._play(new_board, coords, player)
+        self.__count(new_board)
+        if self._probe.stats is not None:
+            self._probe.stats.copies += 1
+        return new_board
+
+    def push(self, coords, player):
+        Board.push(self, coords, player)
+        self.__count(self)
+
+    def copy(self):
+        if self._probe.stats is not None:
+            self._probe.stats.copies += 1
+        return CountingBoard.of(self, self._probe)
+
+
+def _counting_type(board_type):
+    """
+    Returns the counting class of a class of boards, creating it the first time it is requested
+
+    Parameters
+    -------------------
+    board_type: type
+        Board or one of its mutable subclasses
+
+    Returns
+    -------------------
+    counting_type: type
+        A subclass of CountingBoard and of board_type
+    """
+    if board_type is Board:
+        return CountingBoard
+    counting_type = CountingBoard._types.get(board_type)
+    if counting_type is None:
+        counting_type = CountingBoard._types[board_type] = type(
+            f'Counting{board_type.__name__}', (CountingBoard, board_type), {'__slots__': (), '__doc__': CountingBoard.__doc__}
+        )
+    return counting_type
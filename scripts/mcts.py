@@ -0,0 +1,213 @@
+import math
+import random
+import time
+
+
+class Node:
+    """
+    A node of the Monte Carlo search tree
+
+    Attributes:
+        self.board: Board
+            Board of the node
+        self.player: str
+            Player who has to move on the board
+        self.move: tuple
+            Move that led to the board (None for the root)
+        self.parent: Node
+            Parent node (None for the root)
+        self.children: list
+            Nodes already expanded
+        self.untried: list
+            Legal moves that haven't been expanded yet
+        self.visits: int
+            Number of playouts that went through the node
+        self.wins: float
+            Results of those playouts for the player who made the move of the node
+            (1 for a win, 0.5 for a draw)
+    """
+    __slots__ = ('board', 'player', 'move', 'parent', 'children', 'untried', 'visits', 'wins')
+
+    def __init__(self, board, player, move=None, parent=None):
+        """
+        Constructor
+
+        Parameters
+        -------------------
+        board: Board
+            Board of the node
+        player: str
+            Player who has to move on the board
+        move: tuple
+            Move that led to the board
+        parent: Node
+            Parent node
+        """
+        self.board = board
+        self.player = player
+        self.move = move
+        self.parent = parent
+        self.children = []
+        over = board.get_winner() is not None or board.is_full()
+        self.untried = [] if over else board.legal_moves()
+        self.visits = 0
+        self.wins = 0.0
+
+    def is_terminal(self):
+        """Determines if the game is over on the board of the node"""
+        return not self.children and not self.untried
+
+    def select_child(self, exploration):
+        """
+        Selects the child with the highest upper confidence bound (UCT)
+
+        Parameters
+        -------------------
+        exploration: float
+            Exploration constant (larger values try the less visited children more often)
+
+        Returns
+        -------------------
+        child: Node
+            The selected child
+        """
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda child: child.wins / child.visits
+                   + exploration * math.sqrt(log_visits / child.visits))
+
+
+class MCTS:
+    """
+    Monte Carlo tree search with UCT selection and random playouts.
+    The tree is kept between the moves of a game: when the board of the next search
+    is a descendant of the previous root, the search continues from that subtree.
+
+    Attributes:
+        self.playouts: int
+            Number of playouts of a search (None for no limit)
+        self.time_limit: float
+            Seconds a search can take (None for no limit)
+        self.exploration: float
+            Exploration constant of UCT
+        self.rng: random.Random
+            Random number generator used by the playouts
+        self.root: Node
+            Root of the tree of the last search
+    """
+    def __init__(self, playouts=1000, time_limit=None, exploration=math.sqrt(2), rng=None):
+        """
+        Constructor
+
+        Parameters
+        -------------------
+        playouts: int
+            Number of playouts of a search (None for no limit)
+        time_limit: float
+            Seconds a search can take (None for no limit), the search stops at the first limit reached
+        exploration: float
+            Exploration constant of UCT
+        rng: random.Random
+            Random number generator (if None the global one of the random module is used)
+        """
+        if playouts is None and time_limit is None:
+            raise ValueError("A search needs a playout or a time limit")
+        self.playouts = playouts
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.rng = random if rng is None else rng
+        self.root = None
+
+    def _find_root(self, board, player):
+        """
+        Looks for the board in the last two levels of the previous tree
+        (the previous move of the AI, then the move of the opponent)
+
+        Parameters
+        -------------------
+        board: Board
+            Board of the new search
+        player: str
+            Player who has to move
+
+        Returns
+        -------------------
+        root: Node
+            The node of the board (a new one if it isn't in the tree)
+        """
+        nodes = [] if self.root is None else [self.root]
+        for _ in range(3):
+            for node in nodes:
+                if node.board == board and node.player == player:
+                    node.parent = None # the rest of the old tree can be freed
+                    node.move = None
+                    return node
+            nodes = [child for node in nodes for child in node.children]
+        return Node(board, player)
+
+    def playout(self, board, player):
+        """
+        Plays random moves until the game is over
+
+        Parameters
+        -------------------
+        board: Board
+            Board where the playout starts
+        player: str
+            Player who has to move
+
+        Returns
+        -------------------
+        winner: str or None
+            Winner of the playout (None for a draw)
+        """
+        choice = self.rng.choice
+        while board.get_winner() is None and not board.is_full():
+            board = board.make_move(choice(board.legal_moves()), player)
+            player = 'O' if player == 'X' else 'X'
+        return board.get_winner()
+
+    def search(self, board, player):
+        """
+        Searches the best move until the playout or the time limit is reached
+
+        Parameters
+        -------------------
+        board: Board
+            Playing board (the game must not be over)
+        player: str
+            Player who has to move
+
+        Returns
+        -------------------
+        best_move: tuple
+            The most visited move of the root
+        """
+        root = self.root = self._find_root(board, player)
+        deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        done = 0
+        while True:
+            node = root
+            while not node.untried and node.children: # selection
+                node = node.select_child(self.exploration)
+            if node.untried: # expansion
+                move = node.untried.pop(self.rng.randrange(len(node.untried)))
+                opponent = 'O' if node.player == 'X' else 'X'
+                child = Node(node.board.make_move(move, node.player), opponent, move, node)
+                node.children.append(child)
+                node = child
+            winner = self.playout(node.board, node.player) # simulation
+            while node is not None: # backpropagation
+                node.visits += 1
+                mover = 'O' if node.player == 'X' else 'X' # player who made the move of the node
+                node.wins += 0.5 if winner is None else (winner == mover)
+                node = node.parent
+            done += 1
+            if self.playouts is not None and done >= self.playouts:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        return max(root.children, key=lambda child: child.visits).move
+
+    def reset(self):
+        """Forgets the tree of the previous searches"""
+        self.root = None
@@ -0,0 +1,261 @@
+from scripts.board import LINES, FULL
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import zlib
+
+MAGIC = b'TTTP'
+VERSION = 1
+HEADER = struct.Struct('<4sHHII') # magic, version, record size, number of records, crc32 of the records
+RECORD = struct.Struct('<bBH') # value, moves to the end of the game, best moves (bit 15 marks a reachable position)
+REACHABLE = 1 << 15
+SIZE = 3 ** 9 # one record for every possible assignment of the 9 cells
+
+
+def _cache_dir():
+    """Directory of the user cache where the default table is kept (the package directory may be read only)"""
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'tictactoe')
+
+
+DEFAULT_PATH = os.path.join(_cache_dir(), 'perfect_play.bin')
+
+# base 3 value of every 9-bit mask, the hash of a board is BASE3[x] + 2 * BASE3[o]
+BASE3 = tuple(sum(3 ** i for i in range(9) if mask >> i & 1) for mask in range(FULL + 1))
+
+
+def position_hash(x, o):
+    """
+    Perfect hash of a position: the cells are the digits of a number in base 3
+    (0 for an empty cell, 1 for X and 2 for O)
+
+    Parameters
+    -------------------
+    x: int
+        Mask of the cells occupied by X
+    o: int
+        Mask of the cells occupied by O
+
+    Returns
+    -------------------
+    Index of the position in the table (int)
+    """
+    return BASE3[x] + 2 * BASE3[o]
+
+
+def solve():
+    """
+    Solves all the positions that can be reached from the empty board, X moving first
+
+    Returns
+    -------------------
+    records: dict
+        For each position hash a tuple (value, moves to the end, best moves mask), where the value is the
+        minimax score of the position for the player who has to move (10 - moves for a win of X,
+        moves - 10 for a win of O, 0 for a draw) and the moves to the end are the ones of the
+        shortest win for the winner, or of the longest game when the player to move can't win
+    """
+    records = {}
+
+    def __solve(x, o, player):
+        code = position_hash(x, o)
+        if code in records:
+            return records[code]
+
+        record = None
+        for line in LINES:
+            if x & line == line:
+                record = (10, 0, 0)
+            elif o & line == line:
+                record = (-10, 0, 0)
+        if record is None and (x | o) == FULL:
+            record = (0, 0, 0) # draw
+
+        if record is None:
+            children = {}
+            for i in range(9):
+                bit = 1 << i
+                if (x | o) & bit:
+                    continue
+                if player == 'X':
+                    value, moves, _ = __solve(x | bit, o, 'O')
+                else:
+                    value, moves, _ = __solve(x, o | bit, 'X')
+                # the value of the child is one move further from the end of the game
+                children[i] = (value - 1 if value > 0 else value + 1 if value < 0 else 0, moves + 1)
+            best = max(v for v, _ in children.values()) if player == 'X' else min(v for v, _ in children.values())
+            best_moves = 0
+            for i, (value, _) in children.items():
+                if value == best:
+                    best_moves |= 1 << i
+            # the winner ends the game as soon as possible, the loser makes it last as long as possible
+            lengths = [moves for value, moves in children.values() if value == best]
+            losing = best < 0 if player == 'X' else best > 0
+            record = (best, max(lengths) if losing else min(lengths), best_moves)
+
+        records[code] = record
+        return record
+
+    __solve(0, 0, 'X')
+    return records
+
+
+def serialize():
+    """
+    Solves all the reachable positions and packs them in the binary format of the table
+
+    Returns
+    -------------------
+    data: bytes
+        Header followed by one record for every position hash
+    """
+    body = bytearray(RECORD.size * SIZE)
+    for code, (value, moves, best_moves) in solve().items():
+        RECORD.pack_into(body, code * RECORD.size, value, moves, best_moves | REACHABLE)
+    return HEADER.pack(MAGIC, VERSION, RECORD.size, SIZE, zlib.crc32(body)) + bytes(body)
+
+
+def build(path=DEFAULT_PATH):
+    """
+    Solves all the reachable positions and writes them in a binary file
+
+    Parameters
+    -------------------
+    path: str
+        Path of the file to be written
+
+    Returns
+    -------------------
+    data: bytes
+        Content of the file
+    """
+    data = serialize()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # write a temporary file first so that readers never see a partial table, with a unique name
+    # so that processes building the table at the same time don't write in the same file
+    fd, tmp = tempfile.mkstemp(dir=directory or None, prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as out_file:
+            out_file.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    return data
+
+
+def _is_valid(data):
+    """
+    Checks the header and the checksum of a table
+
+    Parameters
+    -------------------
+    data: bytes-like
+        Content of a table file
+
+    Returns
+    -------------------
+    Indication of whether the table can be used (bool)
+    """
+    if len(data) != HEADER.size + RECORD.size * SIZE:
+        return False
+    magic, version, record_size, size, crc = HEADER.unpack_from(data)
+    if (magic, version, record_size, size) != (MAGIC, VERSION, RECORD.size, SIZE):
+        return False
+    return zlib.crc32(memoryview(data)[HEADER.size:]) == crc
+
+
+class PerfectPlayTable:
+    """
+    Table with the perfect play for every reachable Tic-Tac-Toe position, read from a memory mapped file.
+
+    Attributes:
+        self.path: str
+            Path of the table file
+    """
+    def __init__(self, path=DEFAULT_PATH):
+        """
+        Constructor: maps the table file in memory, rebuilding it if it is missing or not valid
+
+        Parameters
+        -------------------
+        path: str
+            Path of the table file
+        """
+        self.path = path
+        self._data = self.__open()
+        if self._data is None:
+            try:
+                build(path)
+                self._data = self.__open()
+            except OSError:
+                pass
+        if self._data is None: # the file can't be written, keep the table in memory
+            self._data = serialize()
+
+    def __open(self):
+        """Maps the table file in memory, returns None if it is missing or not valid"""
+        try:
+            with open(self.path, 'rb') as in_file:
+                data = mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError): # missing or empty file
+            return None
+        if not _is_valid(data):
+            data.close()
+            return None
+        return data
+
+    def lookup(self, board):
+        """
+        Looks up a board in the table
+
+        Parameters
+        -------------------
+        board: Board
+            Board to be looked up
+
+        Returns
+        -------------------
+        record: tuple or None
+            (value, moves to the end, best moves mask) of the board for the player who has to move,
+            None if the board can't be reached in a game
+        """
+        value, moves, best_moves = RECORD.unpack_from(self._data, HEADER.size + position_hash(board.x, board.o) * RECORD.size)
+        if not best_moves & REACHABLE:
+            return None
+        return value, moves, best_moves & ~REACHABLE
+
+    def close(self):
+        """Unmaps the table file"""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+
+_default_table = None
+
+def default_table():
+    """
+    Returns the table stored in the default path, mapping it in memory the first time it is requested
+
+    Returns
+    -------------------
+    table: PerfectPlayTable
+        Table shared by all the callers
+    """
+    global _default_table
+    if _default_table is None:
+        _default_table = PerfectPlayTable()
+    return _default_table
+
+
+if __name__ == '__main__':
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    build(path)
+    print(f'Perfect play table written to {path}')
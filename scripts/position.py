@@ -0,0 +1,120 @@
+from scripts.board import Board
+from scripts.qubic import new_board
+
+
+class Position(Board):
+    """
+    An immutable board that exists only once for every state (flyweight).
+    make_move returns the interned successor, remembered in a transition table filled
+    the first time each move is played, so repeating a move costs a dictionary lookup
+    and the number of objects never grows beyond the number of distinct states
+    (5,478 for the 3x3 board, positions are meant for small boards).
+
+    Positions can be used everywhere a Board is expected, but they can't be changed with __setitem__ or push
+    (copy returns a mutable board).
+    """
+    __slots__ = ('_next',)
+    _interned = {} # positions already created, by (shape, x, o)
+
+    def __init__(self, *args, **kwargs):
+        raise TypeError('Positions are interned: use Position.initial or Position.of')
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Positions are immutable')
+
+    def __setitem__(self, key, elem):
+        raise TypeError('Positions are immutable, use make_move')
+
+    def push(self, coords, player):
+        raise TypeError('Positions are immutable, use make_move (or push on a copy)')
+
+    def pop(self):
+        raise TypeError('Positions are immutable')
+
+    def __reduce__(self):
+        """Pickles only the masks, the position is interned again in the other process"""
+        return (_unpickle, (self.shape.key, self.x, self.o))
+
+    @classmethod
+    def of(cls, board):
+        """
+        Returns the interned position with the same state as a board
+
+        Parameters
+        -------------------
+        board: Board
+            Any board (it isn't changed or kept)
+
+        Returns
+        -------------------
+        position: Position
+            The only position with that state
+        """
+        key = (board.shape, board.x, board.o)
+        position = cls._interned.get(key)
+        if position is None:
+            position = object.__new__(cls)
+            for name in Board.__slots__:
+                object.__setattr__(position, name, getattr(board, name))
+            object.__setattr__(position, '_undo', None)
+            object.__setattr__(position, '_next', {})
+            position = cls._interned.setdefault(key, position) # another thread may have created it first
+        return position
+
+    @classmethod
+    def initial(cls, rows=3, cols=3, k=None):
+        """
+        Returns the empty position
+
+        Parameters
+        -------------------
+        rows: int
+            Number of rows of the board
+        cols: int
+            Number of columns of the board
+        k: int
+            Number of marks in a row needed to win (by default the smallest side of the board)
+
+        Returns
+        -------------------
+        position: Position
+            The empty position with that shape
+        """
+        return cls.of(Board(rows, cols, k))
+
+    def make_move(self, coords, player):
+        """
+        Makes a move
+
+        Parameters
+        --------------------
+        coords: int or tuple
+            Coordinates of cell where the player waint to make a move
+        player: str
+            Player to make the move ('X' or 'O')
+
+        Returns
+        -------------------
+        position: Position
+            The interned position after the move
+        """
+        try:
+            return self._next[(coords, player)]
+        except KeyError:
+            pass
+        except TypeError: # unhashable coordinates, Board.make_move raises the right error
+            return Board.make_move(self, coords, player)
+        # invalid moves raise here, before anything is stored
+        successor = self._next[(coords, player)] = Position.of(Board.make_move(self, coords, player))
+        return successor
+
+
+def _unpickle(key, x, o):
+    """Interns a position from its shape and its masks"""
+    board = new_board(key) # a Board, or a QubicBoard for the keys of the cubes
+    for i in range(board.shape.size):
+        if x >> i & 1:
+            board[i] = 'X'
+        elif o >> i & 1:
+            board[i] = 'O'
+    return Position.of(board)
@@ -0,0 +1,204 @@
+from scripts.board import Board, Shape
+import itertools
+
+# directions of the winning lines: rows, columns, pillars, then the diagonals of the faces and the diagonals of the cube
+DIRECTIONS = (
+    (0, 0, 1), (0, 1, 0), (1, 0, 0),
+    (0, 1, 1), (0, 1, -1), (1, 0, 1), (1, 0, -1), (1, 1, 0), (1, -1, 0),
+    (1, 1, 1), (1, 1, -1), (1, -1, 1), (1, -1, -1),
+)
+
+
+class CubeShape(Shape):
+    """
+    The tables of a cubic board with n layers of n rows and n columns, where the winning lines
+    go in any of the 13 directions of the cube (76 lines on the 4x4x4 board of Qubic).
+    The cell (layer, row, col) is the bit layer * n * n + row * n + col of the masks, so the
+    whole 4x4x4 board fits in 64 bit masks, and the symmetries are the 48 rotations and reflections of the cube.
+    The tables have the same names as the ones of Shape, so boards and AIs use them in the same way.
+
+    Attributes:
+        self.layers: int
+            Number of layers of the board (the same as the number of rows and of columns)
+    """
+    _shapes = {} # shapes already built, by (n, k)
+
+    @classmethod
+    def get(cls, n, k):
+        """
+        Returns the shape with the given dimensions, building it the first time it is requested
+
+        Parameters
+        -------------------
+        n: int
+            Number of layers, rows and columns of the board
+        k: int
+            Number of marks in a row needed to win
+
+        Returns
+        -------------------
+        shape: CubeShape
+            The shared tables of the shape
+        """
+        key = (n, k)
+        shape = cls._shapes.get(key)
+        if shape is None:
+            shape = cls._shapes[key] = cls(n, k)
+        return shape
+
+    def __init__(self, n, k):
+        """constructor (use CubeShape.get to share the tables)"""
+        if not 2 <= k <= n: # as for Shape, the threats need lines of at least 2 cells
+            raise ValueError('The winning length must be at least 2 and fit in the board')
+        self.layers = self.rows = self.cols = n
+        self.k = k
+        self.key = (n, n, n, k)
+        coords = tuple(itertools.product(range(n), repeat=3))
+
+        def inside(cell):
+            return all(0 <= a < n for a in cell)
+
+        def index(cell):
+            return (cell[0] * n + cell[1]) * n + cell[2]
+
+        line_cells = []
+        for d in DIRECTIONS:
+            for cell in coords:
+                cells = [tuple(a + da * j for a, da in zip(cell, d)) for j in range(k)]
+                if all(inside(c) for c in cells):
+                    line_cells.append(tuple(index(c) for c in cells))
+
+        diags = [] # the diagonals are the lines that are not parallel to an edge, from one side of the board to the other
+        for d in DIRECTIONS[3:]:
+            for cell in coords:
+                if inside(tuple(a - da for a, da in zip(cell, d))): # not the first cell of its diagonal
+                    continue
+                cells = []
+                while inside(cell):
+                    cells.append(index(cell))
+                    cell = tuple(a + da for a, da in zip(cell, d))
+                if len(cells) >= k:
+                    diags.append(tuple(cells))
+        self.diags = tuple(diags)
+
+        last = n - 1
+        self.corners = tuple(itertools.product((0, last), repeat=3))
+        permutations = [] # every order of the axes, with every reflection (the identity first)
+        for axes in itertools.permutations(range(3)):
+            for flips in itertools.product((False, True), repeat=3):
+                permutations.append(tuple(
+                    index(tuple(last - cell[a] if flip else cell[a] for a, flip in zip(axes, flips))) for cell in coords
+                ))
+        self._build_tables(coords, line_cells, permutations, f'zobrist:cube:{n}:{k}')
+
+    def __reduce__(self):
+        """Pickles only the dimensions: the tables are taken from (or built in) the cache of the other process"""
+        return (CubeShape.get, (self.layers, self.k))
+
+
+class QubicBoard(Board):
+    """
+    A board of 3D Tic-Tac-Toe: n layers of n x n cells, where the first player to get
+    k marks in a row in any direction wins (Qubic is the 4x4x4 board with k = 4).
+
+    The cells are addressed with (layer, row, col) or with their index, and the board has the
+    same interface as Board (masks, incremental line counters, threats, Zobrist hash, push and pop),
+    so every AI of AIPlayer can play on it. make_move and copy return boards of 3D Tic-Tac-Toe.
+    """
+    __slots__ = ()
+
+    def __init__(self, n=4, k=None):
+        """
+        Constructor
+
+        Parameters
+        -------------------
+        n: int
+            Number of layers, rows and columns of the board
+        k: int
+            Number of marks in a row needed to win (by default n)
+        """
+        self._init(CubeShape.get(n, n if k is None else k))
+
+    @property
+    def layers(self):
+        """Number of layers of the board"""
+        return self._shape.layers
+
+    @property
+    def board(self):
+        """A list with the rows of every layer of the board (read only copy)"""
+        return self.get_layers()
+
+    def get_layers(self):
+        """
+        Returns a list of lists containing the rows of each layer of the board
+
+        Returns
+        -------------------
+        layers: list
+            A list with a list of rows for every layer
+        """
+        rows = self.get_rows()
+        n = self._shape.layers
+        return [ rows[start:start + n] for start in range(0, len(rows), n) ]
+
+    def get_columns(self):
+        """
+        Returns a list of lists containing the colums of every layer of the board
+
+        Returns
+        -------------------
+        cols: list
+            A list of lists containing the columns of the board, layer by layer
+        """
+        n = self._shape.layers
+        return [ self[start + col:start + n * n:n] for start in range(0, self._shape.size, n * n) for col in range(n) ]
+
+    def make_move(self, coords, player):
+        new_board = QubicBoard.__new__(QubicBoard)
+        new_board._shape = self._shape
+        new_board._undo = None
+        self._play(new_board, coords, player)
+        return new_board
+
+    def copy(self):
+        new_board = QubicBoard.__new__(QubicBoard)
+        for name in Board.__slots__:
+            setattr(new_board, name, getattr(self, name))
+        new_board._undo = None
+        return new_board
+
+    def render(self):
+        """Renders the playing board, one layer after the other"""
+        n = self._shape.layers
+        width = len(str(n - 1))
+        for num, layer in enumerate(self.get_layers()):
+            print(f'Layer {num}')
+            print(' ' * width + '  ' + ' '.join(f'{col:<{width}}' for col in range(n)).rstrip())
+            print(' ' * width + ' ' + '-' * (n * (width + 1) + 1))
+            for row_num, row in enumerate(layer):
+                print(f'{row_num:>{width}}|', end = ' ')
+                for cell in row:
+                    print(f"{' ' if cell is None else cell:<{width}}", end = ' ')
+                print('|')
+            print(' ' * width + ' ' + '-' * (n * (width + 1) + 1))
+
+
+def new_board(shape):
+    """
+    Creates an empty board from the key of its shape
+
+    Parameters
+    -------------------
+    shape: tuple
+        (rows, cols, k) of a board, or (n, n, n, k) of a board of 3D Tic-Tac-Toe
+
+    Returns
+    -------------------
+    board: Board
+        The empty board
+    """
+    if len(shape) == 4:
+        return QubicBoard(shape[0], shape[3])
+    return Board(*shape)
@@ -0,0 +1,268 @@
+from scripts.ai import AIPlayer
+from scripts.engine import AI_NAMES, Game, GameOver
+from scripts.stats import StatsRecorder, StatsSink
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import asyncio
+import json
+import threading
+
+# Line based protocol, one game per connection:
+#   NEW <ai> [X|O]     starts a game against an AI (the AI plays X by default and moves first)
+#   MOVE <row> <col>   plays a move of the human, the AI answers in the same response
+#   STATE              returns the state of the game
+#   QUIT               closes the connection
+# Every command is answered with a single line: "OK <state as JSON>", "ERR <reason>" or "BYE".
+
+_local = threading.local() # one AIPlayer for every worker thread (or process)
+
+
+def choose_move(ai_name, board, player):
+    """
+    Runs an AI search in a worker of the executor
+
+    Parameters
+    -------------------
+    ai_name: str
+        Name of the AI
+    board: Board
+        Playing board
+    player: str
+        Player of the AI
+
+    Returns
+    -------------------
+    coords: tuple
+        Move chosen by the AI
+    """
+    ai = getattr(_local, 'ai', None)
+    if ai is None: # the cache of the AI is shared by the games served by the worker
+        ai = _local.ai = AIPlayer()
+    return getattr(ai, ai_name)(board, player)
+
+
+class GameServer:
+    """
+    An asyncio server hosting many games between humans and AIs at the same time.
+    The AI searches run in a bounded executor, so a slow search never blocks the other games.
+
+    Attributes:
+        self.max_sessions: int
+            Maximum number of games played at the same time, more connections are refused
+        self.max_pending: int
+            Maximum number of AI searches queued or running in the executor,
+            the other games wait for their turn
+        self.move_timeout: float
+            Seconds an AI search can take, after that the AI plays the fallback AI move instead
+        self.idle_timeout: float
+            Seconds the server waits for a command before closing the connection
+        self.fallback_ai: str
+            Fast AI used when a search takes too long
+        self.executor: concurrent.futures.Executor
+            Executor running the AI searches (a thread pool by default, a process pool can be given)
+        self.sessions: int
+            Number of games being played
+        self.stats: StatsRecorder
+            Results of the games played on the server
+        self.ai: AIPlayer
+            AIPlayer shared by all the games of the server (the searches and the fallback moves use
+            the AIPlayer of the thread that runs them, the caches of an AIPlayer are not thread-safe)
+    """
+    def __init__(self, host='127.0.0.1', port=0, max_sessions=10000, workers=4, max_pending=None,
+                 move_timeout=5.0, idle_timeout=300.0, fallback_ai='find_winning_moves_and_losing_moves_ai',
+                 executor=None):
+        """
+        Constructor
+
+        Parameters
+        -------------------
+        host: str
+            Address where the server listens
+        port: int
+            Port where the server listens (0 to let the system choose one)
+        max_sessions: int
+            Maximum number of games played at the same time
+        workers: int
+            Number of threads of the default executor
+        max_pending: int
+            Maximum number of AI searches submitted to the executor (by default twice the workers)
+        move_timeout: float
+            Seconds an AI search can take
+        idle_timeout: float
+            Seconds the server waits for a command
+        fallback_ai: str
+            AI used when a search takes too long
+        executor: concurrent.futures.Executor
+            Executor for the AI searches (if None a thread pool with $workers threads is created)
+        """
+        self.host = host
+        self.port = port
+        self.max_sessions = max_sessions
+        self.max_pending = 2 * workers if max_pending is None else max_pending
+        self.move_timeout = move_timeout
+        self.idle_timeout = idle_timeout
+        self.fallback_ai = fallback_ai
+        self.executor = ThreadPoolExecutor(workers) if executor is None else executor
+        self.sessions = 0
+        self.stats = StatsRecorder()
+        self.ai = AIPlayer()
+        self._pending = None
+        self._server = None
+
+    async def start(self):
+        """
+        Starts listening for connections
+
+        Returns
+        -------------------
+        port: int
+            Port where the server is listening
+        """
+        self._pending = asyncio.Semaphore(self.max_pending)
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def serve_forever(self):
+        """Starts the server (if needed) and serves until it is cancelled"""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """Stops the server and the executor"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.executor.shutdown(wait=False)
+
+    async def _ai_move(self, game):
+        """
+        Lets the AI of a game move, running the search in the executor
+
+        Parameters
+        -------------------
+        game: Game
+            Game where the AI has to move
+        """
+        loop = asyncio.get_running_loop()
+        async with self._pending: # backpressure: at most max_pending searches in the executor
+            search = loop.run_in_executor(self.executor, choose_move, game.ai_name, game.board, game.ai_player)
+            try:
+                coords = await asyncio.wait_for(search, self.move_timeout)
+            except asyncio.TimeoutError: # the search goes on in the worker, but its move is not used
+                # the fallback runs in the default executor of the loop: the workers may all be busy with slow searches.
+                # Like the searches, it uses the AIPlayer of its thread: the caches of an AIPlayer are not thread-safe
+                coords = await loop.run_in_executor(None, choose_move, self.fallback_ai, game.board, game.ai_player)
+        game.ai_move(coords)
+
+    async def _execute(self, game, line):
+        """
+        Executes a command
+
+        Parameters
+        -------------------
+        game: Game or None
+            Game of the connection
+        line: str
+            Command received
+
+        Returns
+        -------------------
+        game: Game or None
+            Game of the connection after the command
+        response: str
+            Response to be sent
+        """
+        words = line.split()
+        if not words:
+            return game, 'ERR empty command'
+        command, args = words[0].upper(), words[1:]
+
+        if command == 'NEW':
+            if not args or args[0] not in AI_NAMES:
+                return game, f"ERR unknown AI, choose one of: {' '.join(AI_NAMES)}"
+            ai_player = args[1].upper() if len(args) > 1 else 'X'
+            if ai_player not in ('X', 'O'):
+                return game, 'ERR the AI must play X or O'
+            game = Game(args[0], ai=self.ai, ai_player=ai_player, sinks=[StatsSink(self.stats)])
+            if game.to_move == game.ai_player:
+                await self._ai_move(game)
+        elif command == 'MOVE':
+            if game is None:
+                return game, 'ERR no game, start one with NEW'
+            try:
+                game.submit_move((int(args[0]), int(args[1])))
+            except GameOver:
+                return game, 'ERR the game is over'
+            except Exception: # missing or wrong coordinates, or the cell is already occupied
+                return game, 'ERR invalid move'
+            if not game.is_over():
+                await self._ai_move(game)
+        elif command == 'STATE':
+            if game is None:
+                return game, 'ERR no game, start one with NEW'
+        elif command == 'QUIT':
+            return game, 'BYE'
+        else:
+            return game, f'ERR unknown command {command}'
+        return game, 'OK ' + json.dumps(game.state())
+
+    async def _handle(self, reader, writer):
+        """
+        Serves a connection
+
+        Parameters
+        -------------------
+        reader: asyncio.StreamReader
+            Stream of the commands
+        writer: asyncio.StreamWriter
+            Stream of the responses
+        """
+        if self.sessions >= self.max_sessions:
+            writer.write(b'ERR busy\n')
+            await writer.drain()
+            writer.close()
+            return
+        self.sessions += 1
+        game = None
+        try:
+            while True:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    writer.write(b'ERR timeout\n')
+                    break
+                except ValueError: # the line is longer than the limit of the reader
+                    writer.write(b'ERR line too long\n')
+                    break
+                if not line: # the client has closed the connection
+                    break
+                game, response = await self._execute(game, line.decode(errors='replace'))
+                writer.write(response.encode() + b'\n')
+                await writer.drain() # backpressure: don't buffer responses for a slow client
+                if response == 'BYE':
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serves games of Tic-Tac-Toe against the AIs')
+    parser.add_argument('--host', default='127.0.0.1', help='address where the server listens')
+    parser.add_argument('--port', type=int, default=8765, help='port where the server listens')
+    parser.add_argument('--workers', type=int, default=4, help='threads running the AI searches')
+    parser.add_argument('--max-sessions', type=int, default=10000, help='maximum number of games at the same time')
+    parser.add_argument('--move-timeout', type=float, default=5.0, help='seconds an AI search can take')
+    args = parser.parse_args()
+
+    server = GameServer(args.host, args.port, args.max_sessions, args.workers, move_timeout=args.move_timeout)
+    print(f'Serving on {args.host}:{args.port}')
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
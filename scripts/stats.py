@@ -0,0 +1,185 @@
+import threading
+
+RESULTS = ("X", "O", "Draw")
+
+
+def _result(winner):
+    """Key of the result of a game with the given winner"""
+    return "Draw" if winner is None else winner
+
+
+def _totals(counts, key=None):
+    """
+    Adds up the counts of a snapshot
+
+    Parameters
+    -------------------
+    counts: dict
+        Games by (ai, first move, result)
+    key: callable
+        Groups the counts by key((ai, first move)) (if None they are all added together)
+
+    Returns
+    -------------------
+    stats: dict
+        Games won by each player, drawn and played (a dict of them by group if key is given)
+    """
+    groups = {}
+    for (ai, first_move, result), n in counts.items():
+        group = None if key is None else key((ai, first_move))
+        stats = groups.get(group)
+        if stats is None:
+            stats = groups[group] = {"X":0, "O":0, "Draw":0, "Total":0}
+        stats[result] += n
+        stats["Total"] += n
+    if key is None:
+        return groups.get(None, {"X":0, "O":0, "Draw":0, "Total":0})
+    return groups
+
+
+class StatsRecorder:
+    """
+    Statistics of the games played, counted by AI, first move and result.
+    Every thread counts its games in its own shard, so recording a game never takes a lock;
+    the shards are added up when the statistics are read.
+
+    Snapshots are plain dicts {(ai, first move, result): games}: a process (a simulator or a server worker)
+    can take a snapshot of its recorder and send it to another one, which merges it in its own.
+    """
+    def __init__(self):
+        """Constructor"""
+        self._local = threading.local()
+        self._shards = [] # counts of every thread that has recorded a game
+        self._lock = threading.Lock() # taken only to add a shard
+
+    def _shard(self):
+        """Counts of the current thread"""
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def record(self, ai, first_move, winner, games=1):
+        """
+        Records the result of a game
+
+        Parameters
+        -------------------
+        ai: str
+            Name of the AI of the game (None if unknown)
+        first_move: tuple
+            Coordinates of the first move of the game (None if unknown)
+        winner: str or None
+            Winner of the game (None for a draw)
+        games: int
+            Number of games with this result
+        """
+        shard = self._shard()
+        key = (ai, None if first_move is None else tuple(first_move), _result(winner))
+        shard[key] = shard.get(key, 0) + games
+
+    def record_game(self, game):
+        """
+        Records the result of a game that is over
+
+        Parameters
+        -------------------
+        game: Game
+            Game played
+        """
+        self.record(game.ai_name, game.moves[0][1] if game.moves else None, game.winner)
+
+    def snapshot(self):
+        """
+        Adds up the shards
+
+        Returns
+        -------------------
+        counts: dict
+            Games by (ai, first move, result)
+        """
+        with self._lock:
+            shards = list(self._shards)
+        counts = {}
+        for shard in shards:
+            for key, n in dict.copy(shard).items(): # the copy is atomic, the thread of the shard may be counting
+                counts[key] = counts.get(key, 0) + n
+        return counts
+
+    def merge(self, counts):
+        """
+        Adds the counts of a snapshot (for example one taken by another process)
+
+        Parameters
+        -------------------
+        counts: dict
+            Games by (ai, first move, result)
+        """
+        for (ai, first_move, result), n in counts.items():
+            self.record(ai, first_move, None if result == "Draw" else result, n)
+
+    def merge_stats(self, stats):
+        """
+        Adds statistics without any breakdown (for example loaded from a file)
+
+        Parameters
+        -------------------
+        stats: dict
+            Games won by each player and drawn, in the same format as GameManager.stats
+        """
+        for result in RESULTS:
+            if stats.get(result):
+                self.record(None, None, None if result == "Draw" else result, stats[result])
+
+    def totals(self):
+        """
+        Returns
+        -------------------
+        stats: dict
+            Games won by each player, drawn and played, in the same format as GameManager.stats
+        """
+        return _totals(self.snapshot())
+
+    def by_ai(self):
+        """
+        Returns
+        -------------------
+        stats: dict
+            Statistics of the games (in the same format as GameManager.stats) by name of the AI
+        """
+        return _totals(self.snapshot(), lambda key: key[0])
+
+    def by_first_move(self):
+        """
+        Returns
+        -------------------
+        stats: dict
+            Statistics of the games (in the same format as GameManager.stats) by coordinates of the first move
+        """
+        return _totals(self.snapshot(), lambda key: key[1])
+
+
+class StatsSink:
+    """
+    Game sink recording the result of every game when it is over
+    """
+    def __init__(self, recorder):
+        """
+        Constructor
+
+        Parameters
+        -------------------
+        recorder: StatsRecorder
+            Recorder of the results
+        """
+        self.recorder = recorder
+
+    def move(self, game, player, coords):
+        """Called after every move"""
+        pass
+
+    def end(self, game):
+        """Called once when the game is over"""
+        self.recorder.record_game(game)
@@ -0,0 +1,157 @@
+from scripts.ai import AI_NAMES, AIPlayer # AI_NAMES: the AIs that can take part in a tournament
+from scripts.position import Position
+from scripts.qubic import new_board
+import argparse
+import multiprocessing
+import random
+
+
+def play_headless(x_ai, o_ai, board):
+    """
+    Plays a game between two AIs without any input or output
+
+    Parameters
+    -------------------
+    x_ai: callable
+        AI playing as X (it moves first), called as x_ai(board, 'X')
+    o_ai: callable
+        AI playing as O, called as o_ai(board, 'O')
+    board: Board
+        Board where the game starts
+
+    Returns
+    -------------------
+    winner: str or None
+        The winner of the game (None for a draw)
+    """
+    players = (('X', x_ai), ('O', o_ai))
+    turn = 0 if board.move_count % 2 == 0 else 1
+    while board.get_winner() is None and not board.is_full():
+        player, ai = players[turn]
+        board = board.make_move(ai(board, player), player)
+        turn ^= 1
+    return board.get_winner()
+
+
+def chunk_seed(seed, chunk):
+    """
+    Seed of the random number generator of a chunk of games, so that the
+    results depend only on the seed of the tournament and not on how the
+    chunks are spread across the processes
+
+    Parameters
+    -------------------
+    seed: int
+        Seed of the tournament
+    chunk: int
+        Index of the chunk
+
+    Returns
+    -------------------
+    Seed of the chunk (str)
+    """
+    return f'{seed}:{chunk}'
+
+
+def play_chunk(job):
+    """
+    Plays a chunk of games between two AIs with its own random number generator
+
+    Parameters
+    -------------------
+    job: tuple
+        (name of the AI playing X, name of the AI playing O, number of games, seed of the chunk, shape of the board)
+
+    Returns
+    -------------------
+    stats: dict
+        Games won by each player, drawn and played
+    """
+    x_name, o_name, games, seed, shape = job
+    rng = random.Random(seed)
+    ai = AIPlayer(rng=rng) # the cache of the AI is shared by all the games of the chunk
+    x_ai, o_ai = getattr(ai, x_name), getattr(ai, o_name)
+    stats = {"X":0, "O":0, "Draw":0, "Total":0}
+    # the 3x3 games reuse the interned positions, larger boards have too many states to keep them
+    start = Position.initial(*shape) if tuple(shape) == (3, 3, 3) else new_board(shape)
+    for _ in range(games):
+        winner = play_headless(x_ai, o_ai, start)
+        stats["Draw" if winner is None else winner] += 1
+    stats["Total"] += games
+    return stats
+
+
+def run_tournament(x_name, o_name, games, seed=0, workers=None, chunk_size=1000, shape=(3, 3, 3)):
+    """
+    Plays games between two AIs, spreading them across a pool of processes.
+    The games are split in chunks, each one with a random number generator
+    seeded from the seed of the tournament, so the results are reproducible.
+
+    Parameters
+    -------------------
+    x_name: str
+        Name of the AI playing X (it moves first)
+    o_name: str
+        Name of the AI playing O
+    games: int
+        Number of games to be played
+    seed: int
+        Seed of the tournament
+    workers: int
+        Number of processes (None for one per CPU, 1 to play in the current process)
+    chunk_size: int
+        Number of games played by a process in one go
+    shape: tuple
+        (rows, cols, k) of the board, or (n, n, n, k) for 3D Tic-Tac-Toe
+
+    Returns
+    -------------------
+    stats: dict
+        Games won by each player, drawn and played, in the same format as GameManager.stats
+    """
+    for name in (x_name, o_name):
+        if name not in AI_NAMES:
+            raise ValueError(f"Unknown AI: {name}")
+    jobs = []
+    for chunk, start in enumerate(range(0, games, chunk_size)):
+        jobs.append((x_name, o_name, min(chunk_size, games - start), chunk_seed(seed, chunk), tuple(shape)))
+
+    if workers == 1 or len(jobs) <= 1: # not worth starting the processes
+        return merge_stats(map(play_chunk, jobs))
+    with multiprocessing.Pool(workers) as pool:
+        return merge_stats(pool.imap_unordered(play_chunk, jobs))
+
+
+def merge_stats(results):
+    """
+    Adds up the statistics of several chunks of games
+
+    Parameters
+    -------------------
+    results: iterable
+        Statistics of the chunks
+
+    Returns
+    -------------------
+    stats: dict
+        Games won by each player, drawn and played
+    """
+    stats = {"X":0, "O":0, "Draw":0, "Total":0}
+    for result in results:
+        for key in stats:
+            stats[key] += result[key]
+    return stats
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Plays a tournament between two AIs')
+    parser.add_argument('x_ai', choices=AI_NAMES, help='AI playing X (it moves first)')
+    parser.add_argument('o_ai', choices=AI_NAMES, help='AI playing O')
+    parser.add_argument('--games', type=int, default=1000, help='number of games')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the random number generators')
+    parser.add_argument('--workers', type=int, default=None, help='number of processes (default: one per CPU)')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='games played by a process in one go')
+    args = parser.parse_args()
+
+    stats = run_tournament(args.x_ai, args.o_ai, args.games, args.seed, args.workers, args.chunk_size)
+    print(stats)
@@ -0,0 +1,78 @@
+from collections import OrderedDict
+
+
+class TranspositionTable:
+    """
+    A bounded cache of search results, keyed by positions.
+    When the table is full the least recently used entry is evicted.
+
+    Attributes:
+        self.maxsize: int
+            Maximum number of entries kept in the table (None for no bound)
+        self.hits: int
+            Number of lookups that found an entry
+        self.misses: int
+            Number of lookups that did not find an entry
+    """
+    def __init__(self, maxsize=100000):
+        """constructor"""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        """Number of entries in the table"""
+        return len(self._entries)
+
+    def __contains__(self, key):
+        """Determines if there is an entry for $key (without updating its recency)"""
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """
+        Looks up the entry stored for a key
+
+        Parameters
+        -------------------
+        key: hashable
+            Key of the position
+        default: Any
+            Value returned if there is no entry for the key
+
+        Returns
+        -------------------
+        The stored value, or default if there is none
+        """
+        entries = self._entries
+        try:
+            value = entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        entries.move_to_end(key) # the entry is now the most recently used
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Stores a value for a key, evicting the least recently used entry if the table is full
+
+        Parameters
+        -------------------
+        key: hashable
+            Key of the position
+        value: Any
+            Value to be stored
+        """
+        entries = self._entries
+        entries[key] = value
+        entries.move_to_end(key)
+        if self.maxsize is not None and len(entries) > self.maxsize:
+            entries.popitem(last=False)
+
+    def clear(self):
+        """Removes all the entries and resets the hit/miss counters"""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
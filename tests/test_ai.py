@@ -0,0 +1,282 @@
+from scripts.ai import AIPlayer
+from scripts.board import Board
+from scripts.mcts import MCTS
+from scripts.perfect_table import PerfectPlayTable, HEADER, build, solve
+from scripts.transposition import TranspositionTable
+from concurrent.futures import ThreadPoolExecutor
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def reference_score(board, current_player, depth=0):
+    """Plain minimax without any cache, used as reference"""
+    winner = board.get_winner()
+    if winner == 'X':
+        return 10 - depth
+    elif winner == 'O':
+        return depth - 10
+    elif board.is_full():
+        return 0
+    opponent = 'X' if current_player == 'O' else 'O'
+    scores = [reference_score(board.make_move(move, current_player), opponent, depth+1) for move in board.legal_moves()]
+    return max(scores) if current_player == 'X' else min(scores)
+
+
+def make_board(cells):
+    """Creates a board from a string of 9 characters ('X', 'O' or '.')"""
+    b = Board()
+    for i, c in enumerate(cells):
+        if c != '.':
+            b[i] = c
+    return b
+
+
+POSITIONS = [
+    ('X........', 'O'),
+    ('X...O....', 'X'),
+    ('XX..O..O.', 'O'),
+    ('X.O.X....', 'O'),
+    ('.O..X...X', 'O'),
+    ('XO.OX....', 'X'),
+]
+
+
+class TestAIPlayer(unittest.TestCase):
+
+    def test_minimax_score(self):
+        ai = AIPlayer()
+        for cells, player in POSITIONS:
+            b = make_board(cells)
+            for depth in (0, 2):
+                self.assertEqual(reference_score(b, player, depth), ai.minimax_score(b, player, depth))
+
+    def test_minimax_ai(self):
+        ai = AIPlayer()
+        self.assertEqual(ai.minimax_ai(make_board('XX..O..O.'), 'X'), (0, 2)) # X wins immediately
+        self.assertEqual(ai.minimax_ai(make_board('XX..O....'), 'O'), (0, 2)) # O has to block
+        self.assertIn(ai.minimax_ai(Board(), 'X'), [(0,0), (0,2), (2,0), (2,2)])
+
+    def test_heuristic_ais(self):
+        ai = AIPlayer()
+        b = make_board('XX..O..O.')
+        self.assertEqual(ai.find_winning_moves_ai(b, 'X'), (0, 2))
+        self.assertEqual(ai.find_winning_moves_and_losing_moves_ai(b, 'X'), (0, 2)) # winning is better than blocking
+        self.assertEqual(ai.find_winning_moves_and_losing_moves_ai(make_board('X...O..O.'), 'X'), (0, 1)) # block O
+        self.assertIn(ai.random_ai(b, 'O'), b.legal_moves())
+
+    def test_alphabeta(self):
+        for cells, player in POSITIONS:
+            b = make_board(cells)
+            ai = AIPlayer(cache=TranspositionTable(maxsize=0)) # no cache, so that every board is searched
+            self.assertEqual(reference_score(b, player, 1), ai.alphabeta_score(b, player, 1))
+            for mover in ('X', 'O'):
+                self.assertEqual(AIPlayer(search="minimax").minimax_ai(b, mover), AIPlayer(search="alphabeta").minimax_ai(b, mover))
+
+        with self.assertRaises(ValueError):
+            AIPlayer(search="unknown")
+
+    def test_iterative(self):
+        ai = AIPlayer(search="iterative")
+        for cells, player in POSITIONS:
+            b = make_board(cells)
+            opponent = 'O' if player == 'X' else 'X'
+            best = reference_score(b, player)
+            self.assertEqual(reference_score(b.make_move(ai.minimax_ai(b, player), player), opponent, 1), best) # an optimal move
+
+        calls = []
+        def evaluate(board):
+            calls.append(board.move_count)
+            return 0
+        ai = AIPlayer(search="iterative", max_depth=2, evaluate=evaluate)
+        self.assertIn(ai.minimax_ai(make_board('X...O....'), 'X'), make_board('X...O....').legal_moves())
+        self.assertEqual(max(calls), 4) # the search stops two moves from the board
+
+        ai = AIPlayer(search="iterative", time_limit=0.05)
+        b = Board(9, 9, 5).make_move((4,4), 'X')
+        start = time.perf_counter()
+        move = ai.minimax_ai(b, 'O')
+        self.assertLess(time.perf_counter() - start, 0.5) # the deadline bounds the time of the move
+        self.assertTrue(b.is_valid_move(move))
+
+    def test_instrumentation(self):
+        ai = AIPlayer(instrument=True, rng=random.Random(0))
+        b = make_board('X...O....')
+        self.assertEqual(ai.minimax_ai(b, 'X'), AIPlayer().minimax_ai(b, 'X')) # the same moves
+        stats = ai.last_stats
+        self.assertEqual(stats.ai, 'minimax_ai')
+        self.assertGreater(stats.nodes, 0)
+        self.assertGreater(stats.terminals, 0)
+        self.assertLessEqual(stats.max_depth, 7)
+        self.assertEqual(stats.cache_hits + stats.cache_misses, ai.cache.hits + ai.cache.misses)
+        self.assertGreater(stats.wall_time, 0)
+
+        ai.minimax_ai(b, 'X') # the exact scores are in the cache now
+        self.assertLess(ai.last_stats.nodes, stats.nodes)
+        self.assertGreater(ai.last_stats.cache_hits, 0)
+
+        ai.find_winning_moves_and_losing_moves_ai(b, 'X') # calls random_ai, measured with it
+        self.assertEqual(ai.last_stats.ai, 'find_winning_moves_and_losing_moves_ai')
+        ai.mcts_ai(b, 'O')
+        self.assertEqual(ai.last_stats.copies, ai.last_stats.nodes) # the playouts use make_move
+        self.assertIsNone(AIPlayer().last_stats)
+        self.assertNotIn('minimax_ai', vars(AIPlayer())) # nothing is wrapped when it is disabled
+
+    def test_best_moves(self):
+        ai = AIPlayer(rng=random.Random(0))
+        boards = [make_board(cells) for cells, _ in POSITIONS]
+        boards += [make_board('..X...O..'), make_board('X.......O'), make_board('XOX.O.XXO')] # the first two are symmetric
+        results = ai.best_moves(iter(boards), deterministic=True)
+        for b in boards:
+            player = 'X' if b.move_count % 2 == 0 else 'O'
+            move, score = next(results) # the results are streamed in order
+            self.assertEqual(score, reference_score(b, player))
+            if b.get_winner() is None and not b.is_full():
+                self.assertEqual(move, ai.minimax_ai(b, player))
+            else:
+                self.assertIsNone(move)
+
+        results = list(ai.best_moves([make_board('..X...O..'), make_board('X.......O')] * 30))
+        first = {move for move, _ in results[::2]}
+        second = {move for move, _ in results[1::2]}
+        self.assertEqual(first, {(0,0), (2,2)})
+        self.assertEqual(second, {(row, 2 - col) for row, col in first}) # searched once, the moves are mirrored like the board
+
+        b = Board()
+        moves = {move for move, _ in AIPlayer(rng=random.Random(0)).best_moves([b] * 50)}
+        self.assertGreater(len(moves), 1) # random tie-breaking among the best moves
+        self.assertEqual(list(AIPlayer().best_moves([b], 'O', deterministic=True)), [((0,0), 0)])
+
+    def test_parallel(self):
+        for search in ("alphabeta", "minimax"):
+            ai = AIPlayer(search=search, workers=2, parallel_min_cells=0) # even the 3x3 boards are split
+            try:
+                for cells, _ in POSITIONS:
+                    b = make_board(cells)
+                    for mover in ('X', 'O'):
+                        self.assertEqual(ai.minimax_ai(b, mover), AIPlayer(search=search).minimax_ai(b, mover))
+            finally:
+                ai.close()
+        b = Board(4, 4, 3).make_move((0,0), 'X').make_move((1,1), 'O').make_move((2,2), 'X')
+        ai = AIPlayer(workers=2)
+        try:
+            self.assertEqual(ai.minimax_ai(b, 'O'), AIPlayer().minimax_ai(b, 'O'))
+        finally:
+            ai.close()
+
+    def test_table_ai(self):
+        ai = AIPlayer()
+        for cells, player in POSITIONS:
+            b = make_board(cells)
+            self.assertEqual(ai.minimax_ai(b, player), ai.table_ai(b, player))
+            to_move = 'X' if cells.count('X') == cells.count('O') else 'O'
+            self.assertEqual(ai.minimax_score(b, to_move), ai.table.lookup(b)[0])
+        self.assertEqual(ai.table.lookup(make_board('XXX......')), None) # O can't have missed its turns
+
+    def test_table_rebuild(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'table.bin')
+            table = PerfectPlayTable(path) # the file is missing, so it is built
+            self.assertTrue(os.path.exists(path))
+            self.assertEqual(table.lookup(make_board('XX..O..O.')), (9, 1, 0b000000100))
+            table.close()
+
+            with open(path, 'r+b') as f: # corrupt one of the records
+                f.seek(HEADER.size + 100)
+                f.write(b'\xff')
+            table = PerfectPlayTable(path)
+            self.assertEqual(table.lookup(make_board('XX..O..O.')), (9, 1, 0b000000100))
+            table.close()
+
+    def test_concurrent_builds(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'table.bin')
+            with ThreadPoolExecutor(4) as executor: # every builder writes its own temporary file
+                tables = list(executor.map(build, [path] * 8))
+            with open(path, 'rb') as f:
+                self.assertIn(f.read(), tables)
+            self.assertEqual(os.listdir(tmp), ['table.bin']) # no temporary file is left
+
+    def test_table_loaded_lazily(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cache', 'table.bin') # the directory is created with the table
+            table = PerfectPlayTable(path)
+            self.assertTrue(os.path.exists(path))
+            table.close()
+        code = ('import scripts.perfect_table as t; from scripts.ai import AIPlayer; from scripts.board import Board; '
+                'AIPlayer().minimax_ai(Board(), "X"); print(t._default_table is None)')
+        out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        self.assertEqual(out.strip(), 'True') # players that don't use table_ai never load the table
+
+    def test_table_lengths(self):
+        for value, moves, best_moves in solve().values():
+            if value: # the shortest win: the score and the length agree
+                self.assertEqual(moves, 10 - abs(value))
+
+    def test_symmetric_boards_share_key(self):
+        corners = [make_board(c) for c in ('X........', '..X......', '......X..', '........X')]
+        keys = {b.canonical_key() for b in corners}
+        self.assertEqual(len(keys), 1)
+        self.assertNotEqual(make_board('.X.......').canonical_key(), corners[0].canonical_key())
+
+    def test_shared_cache(self):
+        cache = TranspositionTable()
+        first = AIPlayer(cache=cache)
+        second = AIPlayer(cache=cache)
+        b = make_board('X........')
+        first.minimax_ai(b, 'O')
+        hits = cache.hits
+        second.minimax_ai(b, 'O')
+        self.assertGreater(cache.hits, hits) # the second AI reuses the scores of the first one
+        second.clear_cache()
+        self.assertEqual(len(first.cache), 0)
+
+    def test_cache_eviction(self):
+        cache = TranspositionTable(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a') # 'a' becomes the most recently used entry
+        cache.put('c', 3)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(len(cache), 2)
+
+        ai = AIPlayer(cache=TranspositionTable(maxsize=10))
+        b = make_board('X...O....')
+        self.assertEqual(reference_score(b, 'X'), ai.minimax_score(b, 'X'))
+        self.assertLessEqual(len(ai.cache), 10)
+
+
+    def test_mcts_ai(self):
+        ai = AIPlayer(rng=random.Random(0))
+        self.assertEqual(ai.mcts_ai(make_board('XX..O..O.'), 'X'), (0, 2)) # X wins
+        self.assertEqual(ai.mcts_ai(make_board('XX..O....'), 'O'), (0, 2)) # O blocks
+        
+        b = Board()
+        ai.mcts_ai(b, 'X')
+        root = ai.mcts.root
+        reply = root.children[0]
+        b = reply.board.make_move(reply.board.legal_moves()[0], 'O')
+        ai.mcts_ai(b, 'X')
+        self.assertIs(ai.mcts.root.parent, None)
+        self.assertIn(ai.mcts.root, [child for node in root.children for child in node.children]) # the tree is reused
+
+    def test_mcts_time_limit(self):
+        ai = AIPlayer(rng=random.Random(0), mcts=MCTS(playouts=None, time_limit=0.05))
+        b = Board(7, 7, 4)
+        start = time.perf_counter()
+        move = ai.mcts_ai(b, 'X')
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertTrue(b.is_valid_move(move))
+        with self.assertRaises(ValueError):
+            MCTS(playouts=None, time_limit=None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+from scripts.analysis import Analyzer, accuracy_report, analyze_games
+import unittest
+
+GAMES = [
+    # O lets X win: (2,2) doesn't block the column of X
+    {"ai": "random_ai", "ai_player": "O", "moves": [[0,0], [1,1], [1,0], [2,2], [2,0]], "winner": "X"},
+    # perfect play, a draw
+    {"ai": "minimax_ai", "ai_player": "X", "moves": [[0,0], [1,1], [2,2], [0,1], [2,1], [2,0], [0,2], [1,2], [1,0]], "winner": None},
+    {"ai": "minimax_ai", "ai_player": "X", "moves": [[3,3]], "winner": None, "shape": [4,4,4]},
+]
+
+
+class TestAnalysis(unittest.TestCase):
+
+    def test_analyze(self):
+        analysis = Analyzer().analyze(GAMES[0])["analysis"]
+        self.assertEqual([a["player"] for a in analysis], ['X', 'O', 'X', 'O', 'X'])
+        self.assertEqual([a["blunder"] for a in analysis], [False, False, False, True, False])
+        self.assertEqual(analysis[3]["best_move"], [2,0]) # O had to block
+        self.assertEqual(analysis[3]["best_value"], 0)
+        self.assertGreater(analysis[3]["value"], 0) # X wins after the blunder
+        self.assertEqual([a["accurate"] for a in analysis], [True, True, True, False, True])
+        self.assertIsNone(Analyzer().analyze(GAMES[2])["analysis"])
+
+    def test_report(self):
+        analyzed = list(analyze_games(GAMES * 20, chunk_size=7))
+        self.assertEqual(analyzed, list(analyze_games(GAMES * 20, workers=2, chunk_size=7))) # same order with processes
+        report = accuracy_report(analyzed)
+        self.assertEqual(report["ai"]["minimax_ai"], {"moves": 100, "accurate": 100, "blunders": 0, "accuracy": 1.0})
+        self.assertEqual(report["human"]["random_ai"]["blunders"], 0) # the human played X against random_ai
+        self.assertEqual(report["ai"]["random_ai"]["blunders"], 20)
+        self.assertEqual(report["ai"]["random_ai"]["moves"], 40)
+
+    def test_bad_records(self):
+        records = [GAMES[0], {"ai": "random_ai", "ai_player": "O", "moves": [[0,0], [0,0]], "winner": None}, # illegal move
+                   {"ai": "random_ai"}, GAMES[1], # no moves
+                   {"moves": [[0,0]], "winner": None}] # no AI
+        for workers in (1, 2):
+            analyzed = list(analyze_games(records, workers=workers, chunk_size=2))
+            self.assertEqual([a["analysis"] is None for a in analyzed], [False, True, True, False, True])
+            self.assertEqual(["error" in a for a in analyzed], [False, True, True, False, True])
+            self.assertEqual(accuracy_report(analyzed)["ai"]["minimax_ai"]["moves"], 5)
+        # records read back from a log may miss the fields too
+        analyzed = [dict(analyzed[0], ai=None), {"analysis": [], "winner": None}, analyzed[3]]
+        self.assertEqual(accuracy_report(analyzed)["ai"], {"minimax_ai": {"moves": 5, "accurate": 5, "blunders": 0, "accuracy": 1.0}})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+from scripts.board import Board
+import unittest
+
+try:
+    import numpy
+except ImportError: # the batched boards need numpy
+    numpy = None
+
+if numpy is not None:
+    from scripts.batch import BoardBatch, random_playouts, X, O
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestBoardBatch(unittest.TestCase):
+
+    def test_evaluation(self):
+        boards = [Board(), Board(), Board()]
+        for i in range(3):
+            boards[1][i] = 'X' # first row for X
+        for i in (2, 4, 6):
+            boards[2][i] = 'O' # anti-diagonal for O
+        boards.append(Board())
+        for i in range(9):
+            boards[3][i] = 'X' if i in (0, 1, 5, 6, 8) else 'O' # full board, draw
+
+        batch = BoardBatch.from_boards(boards)
+        self.assertEqual(batch.winners().tolist(), [0, X, O, 0])
+        self.assertEqual(batch.is_full().tolist(), [False, False, False, True])
+        self.assertEqual(batch.legal_moves().sum(axis=1).tolist(), [9, 6, 6, 0])
+        self.assertEqual(batch.finished().tolist(), [False, True, True, True])
+
+    def test_playout(self):
+        batch = BoardBatch(500, 4, 4, 3, seed=1)
+        winners = batch.playout()
+        self.assertTrue(batch.finished().all())
+        self.assertEqual(winners.tolist(), batch.winners().tolist())
+        marks = (batch.cells != 0).sum(axis=1) - (batch.cells == X).sum(axis=1) * 2
+        self.assertTrue(((marks == 0) | (marks == -1)).all()) # X moves first, the players alternate
+
+    def test_random_playouts(self):
+        b = Board().make_move((0,0), 'X').make_move((1,1), 'O').make_move((0,1), 'X')
+        stats = random_playouts(b, 1000, seed=3)
+        self.assertEqual(stats["Total"], 1000)
+        self.assertEqual(stats["X"] + stats["O"] + stats["Draw"], 1000)
+        self.assertEqual(stats, random_playouts(b, 1000, seed=3)) # reproducible
+        self.assertGreater(stats["O"], 0)
+        self.assertEqual(random_playouts(b.make_move((0,2), 'O').make_move((2,2), 'X').make_move((2,0), 'O'), 10)["O"], 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
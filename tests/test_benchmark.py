@@ -0,0 +1,54 @@
+from scripts.benchmark import compare, load, main, run, save
+import json
+import os
+import tempfile
+import unittest
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_run_and_save(self):
+        metrics = run(scale=0.001, repeat=1)
+        self.assertIn('board.make_move', metrics)
+        self.assertIn('minimax_ai.ply8', metrics)
+        self.assertNotIn('minimax_ai.ply0', metrics) # the empty board isn't searched
+        self.assertIn('move_latency.table_ai', metrics)
+        self.assertTrue(all(value > 0 for value in metrics.values()))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'baseline.json')
+            save(metrics, path)
+            self.assertEqual(load(path), metrics)
+
+    def test_compare(self):
+        baseline = {'a': 1.0, 'b': 2.0, 'c': 1.0}
+        current = {'a': 1.2, 'b': 3.0, 'd': 5.0}
+        rows = compare(baseline, current, threshold=0.25)
+        self.assertEqual([row[0] for row in rows], ['a', 'b', 'c']) # the metrics of the baseline
+        self.assertEqual([row[4] for row in rows], [False, True, True]) # b is 50% slower, c is missing
+        self.assertEqual(rows[2][2:4], (None, None))
+
+    def test_missing_metric_fails(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline, current = os.path.join(tmp, 'baseline.json'), os.path.join(tmp, 'current.json')
+            save({'a': 1.0, 'b': 1.0}, baseline)
+            save({'a': 1.0, 'b': 1.1}, current)
+            self.assertEqual(main(['compare', baseline, current]), 0)
+            save({'a': 1.0, 'renamed': 1.0}, current)
+            self.assertEqual(main(['compare', baseline, current]), 1)
+
+    def test_other_python_refused(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline, current = os.path.join(tmp, 'baseline.json'), os.path.join(tmp, 'current.json')
+            save({'a': 1.0}, baseline)
+            save({'a': 1.0}, current)
+            with open(baseline) as f:
+                data = json.load(f)
+            data["python"] = "2.7.18"
+            with open(baseline, 'w') as f:
+                json.dump(data, f)
+            self.assertEqual(main(['compare', baseline, current]), 2)
+            self.assertEqual(main(['compare', baseline, current, '--any-python']), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 from scripts.board import Board
+import random
 import unittest
 
 class TestBoard(unittest.TestCase):
@@ -6,7 +7,7 @@ class TestBoard(unittest.TestCase):
     def test_isfull(self):
         b = Board()
         for i in range(9):
-            b[i] = i
+            b[i] = 'X' if i % 2 == 0 else 'O'
         
         self.assertTrue(b.is_full())
     
@@ -22,15 +23,19 @@ class TestBoard(unittest.TestCase):
     
     def test_setitem(self):
         b = Board()
-        b[1] = 1
-        self.assertEqual(b[1], 1)
-        b[(0,2)] = 2
-        self.assertEqual(b[(0,2)], 2)
+        b[1] = 'X'
+        self.assertEqual(b[1], 'X')
+        b[(0,2)] = 'O'
+        self.assertEqual(b[(0,2)], 'O')
+        b[1] = None
+        self.assertEqual(b[1], None)
+        with self.assertRaises(ValueError):
+            b[1] = 1
     
     def test_getrows(self):
         b = Board()
         for i in range(9):
-            b[i] = i
+            b[i] = 'X' if i % 2 == 0 else 'O'
         
         row1 = b.board[0]
         row2 = b.board[1]
@@ -42,7 +47,7 @@ class TestBoard(unittest.TestCase):
     def test_getcols(self):
         b = Board()
         for i in range(9):
-            b[i] = i
+            b[i] = 'X' if i % 2 == 0 else 'O'
         
         col1 = []
         col2 = []
@@ -60,7 +65,7 @@ class TestBoard(unittest.TestCase):
     def test_getdiags(self):
         b = Board()
         for i in range(9):
-            b[i] = i
+            b[i] = 'X' if i % 2 == 0 else 'O'
         
         diag1 = [b[0], b[4], b[8]]
         diag2 = [b[2], b[4], b[6]]
@@ -71,7 +76,7 @@ class TestBoard(unittest.TestCase):
     def test_getcombos(self):
         b = Board()
         for i in range(9):
-            b[i] = i
+            b[i] = 'X' if i % 2 == 0 else 'O'
         
         combos = [
             b[0:3:], # row 1
@@ -96,14 +101,24 @@ class TestBoard(unittest.TestCase):
     def test_legalmoves(self):
         b = Board()
         for _ in range(6):
-            b[_] = _
+            b[_] = 'X' if _ % 2 == 0 else 'O'
         
         empty = [(2,0), (2,1), (2,2)] # list containing the coordinates of the last row
 
         self.assertEqual(b.legal_moves(), empty)
     
     def test_makemove(self):
-        pass
+        b = Board()
+        new = b.make_move((1,1), 'X')
+        self.assertEqual(new[4], 'X')
+        self.assertEqual(b[4], None) # the original board is left untouched
+        new = new.make_move(0, 'O')
+        self.assertEqual(new[(0,0)], 'O')
+
+        with self.assertRaises(Exception):
+            new.make_move((1,1), 'O') # the cell is already occupied
+        with self.assertRaises(IndexError):
+            new.make_move(slice(0, 2), 'O')
     
     def test_getwinner(self):
         b = Board()
@@ -113,6 +128,129 @@ class TestBoard(unittest.TestCase):
             b[_] = "X"
         self.assertEqual("X", b.get_winner())
 
+        b = Board()
+        for _ in (2, 5, 8):
+            b[_] = "O" # winning column after an empty one
+        self.assertEqual("O", b.get_winner())
+
+
+    def test_winningmoves(self):
+        b = Board()
+        for move, player in (((0,0), 'X'), ((1,1), 'O'), ((0,1), 'X'), ((2,2), 'O')):
+            b = b.make_move(move, player)
+        self.assertEqual(b.winning_moves('X'), [(0,2)])
+        self.assertEqual(b.winning_moves('O'), []) # the diagonal is blocked by X
+        self.assertEqual(b.move_count, 4)
+
+        b = b.make_move((0,2), 'O') # O blocks the first row
+        self.assertEqual(b.winning_moves('X'), [])
+        self.assertEqual(b.winning_moves('O'), [(1,2), (2,0)]) # third column and anti-diagonal
+
+        b[(2,0)] = 'O' # the counters are computed again after setting a cell
+        self.assertEqual(b.get_winner(), 'O')
+        self.assertEqual(b.move_count, 6)
+        b[(2,0)] = None
+        self.assertEqual(b.get_winner(), None)
+        self.assertEqual(b.winning_moves('O'), [(1,2), (2,0)])
+
+    def test_shapes(self):
+        for rows, cols, k, lines in ((3, 3, 3, 8), (4, 4, 4, 10), (5, 5, 4, 28), (7, 7, 5, 60), (3, 5, 3, 20)):
+            b = Board(rows, cols, k)
+            self.assertEqual(len(b.get_combos()), lines)
+            self.assertEqual(len(b.legal_moves()), rows * cols)
+        self.assertIs(Board(5, 5, 4).shape, Board(5, 5, 4).shape) # the tables are shared between the boards
+        with self.assertRaises(ValueError):
+            Board(3, 3, 4)
+        with self.assertRaises(ValueError):
+            Board(3, 3, 1)
+
+    def test_shortest_lines(self):
+        rng = random.Random(0)
+        for rows, cols in ((1, 2), (2, 2), (3, 4)): # k = 2, the smallest winning length
+            for _ in range(50):
+                b, player = Board(rows, cols, 2), 'X'
+                while b.get_winner() is None and not b.is_full():
+                    b = b.make_move(rng.choice(b.legal_moves()), player)
+                    player = 'O' if player == 'X' else 'X'
+                    c = Board(rows, cols, 2)
+                    for i in range(rows * cols):
+                        c[i] = b[i]
+                    self.assertEqual((c._xc, c._oc, c._xt, c._ot, c.get_winner()), (b._xc, b._oc, b._xt, b._ot, b.get_winner()))
+                    self.assertEqual(c.winning_moves(player), b.winning_moves(player))
+
+    def test_large_board(self):
+        b = Board(7, 7, 5)
+        moves = [(3,1), (0,0), (3,2), (0,1), (3,3), (0,2), (3,4), (6,6)]
+        player = 'X'
+        for move in moves:
+            b = b.make_move(move, player)
+            player = 'O' if player == 'X' else 'X'
+        self.assertEqual(b.get_winner(), None)
+        self.assertEqual(b.winning_moves('X'), [(3,0), (3,5)])
+        b = b.make_move((3,5), 'X')
+        self.assertEqual(b.get_winner(), 'X')
+        self.assertEqual(b[(3,5)], 'X')
+        self.assertEqual(b.get_rows()[3], [None, 'X', 'X', 'X', 'X', 'X', None])
+
+        b = Board(5, 5, 4)
+        for i in (4, 8, 12, 16): # anti-diagonal
+            b[i] = 'O'
+        self.assertEqual(b.get_winner(), 'O')
+
+    def test_canonical_key(self):
+        b = Board(4, 4, 4).make_move((0,1), 'X')
+        rotated = Board(4, 4, 4).make_move((1,3), 'X')
+        self.assertEqual(b.canonical_key(), rotated.canonical_key())
+        self.assertNotEqual(b.canonical_key(), Board(4, 4, 4).make_move((1,1), 'X').canonical_key())
+        self.assertNotEqual(Board(3, 4, 3).canonical_key(), Board(4, 3, 3).canonical_key())
+
+    def test_hash(self):
+        b = Board(5, 5, 4).make_move((0,1), 'X').make_move((2,2), 'O')
+        other = Board(5, 5, 4).make_move((2,2), 'O').make_move((0,1), 'X') # same position, other order
+        self.assertEqual(hash(b), hash(other))
+        self.assertEqual(b, other)
+        self.assertEqual(len({b, other}), 1)
+        self.assertNotEqual(b, Board(5, 5, 4).make_move((0,1), 'O').make_move((2,2), 'X'))
+        self.assertNotEqual(Board(3, 3), Board(4, 4))
+
+        c = Board(5, 5, 4)
+        c[(0,1)] = 'X'
+        c[(2,2)] = 'O'
+        self.assertEqual(hash(c), hash(b)) # the hash is computed again after __setitem__
+        self.assertEqual(c, b)
+
+
+    def test_push_pop(self):
+        rng = random.Random(0)
+        for shape in ((3, 3, 3), (4, 5, 3)):
+            b = Board(*shape)
+            copies, player = [], 'X'
+            while b.get_winner() is None and not b.is_full():
+                move = rng.choice(b.legal_moves())
+                copies.append(b.make_move(move, player))
+                b.push(move, player) # the same state as the copy returned by make_move
+                self.assertEqual(b, copies[-1])
+                self.assertEqual(b.winning_moves('X'), copies[-1].winning_moves('X'))
+                self.assertEqual(b.move_count, copies[-1].move_count)
+                player = 'O' if player == 'X' else 'X'
+            self.assertEqual(b.get_winner(), copies[-1].get_winner())
+            for copy in reversed(copies):
+                self.assertEqual(b, copy)
+                b.pop()
+            self.assertEqual(b, Board(*shape))
+            self.assertTrue(b.is_empty())
+            self.assertIsNone(b.get_winner())
+            with self.assertRaises(IndexError):
+                b.pop()
+
+        b = Board().make_move((1,1), 'X')
+        c = b.copy()
+        c.push((0,0), 'O')
+        self.assertIsNone(b[(0,0)]) # the copy is independent
+        with self.assertRaises(Exception):
+            c.push((1,1), 'O')
+        self.assertEqual(c.move_count, 2) # an invalid move doesn't change the board
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
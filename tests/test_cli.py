@@ -0,0 +1,90 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COLD_START_BUDGET = 0.5 # seconds for `main.py --help`, the interpreter included
+# modules of the AIs and of the worker processes, that the commands reading the history must not import
+HEAVY_MODULES = ("scripts.engine", "scripts.ai", "scripts.mcts", "scripts.perfect_table", "scripts.qubic",
+                 "multiprocessing", "concurrent.futures.process")
+RECORD = {"ai": "random_ai", "ai_player": "O", "shape": [3,3,3], "moves": [[0,0], [1,1], [0,1], [2,2], [0,2]], "winner": "X"}
+
+
+def run(*args):
+    """Runs main.py with the given arguments and returns the completed process"""
+    return subprocess.run([sys.executable, 'main.py', *args], cwd=ROOT, capture_output=True, text=True, timeout=120)
+
+
+class TestCli(unittest.TestCase):
+
+    def test_lazy_imports(self):
+        code = 'import sys, main; main.build_parser(); print(sorted(m for m in sys.modules if m.startswith("scripts") or m == "json"))'
+        out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        self.assertEqual(out.strip(), '[]')
+        with tempfile.TemporaryDirectory() as tmp:
+            log, store, output = (os.path.join(tmp, name) for name in ('log.jsonl', 'log.tth', 'stats.json'))
+            with open(log, 'w') as f:
+                f.write(json.dumps(RECORD) + '\n')
+            self.assertEqual(run('export', log, '--output', store).returncode, 0)
+            for args in (['stats', store], ['stats', log, '--by-ai'], ['export', store, '--output', output],
+                         ['export', log, '--output', output]):
+                code = f'import sys, main; main.main({args!r}); print(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules))'
+                out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+                self.assertEqual(out.strip().splitlines()[-1], '[]', args)
+
+    def test_cold_start(self):
+        run('--help') # warm the bytecode cache
+        start = time.perf_counter()
+        self.assertEqual(run('--help').returncode, 0)
+        self.assertLess(time.perf_counter() - start, COLD_START_BUDGET)
+
+    def test_simulate_and_stats(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, 'stats.json')
+            self.assertEqual(run('simulate', '--x-ai', 'minimax_ai', '--o-ai', 'random_ai', '--games', '20',
+                                 '--workers', '1', '--output', output).returncode, 0)
+            with open(output) as f:
+                stats = json.load(f)
+            self.assertEqual(stats["Total"], 20)
+            self.assertEqual(stats["O"], 0)
+            self.assertEqual(run('simulate', '--x-ai', 'nope', '--games', '1').returncode, 2)
+
+    def test_export_import_stats(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log, store, history = (os.path.join(tmp, name) for name in ('log.jsonl', 'log.tth', 'history.jsonl'))
+            with open(log, 'w') as f:
+                for _ in range(3):
+                    f.write(json.dumps(RECORD) + '\n')
+            self.assertEqual(run('export', log, '--output', store).returncode, 0)
+            self.assertEqual(run('import', store, '--log', history).returncode, 0)
+            stats = json.loads(run('stats', history, '--by-ai').stdout)
+            self.assertEqual(stats["X"], 3)
+            self.assertEqual(stats["by_ai"]["random_ai"]["Total"], 3)
+            self.assertEqual(json.loads(run('stats', store).stdout)["Total"], 3)
+            self.assertEqual(run('stats', os.path.join(tmp, 'missing.jsonl')).returncode, 2)
+            missing = os.path.join(tmp, 'missing.tth')
+            for args in (('stats', missing), ('export', missing, '--output', os.path.join(tmp, 'out.json'))):
+                result = run(*args)
+                self.assertEqual(result.returncode, 2)
+                self.assertIn('No such file', result.stderr)
+            self.assertFalse(os.path.exists(missing)) # reading a store never creates it
+
+    def test_solve(self):
+        result = json.loads(run('solve', 'XX./OO./...').stdout)
+        self.assertEqual(result, {"move": [0, 2], "score": 9}) # X wins at once
+        result = json.loads(run('solve', 'XX./OO./...', '--player', 'O').stdout)
+        self.assertEqual(result["move"], [1, 2])
+        self.assertEqual(run('solve', 'XX.').returncode, 2)
+        for board in ('XXX/OO./...', 'XOX/XOO/OXX'): # won and full
+            for time_limit in ((), ('--time-limit', '0.1')):
+                result = run('solve', board, *time_limit)
+                self.assertEqual(result.returncode, 2)
+                self.assertIn('already over', result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
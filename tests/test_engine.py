@@ -0,0 +1,54 @@
+from scripts.engine import Game, GameOver
+import unittest
+
+
+class RecordingSink:
+    """Sink keeping the events it receives"""
+    def __init__(self):
+        self.events = []
+
+    def move(self, game, player, coords):
+        self.events.append(('move', player, coords))
+
+    def end(self, game):
+        self.events.append(('end', game.winner))
+
+
+class TestGame(unittest.TestCase):
+
+    def test_headless_game(self):
+        game = Game("find_winning_moves_and_losing_moves_ai")
+        while not game.is_over():
+            if game.to_move == game.ai_player:
+                game.ai_move()
+            else:
+                game.submit_move(game.board.legal_moves()[0])
+        state = game.state()
+        self.assertTrue(state["over"])
+        self.assertEqual(state["to_move"], None)
+        self.assertEqual(state["winner"], game.board.get_winner())
+        with self.assertRaises(GameOver):
+            game.ai_move()
+
+    def test_moves_and_sinks(self):
+        sink = RecordingSink()
+        game = Game("minimax_ai", sinks=[sink])
+        with self.assertRaises(ValueError):
+            game.submit_move((0, 0)) # the AI moves first
+        first = game.ai_move()
+        with self.assertRaises(Exception):
+            game.submit_move(first) # the cell is occupied
+        game.submit_move((1, 1))
+        self.assertEqual(game.state()["moves"], [first, (1, 1)])
+        self.assertEqual(sink.events, [('move', 'X', first), ('move', 'O', (1, 1))])
+
+    def test_ai_as_o(self):
+        game = Game("table_ai", ai_player='O')
+        game.submit_move((0, 0))
+        self.assertEqual(game.ai_move(), (1, 1)) # the only move that doesn't lose against a corner
+        with self.assertRaises(ValueError):
+            Game("unknown_ai")
+
+
+if __name__ == "__main__":
+    unittest.main()
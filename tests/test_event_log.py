@@ -0,0 +1,59 @@
+from scripts.engine import Game
+from scripts.event_log import GameLog, LogSink, fold_stats, read_events
+import os
+import tempfile
+import unittest
+
+
+class TestEventLog(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'history.jsonl')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_games_are_logged(self):
+        with GameLog(self.path, flush_every=4) as log:
+            for _ in range(10):
+                game = Game("minimax_ai", sinks=[LogSink(log)])
+                while not game.is_over():
+                    if game.to_move == game.ai_player:
+                        game.ai_move()
+                    else:
+                        game.submit_move(game.board.legal_moves()[0])
+
+        records = list(read_events(self.path))
+        self.assertEqual(len(records), 10)
+        self.assertEqual(records[0]["ai"], "minimax_ai")
+        self.assertEqual(len(records[0]["moves"]), len(records[0]["durations"]))
+        self.assertEqual(fold_stats(read_events(self.path)), {"X":10, "O":0, "Draw":0, "Total":10})
+
+    def test_append_and_partial_record(self):
+        with GameLog(self.path) as log:
+            log.append({"winner": "O", "moves": []})
+        with GameLog(self.path) as log: # the log is opened again and appended to
+            log.append({"winner": None, "moves": []})
+        with open(self.path, 'a') as f:
+            f.write('{"winner": "X", "mo') # record cut by a crash
+        self.assertEqual(fold_stats(read_events(self.path)), {"X":0, "O":1, "Draw":1, "Total":2})
+
+    def test_crash_repair(self):
+        with GameLog(self.path) as log:
+            log.append({"winner": "O", "moves": []})
+            log.append({"winner": "X", "moves": []})
+        with open(self.path, 'rb+') as f:
+            f.truncate(os.path.getsize(self.path) - 10) # the last record is cut in the middle
+        with GameLog(self.path) as log: # the cut record is dropped before appending
+            log.append({"winner": None, "moves": []})
+        self.assertEqual(fold_stats(read_events(self.path)), {"X":0, "O":1, "Draw":1, "Total":2})
+
+    def test_broken_line(self):
+        with open(self.path, 'w') as f:
+            f.write('{"winner": "O", "moves": []}\n{"winner": "X", "mo{"winner": null}\n[1, 2]\n{"winner": "X", "moves": []}\n')
+        self.assertEqual(fold_stats(read_events(self.path)), {"X":1, "O":1, "Draw":0, "Total":2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+from scripts.event_log import GameLog, fold_stats
+from scripts.history_store import CORNERS, OFFSET, HistoryStore, decode, encode, import_log
+import os
+import random
+import tempfile
+import unittest
+
+AIS = ("random_ai", "find_winning_moves_ai", "minimax_ai")
+
+
+def random_records(n, seed=0):
+    rng = random.Random(seed)
+    records = []
+    for _ in range(n):
+        cells = rng.sample(range(9), rng.randint(0, 9))
+        records.append({
+            "ai": rng.choice(AIS),
+            "ai_player": rng.choice("XO"),
+            "moves": [list(divmod(cell, 3)) for cell in cells],
+            "winner": rng.choice(["X", "O", None]),
+        })
+    return records
+
+
+class TestHistoryStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'history.tth')
+        self.records = random_records(2000)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_encode(self):
+        for record in self.records:
+            self.assertEqual(decode(encode(record)), record)
+        with self.assertRaises(ValueError):
+            encode({"ai": "minimax_ai", "ai_player": "X", "moves": [[3, 0]], "winner": None})
+
+    def test_append_and_read(self):
+        with HistoryStore(self.path, create=True) as store:
+            self.assertEqual(store.append(self.records[:500]), 500)
+            self.assertEqual(store.append(self.records[500:]), 1500)
+        self.assertEqual(os.path.getsize(self.path), OFFSET + 8 * 2000) # 8 bytes for every game
+
+        with HistoryStore(self.path) as store: # the store is opened again
+            self.assertEqual(len(store), 2000)
+            self.assertEqual(list(store.games()), self.records)
+            self.assertEqual(store.stats(), fold_stats(self.records))
+
+    def test_queries(self):
+        with HistoryStore(self.path, create=True) as store:
+            store.append(self.records)
+            for ai in AIS:
+                games = [r for r in self.records if r["ai"] == ai]
+                self.assertEqual(store.count_games(ai), len(games))
+                # the human opens with the second move when the AI plays X
+                opened = [r for r in games if len(r["moves"]) > (r["ai_player"] == 'X')
+                          and tuple(r["moves"][r["ai_player"] == 'X']) in CORNERS]
+                won = sum(r["winner"] == r["ai_player"] for r in opened)
+                self.assertEqual(store.count_games(ai, human_move=CORNERS), len(opened))
+                self.assertAlmostEqual(store.win_rate(ai, human_move=CORNERS), won / len(opened))
+            games = [r for r in self.records if r["moves"][:1] == [[1, 1]] and r["winner"] is None]
+            self.assertEqual(store.count_games(first_move=(1, 1), result="Draw"), len(games))
+            self.assertEqual(store.win_rate("table_ai"), 0.0)
+
+    def test_missing_store(self):
+        with self.assertRaises(FileNotFoundError):
+            HistoryStore(self.path)
+        self.assertFalse(os.path.exists(self.path)) # reading a store never creates it
+        open(self.path, 'wb').close()
+        with self.assertRaises(ValueError):
+            HistoryStore(self.path)
+
+    def test_interrupted_write(self):
+        with HistoryStore(self.path, create=True) as store:
+            store.append(self.records[:10])
+        with open(self.path, 'ab') as f:
+            f.write(b'\x01\x02\x03') # record cut by a crash, it isn't counted in the header
+        with HistoryStore(self.path) as store:
+            self.assertEqual(len(store), 10)
+            store.append(self.records[10:20])
+            self.assertEqual(list(store.games()), self.records[:20])
+
+    def test_import_log(self):
+        log_path = os.path.join(self.tmp.name, 'history.jsonl')
+        with GameLog(log_path) as log:
+            for record in self.records:
+                log.append(dict(record, shape=[3, 3, 3]))
+            log.append({"ai": "minimax_ai", "ai_player": "X", "moves": [[3, 3]], "winner": "X", "shape": [4, 4, 4]})
+        self.assertEqual(import_log(log_path, self.path, batch=300), 2000)
+        with HistoryStore(self.path) as store:
+            self.assertEqual(list(store.games()), self.records)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+from scripts.ai import AIPlayer
+from scripts.board import Board
+from scripts.position import Position
+from scripts.qubic import QubicBoard
+import pickle
+import random
+import unittest
+
+
+class TestPosition(unittest.TestCase):
+
+    def test_interned(self):
+        p = Position.initial()
+        self.assertIs(p, Position.initial())
+        a = p.make_move((0,0), 'X').make_move((1,1), 'O')
+        b = p.make_move((1,1), 'O').make_move((0,0), 'X') # same state, other order
+        self.assertIs(a, b)
+        self.assertIs(a.make_move((2,2), 'X'), a.make_move((2,2), 'X'))
+        self.assertIs(Position.of(Board().make_move((0,0), 'X').make_move((1,1), 'O')), a)
+        self.assertEqual(a, Board().make_move((0,0), 'X').make_move((1,1), 'O'))
+        self.assertIs(pickle.loads(pickle.dumps(a)), a)
+        cube = Position.of(QubicBoard().make_move((1,2,3), 'X').make_move((0,0,0), 'O'))
+        self.assertIs(pickle.loads(pickle.dumps(cube)), cube)
+
+    def test_all_states(self):
+        states = set()
+        frontier = [(Position.initial(), 'X')]
+        while frontier: # every reachable position
+            position, player = frontier.pop()
+            if id(position) in states:
+                continue
+            states.add(id(position))
+            if position.get_winner() is None and not position.is_full():
+                for move in position.legal_moves():
+                    frontier.append((position.make_move(move, player), 'O' if player == 'X' else 'X'))
+        self.assertEqual(len(states), 5478)
+
+    def test_immutable(self):
+        p = Position.initial()
+        with self.assertRaises(TypeError):
+            p[0] = 'X'
+        with self.assertRaises(AttributeError):
+            p.x = 1
+        with self.assertRaises(TypeError):
+            Position()
+        with self.assertRaises(Exception):
+            p.make_move((0,0), 'X').make_move((0,0), 'O')
+        with self.assertRaises(IndexError):
+            p.make_move(slice(0, 2), 'X')
+
+    def test_ais(self):
+        ai = AIPlayer(rng=random.Random(0))
+        p = Position.initial().make_move((0,0), 'X').make_move((0,1), 'O').make_move((1,1), 'X')
+        self.assertEqual(ai.minimax_ai(p, 'O'), (2,2))
+        self.assertEqual(ai.table_ai(p, 'O'), (2,2))
+        self.assertEqual(ai.find_winning_moves_and_losing_moves_ai(p, 'O'), (2,2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+from scripts.ai import AI_NAMES, AIPlayer, open_lines_evaluation
+from scripts.board import Board
+from scripts.engine import Game
+from scripts.instrumentation import CountingBoard, Probe
+from scripts.mcts import MCTS
+from scripts.qubic import CubeShape, QubicBoard, new_board
+import pickle
+import random
+import time
+import unittest
+
+
+def random_board(rng, moves):
+    """A 4x4x4 board after some random moves (the game may be over)"""
+    board, player = QubicBoard(), 'X'
+    for _ in range(moves):
+        if board.get_winner() is not None:
+            break
+        board = board.make_move(rng.choice(board.legal_moves()), player)
+        player = 'O' if player == 'X' else 'X'
+    return board
+
+
+class TestQubic(unittest.TestCase):
+
+    def test_shape(self):
+        shape = QubicBoard().shape
+        self.assertEqual(shape.size, 64)
+        self.assertEqual(shape.full, (1 << 64) - 1)
+        self.assertEqual(len(set(shape.lines)), 76)
+        self.assertEqual(len(set(shape.permutations)), 48)
+        self.assertEqual(sorted(set(shape.weights.values())), [4, 7]) # corners and center cells belong to 7 lines
+        self.assertEqual(shape.weights[(0,0,0)], 7)
+        self.assertEqual(shape.weights[(1,2,1)], 7)
+        for perm in shape.permutations: # the symmetries send lines to lines
+            self.assertEqual({sum(1 << perm[i] for i in cells) for cells in shape.line_cells}, set(shape.lines))
+        for n, k in ((4, 1), (3, 4)):
+            with self.assertRaises(ValueError):
+                CubeShape.get(n, k)
+
+    def test_cells(self):
+        b = QubicBoard()
+        b[(1,2,3)] = 'X'
+        self.assertEqual(b[1 * 16 + 2 * 4 + 3], 'X')
+        self.assertEqual(b.board[1][2][3], 'X')
+        self.assertEqual(len(b.get_rows()), 16)
+        self.assertEqual(len(b.get_columns()), 16)
+        self.assertEqual(len(b.get_diags()), 28)
+        self.assertEqual(len(b.get_combos()), 76)
+        self.assertEqual(len(b.legal_moves()), 63)
+        with self.assertRaises(IndexError):
+            b[(4,0,0)]
+        with self.assertRaises(IndexError):
+            b[(0,0)]
+
+    def test_winner(self):
+        for line in ([(i, i, i) for i in range(4)], [(i, 3-i, 2) for i in range(4)], [(2, 1, i) for i in range(4)]):
+            b = QubicBoard()
+            for move in line[:3]:
+                b = b.make_move(move, 'O')
+            self.assertIsNone(b.get_winner())
+            self.assertEqual(b.winning_moves('O'), [line[3]])
+            b = b.make_move(line[3], 'O')
+            self.assertEqual(b.get_winner(), 'O')
+            self.assertIsInstance(b, QubicBoard)
+
+    def test_incremental(self):
+        rng = random.Random(0)
+        for _ in range(50):
+            b = random_board(rng, rng.randrange(40))
+            c = QubicBoard()
+            for i in range(64):
+                if b[i] is not None:
+                    c[i] = b[i]
+            self.assertEqual(c, b)
+            self.assertEqual(hash(c), hash(b))
+            self.assertEqual(c.get_winner(), b.get_winner())
+            self.assertEqual(c.winning_moves('X'), b.winning_moves('X'))
+            self.assertEqual(open_lines_evaluation(c), open_lines_evaluation(b))
+
+    def test_evaluation(self):
+        rng = random.Random(1)
+        for _ in range(50):
+            b = random_board(rng, rng.randrange(40))
+            total = 0
+            for line in b.shape.lines:
+                if not line & b.o:
+                    total += bin(line & b.x).count('1') ** 2
+                elif not line & b.x:
+                    total -= bin(line & b.o).count('1') ** 2
+            self.assertEqual(open_lines_evaluation(b), total / (76 * 16 + 1))
+
+    def test_symmetry_and_pickle(self):
+        a = QubicBoard().make_move((0,0,0), 'X').make_move((0,1,1), 'O')
+        b = QubicBoard().make_move((3,3,3), 'X').make_move((3,2,2), 'O') # the center reflection of a
+        self.assertEqual(a.canonical_key(), b.canonical_key())
+        self.assertNotEqual(a.canonical_key(), Board(4, 4, 4).canonical_key())
+        c = pickle.loads(pickle.dumps(a))
+        self.assertEqual(c, a)
+        self.assertIsInstance(c, QubicBoard)
+        self.assertIs(c.shape, a.shape)
+
+    def test_ais(self):
+        ai = AIPlayer(rng=random.Random(0), search="iterative", time_limit=0.2, mcts=MCTS(playouts=50, rng=random.Random(0)))
+        b = random_board(random.Random(2), 10)
+        self.assertIsNone(b.get_winner())
+        for name in AI_NAMES:
+            if name == "table_ai": # it searches the boards that are not 3x3 with minimax_ai
+                continue
+            self.assertIn(getattr(ai, name)(b, 'X'), b.legal_moves())
+        self.assertIn(ai.minimax_ai(QubicBoard(), 'X'), QubicBoard().shape.corners)
+
+    def test_instrumentation(self):
+        b = random_board(random.Random(6), 8)
+        c = CountingBoard.of(b, Probe())
+        self.assertIsInstance(c, QubicBoard)
+        self.assertEqual(c, b)
+        self.assertEqual(c.board, b.board)
+        self.assertIsInstance(c.make_move(c.legal_moves()[0], 'X'), QubicBoard)
+        self.assertIs(type(c.copy()), type(c))
+        ai = AIPlayer(rng=random.Random(0), search="iterative", time_limit=0.1, instrument=True)
+        self.assertIn(ai.minimax_ai(b, 'X'), b.legal_moves())
+        self.assertGreater(ai.last_stats.nodes, 0)
+
+    def test_time_budget(self):
+        ai = AIPlayer(rng=random.Random(0), search="iterative", time_limit=0.3)
+        b = random_board(random.Random(3), 6)
+        start = time.perf_counter()
+        ai.minimax_ai(b, 'X')
+        self.assertLess(time.perf_counter() - start, 0.3 + 0.5) # the last iteration stops soon after the deadline
+
+    def test_threats(self):
+        ai = AIPlayer(rng=random.Random(0), search="iterative", time_limit=0.2)
+        b = QubicBoard()
+        for move, player in (((0,0,0), 'X'), ((1,1,2), 'O'), ((1,1,1), 'X'), ((3,0,1), 'O'), ((2,2,2), 'X')):
+            b = b.make_move(move, player)
+        self.assertEqual(ai.minimax_ai(b, 'O'), (3,3,3)) # O has to block the diagonal
+        self.assertEqual(ai.minimax_ai(b, 'X'), (3,3,3)) # X wins
+
+    def test_beats_random(self):
+        rng = random.Random(4)
+        ai = AIPlayer(rng=rng, search="iterative", time_limit=0.05)
+        opponent = AIPlayer(rng=rng)
+        for ai_player in ('X', 'O'):
+            b, player = QubicBoard(), 'X'
+            while b.get_winner() is None and not b.is_full():
+                move = (ai.minimax_ai if player == ai_player else opponent.random_ai)(b, player)
+                b = b.make_move(move, player)
+                player = 'O' if player == 'X' else 'X'
+            self.assertEqual(b.get_winner(), ai_player)
+
+    def test_game(self):
+        self.assertIsInstance(new_board((4, 4, 4, 4)), QubicBoard)
+        self.assertEqual(type(new_board((3, 3, 3))), Board)
+        game = Game("find_winning_moves_and_losing_moves_ai", AIPlayer(rng=random.Random(5)), 'X', shape=(4, 4, 4, 4))
+        game.ai_move()
+        game.submit_move((1,1,1))
+        self.assertEqual(game.board.move_count, 2)
+        self.assertEqual(list(game.board.shape.key), [4, 4, 4, 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
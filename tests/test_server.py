@@ -0,0 +1,96 @@
+from scripts.server import GameServer
+import asyncio
+import json
+import time
+import unittest
+
+
+async def send(reader, writer, command):
+    """Sends a command and reads the response"""
+    writer.write(command.encode() + b'\n')
+    await writer.drain()
+    return (await reader.readline()).decode().rstrip('\n')
+
+
+def state(response):
+    """Parses the state in an OK response"""
+    assert response.startswith('OK '), response
+    return json.loads(response[3:])
+
+
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = GameServer(max_sessions=200, workers=2)
+        self.port = await self.server.start()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def play(self, ai_name):
+        """Plays a whole game, the human takes the first empty cell"""
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        game = state(await send(reader, writer, f'NEW {ai_name}'))
+        self.assertEqual(len(game["moves"]), 1) # the AI has already moved
+        while not game["over"]:
+            row, col = next((r, c) for r in range(3) for c in range(3) if game["board"][r][c] is None)
+            game = state(await send(reader, writer, f'MOVE {row} {col}'))
+        self.assertEqual(await send(reader, writer, 'QUIT'), 'BYE')
+        writer.close()
+        return game
+
+    async def test_concurrent_games(self):
+        games = await asyncio.gather(*(self.play('minimax_ai') for _ in range(50)))
+        self.assertTrue(all(game["winner"] == 'X' for game in games)) # first-empty-cell loses against minimax
+
+    async def test_errors(self):
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        self.assertTrue((await send(reader, writer, 'MOVE 0 0')).startswith('ERR'))
+        self.assertTrue((await send(reader, writer, 'NEW unknown_ai')).startswith('ERR'))
+        game = state(await send(reader, writer, 'NEW random_ai O'))
+        self.assertEqual(game["moves"], []) # the human plays X and moves first
+        game = state(await send(reader, writer, 'MOVE 1 1'))
+        self.assertEqual(len(game["moves"]), 2)
+        self.assertTrue((await send(reader, writer, 'MOVE 1 1')).startswith('ERR invalid move'))
+        self.assertTrue((await send(reader, writer, 'MOVE a b')).startswith('ERR invalid move'))
+        self.assertTrue((await send(reader, writer, 'JUMP')).startswith('ERR unknown command'))
+        self.assertEqual(state(await send(reader, writer, 'STATE'))["moves"], game["moves"])
+        writer.close()
+
+    async def test_busy(self):
+        self.server.max_sessions = 1
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        state(await send(reader, writer, 'NEW random_ai'))
+        other_reader, other_writer = await asyncio.open_connection('127.0.0.1', self.port)
+        self.assertEqual((await other_reader.readline()).decode(), 'ERR busy\n')
+        other_writer.close()
+        writer.close()
+
+    async def test_move_timeout(self):
+        self.server.move_timeout = 0.05
+        self.server.executor.submit(time.sleep, 0.5) # keep both workers busy, so the search can't start in time
+        self.server.executor.submit(time.sleep, 0.5)
+        def shared(board, player): # the AIPlayer shared by the games is not thread-safe, it must not play the fallback
+            raise AssertionError('fallback played by the shared AIPlayer')
+        self.server.ai.find_winning_moves_and_losing_moves_ai = shared
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        start = time.perf_counter()
+        game = state(await send(reader, writer, 'NEW minimax_ai'))
+        self.assertLess(time.perf_counter() - start, 0.4) # the fallback AI has moved instead
+        self.assertEqual(len(game["moves"]), 1)
+        writer.close()
+
+    async def test_shared_ai(self):
+        games = []
+        original = self.server._execute
+        async def execute(game, line): # keeps the games created by the server
+            game, response = await original(game, line)
+            games.append(game)
+            return game, response
+        self.server._execute = execute
+        await asyncio.gather(self.play('random_ai'), self.play('minimax_ai'))
+        self.assertTrue(all(game.ai is self.server.ai for game in games)) # no new AIPlayer for every game
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+from scripts.engine import Game
+from scripts.stats import StatsRecorder, StatsSink
+import pickle
+import threading
+import unittest
+
+
+class TestStats(unittest.TestCase):
+
+    def test_threads(self):
+        recorder = StatsRecorder()
+        def play(ai):
+            for i in range(1000):
+                recorder.record(ai, (0, 0) if i % 2 else (1, 1), ['X', 'O', None][i % 3])
+        threads = [threading.Thread(target=play, args=(ai,)) for ai in ("random_ai", "minimax_ai") * 4]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(recorder.totals()["Total"], 8000) # no game is lost
+        by_ai = recorder.by_ai()
+        self.assertEqual(by_ai["random_ai"]["Total"], 4000)
+        self.assertEqual(by_ai["minimax_ai"]["X"] + by_ai["minimax_ai"]["O"] + by_ai["minimax_ai"]["Draw"], 4000)
+        self.assertEqual(recorder.by_first_move()[(1, 1)]["Total"], 4000)
+
+    def test_merge(self):
+        worker = StatsRecorder()
+        worker.record("random_ai", (0, 0), 'X')
+        worker.record("random_ai", (0, 0), None)
+        snapshot = pickle.loads(pickle.dumps(worker.snapshot())) # as if it were sent by another process
+
+        recorder = StatsRecorder()
+        recorder.record("minimax_ai", (1, 1), None)
+        recorder.merge(snapshot)
+        recorder.merge_stats({"X": 2, "O": 1, "Draw": 0, "Total": 3})
+        self.assertEqual(recorder.totals(), {"X":3, "O":1, "Draw":2, "Total":6})
+        self.assertEqual(recorder.by_ai()["random_ai"], {"X":1, "O":0, "Draw":1, "Total":2})
+
+    def test_sink(self):
+        recorder = StatsRecorder()
+        for _ in range(3):
+            game = Game("minimax_ai", sinks=[StatsSink(recorder)])
+            while not game.is_over():
+                if game.to_move == game.ai_player:
+                    game.ai_move()
+                else:
+                    game.submit_move(game.board.legal_moves()[0])
+        self.assertEqual(recorder.by_ai(), {"minimax_ai": {"X":3, "O":0, "Draw":0, "Total":3}})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,24 @@
+from scripts.tournament import run_tournament
+import unittest
+
+
+class TestTournament(unittest.TestCase):
+
+    def test_reproducible(self):
+        first = run_tournament("random_ai", "find_winning_moves_ai", 300, seed=7, workers=1, chunk_size=50)
+        second = run_tournament("random_ai", "find_winning_moves_ai", 300, seed=7, workers=2, chunk_size=50)
+        self.assertEqual(first, second) # same results whatever the number of processes
+        self.assertEqual(first["Total"], 300)
+        self.assertEqual(first["X"] + first["O"] + first["Draw"], 300)
+
+    def test_perfect_play(self):
+        stats = run_tournament("minimax_ai", "table_ai", 20, workers=1)
+        self.assertEqual(stats, {"X":0, "O":0, "Draw":20, "Total":20}) # perfect play always ends in a draw
+
+    def test_unknown_ai(self):
+        with self.assertRaises(ValueError):
+            run_tournament("random_ai", "unknown_ai", 10)
+
+
+if __name__ == "__main__":
+    unittest.main()